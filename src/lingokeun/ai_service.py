@@ -1,24 +1,215 @@
 from .config import settings
 from .user_profile import UserProfileManager
 from .token_monitor import TokenMonitor
+from .budget import BudgetExceeded, BudgetPolicy, OutputTruncated
+from .ratelimit import RateLimiter
+from .routing import ModelRouter, is_transient
+from .metrics import timed
+from . import tracing
+from .review_schema import Task1Review
+from .morphology import MorphologyIndex
+from . import task1_grader
 from google import genai
+from google.genai import types
+import re
+import time
 
 
 class AIService:
+    @timed("ai.init")
     def __init__(self):
         self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
         self.profile_manager = UserProfileManager()
         self.token_monitor = TokenMonitor()
+        self.budget = BudgetPolicy(self.token_monitor)
+        self.rate_limiter = RateLimiter(
+            settings.RATE_LIMIT_RPM, settings.RATE_LIMIT_TPM
+        )
+        self.router = ModelRouter()
+        self._morphology = None
+
+    @property
+    def morphology(self) -> MorphologyIndex:
+        """Word family index, built on first use."""
+        if self._morphology is None:
+            self._morphology = MorphologyIndex(self.profile_manager.vocab_db)
+        return self._morphology
+
+    def _with_base_forms(self, words: list[str]) -> str:
+        """Comma list of words, annotated with their confirmed base form."""
+        if not words:
+            return "None"
+        annotated = []
+        for word in words:
+            # Bundled families are unverified; the model finds those bases
+            if not self.morphology.is_confirmed(word):
+                annotated.append(word)
+                continue
+            base = self.morphology.base_form(word)
+            annotated.append(f"{word} (base: {base})" if base != word else word)
+        return ", ".join(annotated)
+
+    def _known_families(self, user_answers: str, confirmed: bool = True) -> list[str]:
+        """Complete word families the student's answers are about.
+
+        Confirmed families by default, bundled ones with confirmed=False. A
+        family counts when at least two of its forms appear in the answers
+        (the word plus an answer), so a stray word doesn't pull in an
+        unrelated family.
+        """
+        morphology = self.morphology
+        hits: dict[str, list[str]] = {}
+        for token in re.findall(r"[A-Za-z][A-Za-z-]+", user_answers):
+            if (
+                morphology.is_complete(token)
+                and morphology.is_confirmed(token) == confirmed
+            ):
+                hits.setdefault(morphology.base_form(token), []).append(token)
+        return [base for base, tokens in hits.items() if len(tokens) >= 2]
+
+    def _fill_known_forms(self, review: Task1Review) -> None:
+        """Fill correct answers and meanings the model left for us."""
+        for word_review in review.words:
+            family = self.morphology.lookup(word_review.word)
+            # Bundled families are only hints, never written in as answers
+            if family is None or family["source"] != "confirmed":
+                continue
+            for form_review in word_review.forms:
+                if not form_review.correct_answer:
+                    form_review.correct_answer = family["forms"].get(
+                        form_review.form, "-"
+                    )
+                if not form_review.meaning:
+                    form_review.meaning = family["meanings"].get(form_review.form, "-")
+
+    def _generate(
+        self,
+        operation: str,
+        prompt: str,
+        metadata: dict | None = None,
+        config: types.GenerateContentConfig | None = None,
+    ) -> str:
+        """Call Gemini for one operation and log its token usage.
+
+        The call is checked against the token budgets first: it may go ahead
+        with a capped output size, or be refused with BudgetExceeded. A reply
+        cut off at the output limit raises OutputTruncated. Each
+        attempt waits for its turn in the machine-wide rate limiter. Models
+        are tried in the order the router gives for the operation; a model
+        failing with a transient error (timeout, 429, 5xx) is recorded and the
+        next one tried, and the last error is raised if none succeeds. Other
+        errors are raised right away.
+        """
+        projection = self.budget.project(operation, prompt)
+        estimated = projection["input"] + projection["output"]
+
+        decision = self.budget.check(
+            operation,
+            prompt,
+            projection,
+            structured=bool(config and config.response_schema),
+        )
+        if decision["action"] == "refuse":
+            raise BudgetExceeded(decision["reason"])
+        if decision["action"] == "downgrade":
+            cap = decision["max_output_tokens"]
+            config = (
+                config.model_copy(update={"max_output_tokens": cap})
+                if config
+                else types.GenerateContentConfig(max_output_tokens=cap)
+            )
+            metadata = {**(metadata or {}), "budget": "downgraded"}
+
+        failed: list[str] = []
+        for model in self.router.candidates(operation):
+            waited = self.rate_limiter.acquire(estimated)
+            start = time.perf_counter()
+            try:
+                with timed(
+                    f"gemini.{operation}",
+                    model=model,
+                    prompt_chars=len(prompt),
+                    budget=decision["action"],
+                    rate_limit_wait_ms=round(waited * 1000, 1),
+                ) as span:
+                    if failed:
+                        span.set(fallback_from=failed[-1])
+                    response = self.client.models.generate_content(
+                        model=model, contents=prompt, config=config
+                    )
+            except Exception as e:
+                self.rate_limiter.settle(estimated, 0)
+                if not is_transient(e):
+                    # The request itself is at fault; other models fail the same
+                    raise
+                self.router.record(
+                    operation, model, (time.perf_counter() - start) * 1000, ok=False
+                )
+                failed.append(model)
+                last_error = e
+                continue
+
+            self.router.record(
+                operation, model, (time.perf_counter() - start) * 1000, ok=True
+            )
+            break
+        else:
+            raise last_error
+
+        if failed:
+            metadata = {**(metadata or {}), "fallback_from": failed}
+
+        # Log token usage
+        if hasattr(response, "usage_metadata"):
+            span.set(
+                input_tokens=response.usage_metadata.prompt_token_count,
+                output_tokens=response.usage_metadata.candidates_token_count,
+            )
+            self.token_monitor.log_usage(
+                operation=operation,
+                input_tokens=response.usage_metadata.prompt_token_count,
+                output_tokens=response.usage_metadata.candidates_token_count,
+                model=model,
+                metadata=metadata,
+                prompt_chars=len(prompt),
+            )
+            self.rate_limiter.settle(
+                estimated,
+                (response.usage_metadata.prompt_token_count or 0)
+                + (response.usage_metadata.candidates_token_count or 0),
+            )
+
+        # A cut-off reply would fail schema validation or be saved half
+        # written, so fail clearly instead
+        candidates = getattr(response, "candidates", None) or []
+        if candidates and candidates[0].finish_reason == types.FinishReason.MAX_TOKENS:
+            reason = (
+                f" of {decision['max_output_tokens']:,} set by the {decision['budget']} budget"
+                if decision["action"] == "downgrade"
+                else ""
+            )
+            raise OutputTruncated(
+                f"{operation} reply was cut off at the output token limit{reason}"
+            )
 
-    def generate_daily_task(self) -> str:
+        return response.text
+
+    def generate_daily_task(self, avoid_words: list[str] | None = None) -> str:
         """
         Membuat materi latihan harian.
-        AI otomatis memilih 5 kata.
+        5 kata dipilih lokal oleh VocabularyDatabase.select_daily_words.
         Level Translation: B1 (Intermediate).
+
+        avoid_words: kata yang sudah dipakai task lain di antrean prefetch.
         """
         # Get user context for personalized tasks
         user_context = self.profile_manager.get_user_context_for_ai()
-        vocab_context = self.profile_manager.get_vocabulary_context_for_ai()
+        selected = [
+            w["word"]
+            for w in self.profile_manager.vocab_db.select_daily_words(
+                avoid=avoid_words, family=self.morphology.base_form
+            )
+        ]
 
         prompt = f"""
         You are an expert English Tutor for a Senior Backend Engineer.
@@ -26,26 +217,19 @@ class AIService:
         **User Context:**
         {user_context}
         
-        **Vocabulary Selection Rules:**
-        - AVOID these mastered words (80%+ accuracy): {", ".join(vocab_context["mastered"][:20]) if vocab_context["mastered"] else "None yet"}
-        - PRIORITIZE reviewing these weak words (<80%): {", ".join(vocab_context["weak"][:10]) if vocab_context["weak"] else "None"}
-        - CONSIDER these unreviewed words (from user's reading): {", ".join(vocab_context["unreviewed"][:10]) if vocab_context["unreviewed"] else "None"}
-        - Select 5 words total: prioritize weak words, then unreviewed words, then new words
+        **Today's Vocabulary (already selected, use exactly these words):**
+        {self._with_base_forms(selected)}
         
         **IMPORTANT for Word Transformation Challenge:**
-        - If selected word is NOT in base form (e.g., "prominently", "alignment"), automatically convert to BASE FORM
-        - Base form examples:
-          * "prominently" (adv) → use "prominent" (adj) for transformation
-          * "alignment" (noun) → use "align" (verb) for transformation
-          * "reliability" (noun) → use "reliable" (adj) for transformation
+        - Use the BASE FORM of each word; where it is known it is given above as "(base: ...)"
+        - For other words, convert to base form yourself (e.g., "prominently" → "prominent", "alignment" → "align")
         - The BASE FORM will be used ONLY in Word Transformation Challenge section
         - In Translation Challenge and Conversation, you can use ANY form (including the original word from vocabulary)
         - This ensures Word Transformation Challenge can generate all 5 forms properly
         
         **Task:**
-        1. Select **5 vocabulary words** following the rules above
-        2. Create a daily learning challenge based on these 5 selected words
-        3. If user has specific weaknesses, incorporate vocabulary that helps address those areas
+        1. Create a daily learning challenge based on the {len(selected)} words above
+        2. If user has specific weaknesses, incorporate them in the sentences
 
         # Context Setting
         The user is a Software Engineer. The context is **General Professional English**.
@@ -54,7 +238,7 @@ class AIService:
         Please generate a Markdown response with this exact structure:
         
         # Daily Task
-        **Selected Vocabulary:** [List the 5 ORIGINAL words from vocabulary here]
+        **Selected Vocabulary:** {", ".join(selected)}
         **Focus:** Clear Professional Communication
         
         ## 💡 Daily Tips
@@ -157,147 +341,133 @@ class AIService:
         """
 
         try:
-            response = self.client.models.generate_content(
-                model="gemini-3-flash-preview", contents=prompt
-            )
-            
-            # Log token usage
-            if hasattr(response, 'usage_metadata'):
-                self.token_monitor.log_usage(
-                    operation="generate_daily_task",
-                    input_tokens=response.usage_metadata.prompt_token_count,
-                    output_tokens=response.usage_metadata.candidates_token_count,
-                    model="gemini-3-flash-preview"
-                )
-            
-            return response.text
+            return self._generate("generate_daily_task", prompt)
         except Exception as e:
             return f"Error generating task from AI: {str(e)}"
 
+    @timed("review.apply")
     def extract_vocabulary_mastery_from_review(
-        self, review_content: str, date: str
+        self, review: Task1Review, date: str
     ) -> None:
-        """Extract vocabulary mastery from Task 1 review and update profile."""
-        import re
-
-        # Extract words and their accuracy from review
-        # Pattern: ### Word X: [word] (type: [n/v/adj/adv])
-        word_pattern = r"### Word \d+: (\w+)(?: \(type: ([nvadj]+)\))?"
-        matches = re.findall(word_pattern, review_content, re.IGNORECASE)
-
-        for word, word_type in matches:
-            # Count correct/wrong forms for this word
-            # Look for ✓ Benar and ✗ Salah in the word's section
-            # Pattern: from ### Word X to next ### Word or Summary section
-            word_section_pattern = rf"### Word \d+: {word}.*?(?=### Word \d+:|---\s*\*\*Summary|$)"
-            word_section = re.search(
-                word_section_pattern, review_content, re.DOTALL | re.IGNORECASE
+        """Update vocabulary mastery from a structured Task 1 review."""
+        tracing.current().set(words_found=len(review.words))
+
+        for word_review in review.words:
+            forms_meanings = word_review.forms_meanings
+
+            self.profile_manager.update_vocabulary_mastery(
+                word=word_review.word,
+                word_type=word_review.word_type,
+                # Use Verb meaning as main word meaning
+                meaning=forms_meanings.get("verb"),
+                accuracy_score=word_review.accuracy,
+                forms_correct=word_review.forms_correct,
+                forms_weak=word_review.forms_weak,
+                forms_data=word_review.forms_data,
+                forms_meanings=forms_meanings,
+                date=date,
             )
 
-            if word_section:
-                section_text = word_section.group(0)
-
-                # Count status markers
-                correct_count = section_text.count("✓")
+            # Keep a warm index (daemon, worker) in step with the database
+            if self._morphology is not None:
+                self._morphology.learn(
+                    word_review.word, word_review.forms_data, forms_meanings
+                )
 
-                total_forms = 5  # verb, noun, adj, adv, opposite
-                forms_correct_count = correct_count
+    def review_task1(self, user_answers: str) -> Task1Review:
+        """Review Task 1 (Word Transformation Challenge).
 
-                # Calculate accuracy
-                accuracy = int((forms_correct_count / total_forms) * 100)
+        Words whose family is fully confirmed are graded locally; only the
+        remaining words are sent to the model, and the results are merged in
+        the student's order. Raises on API or schema errors.
+        """
+        with timed("review.pregrade") as span:
+            parsed = task1_grader.parse_answers(user_answers)
+            word_types = self.profile_manager.vocab_db.get_word_types(
+                [p["word"] for p in parsed]
+            )
+            local = {}
+            pending = []
+            for parsed_word in parsed:
+                word_review = task1_grader.grade_word(
+                    parsed_word, self.morphology, word_types.get(parsed_word["word"])
+                )
+                if word_review:
+                    local[parsed_word["word"]] = word_review
+                else:
+                    pending.append(parsed_word)
+            span.set(words=len(parsed), graded_locally=len(local))
 
-                # Extract form values and meanings from table
-                # Pattern: | Form | Correct Answer | ... | Status | Arti |
-                forms_data = {}
-                forms_meanings = {}
-                meaning = None
+        # Layout we can't parse: let the model read it as written
+        if not parsed:
+            return self._review_task1_with_model(user_answers)
 
-                for form_name in ["Verb", "Noun", "Adjective", "Adverb", "Opposite"]:
-                    # Extract form value and meaning
-                    # Pattern: | Form | value | ... | status | meaning |
-                    pattern = (
-                        rf"\| {form_name} \| ([^|]+) \| [^|]+ \| [^|]+ \| ([^|]+) \|"
-                    )
-                    match = re.search(pattern, section_text)
-                    if match:
-                        form_value = match.group(1).strip()
-                        form_meaning = match.group(2).strip()
-
-                        # Save form value
-                        if form_value and form_value != "..." and form_value != "-":
-                            forms_data[form_name.lower()] = form_value
-
-                        # Save form meaning
-                        if (
-                            form_meaning
-                            and form_meaning != "..."
-                            and form_meaning != "-"
-                        ):
-                            forms_meanings[form_name.lower()] = form_meaning
-
-                            # Use Verb meaning as main word meaning
-                            if form_name == "Verb" and not meaning:
-                                meaning = form_meaning
-
-                # Determine which forms are correct/weak
-                forms_correct = []
-                forms_weak = []
-
-                if (
-                    "| Verb |" in section_text
-                    and "✓" in section_text.split("| Verb |")[1].split("\n")[0]
-                ):
-                    forms_correct.append("verb")
-                else:
-                    forms_weak.append("verb")
+        if not pending:
+            words = [local[p["word"]] for p in parsed]
+            return Task1Review(words=words, summary=task1_grader.local_summary(words))
 
-                if (
-                    "| Noun |" in section_text
-                    and "✓" in section_text.split("| Noun |")[1].split("\n")[0]
-                ):
-                    forms_correct.append("noun")
-                else:
-                    forms_weak.append("noun")
+        model_review = self._review_task1_with_model(
+            task1_grader.render_answers(pending)
+        )
+        if not local:
+            return model_review
+
+        # The model may answer with the base form instead of the given word
+        model_words = {w.word.lower(): w for w in model_review.words}
+        words = []
+        for parsed_word in parsed:
+            word_review = local.get(parsed_word["word"]) or model_words.pop(
+                parsed_word["word"], None
+            )
+            if word_review:
+                words.append(word_review)
+        words += model_words.values()
 
-                if (
-                    "| Adjective |" in section_text
-                    and "✓" in section_text.split("| Adjective |")[1].split("\n")[0]
-                ):
-                    forms_correct.append("adjective")
-                else:
-                    forms_weak.append("adjective")
+        return Task1Review(
+            words=words,
+            summary=f"{task1_grader.local_summary(words)} {model_review.summary}",
+        )
 
-                if (
-                    "| Adverb |" in section_text
-                    and "✓" in section_text.split("| Adverb |")[1].split("\n")[0]
-                ):
-                    forms_correct.append("adverb")
-                else:
-                    forms_weak.append("adverb")
+    def _review_task1_with_model(self, user_answers: str) -> Task1Review:
+        """Review Task 1 answers with Gemini.
 
-                if (
-                    "| Opposite |" in section_text
-                    and "✓" in section_text.split("| Opposite |")[1].split("\n")[0]
-                ):
-                    forms_correct.append("opposite")
-                else:
-                    forms_weak.append("opposite")
-
-                # Update profile with word_type, forms_data, forms_meanings, and meaning
-                self.profile_manager.update_vocabulary_mastery(
-                    word=word,
-                    word_type=word_type if word_type else None,
-                    meaning=meaning,
-                    accuracy_score=accuracy,
-                    forms_correct=forms_correct,
-                    forms_weak=forms_weak,
-                    forms_data=forms_data,
-                    forms_meanings=forms_meanings,
-                    date=date,
+        The model answers with JSON following Task1Review, so words can't be
+        dropped by table format drift. Forms of word families known locally
+        are sent as the answer key and not generated again by the model.
+        """
+        known = self._known_families(user_answers)
+        known_section = ""
+        if known:
+            families = {base: self.morphology.lookup(base) for base in known}
+            with_meanings = [
+                base
+                for base, family in families.items()
+                if family is not None
+                and all(
+                    form in family["meanings"]
+                    for form, value in family["forms"].items()
+                    if value != "-"
+                )
+            ]
+            known_section = (
+                "**Confirmed forms (grade against these):**\n"
+                + "\n".join(self.morphology.describe(known))
+                + '\nFor these words set "correct_answer" to "" (filled in locally).'
+            )
+            if with_meanings:
+                known_section += (
+                    ' Also set "meaning" to "" for: ' + ", ".join(with_meanings) + "."
                 )
+        hints = self.morphology.describe(
+            self._known_families(user_answers, confirmed=False), confirmed=False
+        )
+        if hints:
+            known_section += (
+                "\n\n**Reference forms (unverified, correct them if wrong):**\n"
+                + "\n".join(hints)
+            )
+        tracing.current().set(known_families=len(known), hint_families=len(hints))
 
-    def review_task1(self, user_answers: str) -> str:
-        """Review Task 1 (Word Transformation Challenge)."""
         prompt = f"""
         You are an expert English Tutor reviewing a student's word transformation exercise.
         
@@ -305,14 +475,16 @@ class AIService:
         
         {user_answers}
         
+        {known_section}
+        
         **Your task:**
-        1. Review each word and its transformations
+        1. Review each word and its transformations (verb, noun, adjective, adverb, opposite)
         2. Correct any mistakes (spelling, wrong forms, or missing forms)
-        3. Add missing forms if the student left them blank
+        3. Add missing forms if the student left them blank (status "added")
         4. Provide Indonesian meanings WITH CONTEXT for each word form
         5. Identify the PRIMARY word type (n/v/adj/adv) - the most common usage
         
-        **IMPORTANT for "Arti" column:**
+        **IMPORTANT for "meaning":**
         - Provide meaning with CONTEXT/NUANCE in parentheses
         - Help distinguish similar words (e.g., streamline vs simplify)
         - Format: "Arti utama (konteks/nuansa penggunaan)"
@@ -322,45 +494,27 @@ class AIService:
           * facilitate: "Memfasilitasi (memudahkan proses/kegiatan)"
           * alignment: "Penyelarasan (menyamakan arah/tujuan)"
         
-        **Output format:**
-        Start directly with word reviews. NO greeting or intro paragraphs.
-        
-        ### Word 1: [Word] (type: [n/v/adj/adv])
-        
-        | Form | Correct Answer | Student's Answer | Status | Arti |
-        |------|----------------|------------------|--------|------|
-        | Verb | ... | ... | ✓/✗/+ | Arti (konteks penggunaan) |
-        | Noun | ... | ... | ✓/✗/+ | Arti (konteks penggunaan) |
-        | Adjective | ... | ... | ✓/✗/+ | Arti (konteks penggunaan) |
-        | Adverb | ... | ... | ✓/✗/+ | Arti (konteks penggunaan) |
-        | Opposite | ... | ... | ✓/✗/+ | Arti (konteks penggunaan) |
-        
-        (Repeat for all words)
-        
-        ---
-        
-        **Summary:** [1-2 sentences only: overall score and main improvement area]
-        
-        Use Bahasa Indonesia. Be concise and direct.
+        Use "-" when a form does not exist or the student left it blank.
+        Summary: 1-2 sentences in Bahasa Indonesia, overall score and main improvement area.
         """
 
         try:
-            response = self.client.models.generate_content(
-                model="gemini-3-flash-preview", contents=prompt
+            raw = self._generate(
+                "review_task1",
+                prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=Task1Review,
+                ),
             )
-            
-            # Log token usage
-            if hasattr(response, 'usage_metadata'):
-                self.token_monitor.log_usage(
-                    operation="review_task1",
-                    input_tokens=response.usage_metadata.prompt_token_count,
-                    output_tokens=response.usage_metadata.candidates_token_count,
-                    model="gemini-3-flash-preview"
-                )
-            
-            return response.text
         except Exception as e:
-            return f"Error reviewing task: {str(e)}"
+            raise RuntimeError(f"Error reviewing task: {e}") from e
+
+        with timed("review.parse", chars=len(raw)):
+            review = Task1Review.model_validate_json(raw)
+
+        self._fill_known_forms(review)
+        return review
 
     def review_task2(self, indonesian_sentences: str, user_translations: str) -> str:
         """Review Task 2 (Translation Challenge)."""
@@ -414,20 +568,7 @@ class AIService:
         """
 
         try:
-            response = self.client.models.generate_content(
-                model="gemini-3-flash-preview", contents=prompt
-            )
-            
-            # Log token usage
-            if hasattr(response, 'usage_metadata'):
-                self.token_monitor.log_usage(
-                    operation="review_task2",
-                    input_tokens=response.usage_metadata.prompt_token_count,
-                    output_tokens=response.usage_metadata.candidates_token_count,
-                    model="gemini-3-flash-preview"
-                )
-            
-            return response.text
+            return self._generate("review_task2", prompt)
         except Exception as e:
             return f"Error reviewing task: {str(e)}"
 
@@ -486,20 +627,7 @@ class AIService:
         """
 
         try:
-            response = self.client.models.generate_content(
-                model="gemini-3-flash-preview", contents=prompt
-            )
-            
-            # Log token usage
-            if hasattr(response, 'usage_metadata'):
-                self.token_monitor.log_usage(
-                    operation="review_task3",
-                    input_tokens=response.usage_metadata.prompt_token_count,
-                    output_tokens=response.usage_metadata.candidates_token_count,
-                    model="gemini-3-flash-preview"
-                )
-            
-            return response.text
+            return self._generate("review_task3", prompt)
         except Exception as e:
             return f"Error reviewing task: {str(e)}"
 
@@ -556,20 +684,7 @@ class AIService:
         """
 
         try:
-            response = self.client.models.generate_content(
-                model="gemini-3-flash-preview", contents=prompt
-            )
-            
-            # Log token usage
-            if hasattr(response, 'usage_metadata'):
-                self.token_monitor.log_usage(
-                    operation="review_task4",
-                    input_tokens=response.usage_metadata.prompt_token_count,
-                    output_tokens=response.usage_metadata.candidates_token_count,
-                    model="gemini-3-flash-preview"
-                )
-            
-            return response.text
+            return self._generate("review_task4", prompt)
         except Exception as e:
             return f"Error reviewing task: {str(e)}"
 
@@ -622,21 +737,9 @@ class AIService:
         """
 
         try:
-            response = self.client.models.generate_content(
-                model="gemini-3-flash-preview", contents=prompt
+            return self._generate(
+                "generate_learning_material", prompt, metadata={"topic": topic}
             )
-            
-            # Log token usage
-            if hasattr(response, 'usage_metadata'):
-                self.token_monitor.log_usage(
-                    operation="generate_learning_material",
-                    input_tokens=response.usage_metadata.prompt_token_count,
-                    output_tokens=response.usage_metadata.candidates_token_count,
-                    model="gemini-3-flash-preview",
-                    metadata={"topic": topic}
-                )
-            
-            return response.text
         except Exception as e:
             return f"Error generating material: {str(e)}"
 
@@ -671,9 +774,9 @@ class AIService:
             topics.append(f"{topic_name} for Tech Workplace")
 
         # Add vocabulary gap topics
-        vocab_gaps = profile.get("vocabulary_gaps", [])
+        vocab_gaps = self.profile_manager.get_vocabulary_gaps(limit=3)
         if vocab_gaps:
-            vocab_words = [v["word"] for v in vocab_gaps[:3]]
+            vocab_words = [v["word"] for v in vocab_gaps]
             topics.append(f"Essential Vocabulary: {', '.join(vocab_words)}")
 
         return topics[:5]  # Return top 5 suggestions
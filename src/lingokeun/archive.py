@@ -0,0 +1,191 @@
+import os
+import time
+import zipfile
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from . import storage
+from .metrics import timed
+
+ARCHIVE_DIR = "archive"
+INDEX = "index.json"
+# Files untouched for this long are archived by default
+ARCHIVE_AFTER_DAYS = 90
+
+
+class Archive:
+    """Compressed yearly zip archives of the old files in one directory.
+
+    <dir>/archive/<year>.zip holds files last modified in that year and
+    <dir>/archive/index.json maps each member to its zip, so finding an
+    archived file is a dict lookup instead of opening every archive. Loose
+    files always win: a file restored for writing shadows its old member.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.archive_dir = directory / ARCHIVE_DIR
+        self.index_file = self.archive_dir / INDEX
+
+    def _empty_index(self) -> dict:
+        # stale: restored files whose old copy is still in an archive
+        return {"members": {}, "stale": {}}
+
+    def members(self) -> dict[str, dict]:
+        """Archived file name -> {"archive", "size", "mtime", "archived_at"}."""
+        return storage.read_json(self.index_file, self._empty_index)["members"]
+
+    def contains(self, name: str) -> bool:
+        return name in self.members()
+
+    def read_bytes(self, name: str) -> bytes | None:
+        """Content of an archived file, None if it isn't archived."""
+        entry = self.members().get(name)
+        if entry is None:
+            return None
+        with zipfile.ZipFile(self.archive_dir / entry["archive"]) as zf:
+            return zf.read(name)
+
+    def restore(self, name: str) -> bool:
+        """Put an archived file back in place, e.g. before appending to it."""
+        if not self.index_file.exists():
+            return False
+        with storage.file_lock(self.index_file):
+            data = storage.read_json(self.index_file, self._empty_index)
+            entry = data["members"].get(name)
+            if entry is None:
+                return False
+
+            target = self.directory / name
+            tmp = target.with_name(f".{name}.restore")
+            with zipfile.ZipFile(self.archive_dir / entry["archive"]) as zf:
+                tmp.write_bytes(zf.read(name))
+            os.utime(tmp, (entry["mtime"], entry["mtime"]))
+            os.replace(tmp, target)
+
+            # The zip keeps a stale copy until the file is archived again
+            data.setdefault("stale", {})[name] = entry["archive"]
+            del data["members"][name]
+            storage.write_json(self.index_file, data)
+        return True
+
+    def candidates(self, days: int, pattern: str = "*.md") -> list[Path]:
+        """Loose files matching pattern not modified for `days` days."""
+        cutoff = time.time() - days * 86400
+        return sorted(
+            path
+            for path in self.directory.glob(pattern)
+            if path.is_file() and path.stat().st_mtime < cutoff
+        )
+
+    @timed("archive.add")
+    def add(self, files: list[Path]) -> dict[str, int]:
+        """Move files into their yearly archive; returns files per archive.
+
+        Each zip is written and closed, then the index updated, and only then
+        are the loose files removed, so an interruption never loses a file.
+        """
+        by_archive = defaultdict(list)
+        for path in files:
+            year = datetime.fromtimestamp(path.stat().st_mtime).year
+            by_archive[f"{year}.zip"].append(path)
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        with storage.file_lock(self.index_file):
+            data = storage.read_json(self.index_file, self._empty_index)
+            stale = data.setdefault("stale", {})
+
+            # Old copies of re-archived (restored or rewritten) files may sit
+            # in another year's zip
+            names = {path.name for path in files}
+            for name in names & data["members"].keys():
+                stale.setdefault(name, data["members"][name]["archive"])
+            for archive_name in {stale[n] for n in names if n in stale}:
+                self._drop_members(self.archive_dir / archive_name, names)
+
+            for archive_name, paths in sorted(by_archive.items()):
+                target = self.archive_dir / archive_name
+                if target.exists():
+                    self._drop_members(target, {path.name for path in paths})
+
+                with zipfile.ZipFile(
+                    target, "a", zipfile.ZIP_DEFLATED, compresslevel=9
+                ) as zf:
+                    for path in paths:
+                        zf.write(path, arcname=path.name)
+
+                now = datetime.now().isoformat()
+                for path in paths:
+                    stale.pop(path.name, None)
+                    stat = path.stat()
+                    data["members"][path.name] = {
+                        "archive": archive_name,
+                        "size": stat.st_size,
+                        "mtime": stat.st_mtime,
+                        "archived_at": now,
+                    }
+
+            storage.write_json(self.index_file, data)
+
+        for path in files:
+            path.unlink()
+        return {name: len(paths) for name, paths in by_archive.items()}
+
+    def _drop_members(self, target: Path, names: set[str]) -> None:
+        """Rewrite an archive without stale copies of the given members."""
+        if not target.exists():
+            return
+        with zipfile.ZipFile(target) as zf:
+            if not names & set(zf.namelist()):
+                return
+            tmp = target.with_name(f".{target.name}.tmp")
+            with zipfile.ZipFile(
+                tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=9
+            ) as out:
+                for info in zf.infolist():
+                    if info.filename not in names:
+                        out.writestr(info, zf.read(info.filename))
+        os.replace(tmp, target)
+
+    def stats(self) -> dict:
+        """Archived file count, original and compressed size."""
+        members = self.members()
+        archives = list(self.archive_dir.glob("*.zip"))
+        return {
+            "files": len(members),
+            "archives": len(archives),
+            "original_bytes": sum(m["size"] for m in members.values()),
+            "archive_bytes": sum(a.stat().st_size for a in archives),
+        }
+
+
+def exists(path: Path) -> bool:
+    """Whether a file exists loose or in its directory's archive."""
+    return path.exists() or Archive(path.parent).contains(path.name)
+
+
+def read_text(path: Path) -> str:
+    """Read a file, from its directory's archive if it was archived."""
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+    content = Archive(path.parent).read_bytes(path.name)
+    if content is None:
+        raise FileNotFoundError(path)
+    return content.decode("utf-8")
+
+
+def ensure_loose(path: Path) -> bool:
+    """Restore an archived file so it can be modified; False if it's missing."""
+    return path.exists() or Archive(path.parent).restore(path.name)
+
+
+def list_names(directory: Path, pattern: str = "*.md") -> list[str]:
+    """Stems of loose and archived files in a directory."""
+    names = {path.stem for path in directory.glob(pattern)}
+    names.update(
+        Path(name).stem
+        for name in Archive(directory).members()
+        if Path(name).match(pattern)
+    )
+    return sorted(names)
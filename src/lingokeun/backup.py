@@ -0,0 +1,247 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from . import paths, storage
+from .metrics import timed
+
+DATABASES = ("vocabulary_mastery.db",)
+JSON_STORES = (
+    "user_profile.json",
+    "token_usage.json",
+    "token_counters.json",
+    "task_queue.json",
+)
+MANIFEST = "manifest.json"
+# Pages copied per backup step; writers can get in between steps
+PAGES_PER_STEP = 256
+STEP_SLEEP_SECONDS = 0.005
+# Copies restarted by concurrent writes before falling back to one pass
+MAX_RESTARTS = 3
+# Retention: the newest KEEP_LAST backups plus the last one of each of the
+# KEEP_DAILY most recent days
+KEEP_LAST = 10
+KEEP_DAILY = 14
+
+
+def backups_dir() -> Path:
+    """Directory holding the active learner's backups."""
+    return paths.profile_dir() / "backups"
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def list_backups() -> list[dict]:
+    """Manifests of the learner's backups, newest first."""
+    root = backups_dir()
+    if not root.exists():
+        return []
+    manifests = []
+    for directory in sorted(root.iterdir(), reverse=True):
+        # Unfinished backups are hidden .tmp directories
+        if directory.name.startswith("."):
+            continue
+        manifest = storage.read_json(directory / MANIFEST, dict)
+        if manifest:
+            manifests.append(manifest)
+    return manifests
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def _copy_database(source: Path, target: Path) -> None:
+    """Online copy of a live SQLite database, a batch of pages at a time.
+
+    Writers only wait for one batch. A write by another connection makes
+    SQLite restart the copy; if that keeps happening, the copy is redone
+    in a single step, which holds the read lock for one full pass.
+    """
+    restarts = 0
+    last_remaining = None
+
+    def progress(status, remaining, total):
+        nonlocal restarts, last_remaining
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts > MAX_RESTARTS:
+                raise _TooManyRestarts()
+        last_remaining = remaining
+
+    src = sqlite3.connect(f"{source.resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+    try:
+        dst = sqlite3.connect(target)
+        try:
+            src.backup(
+                dst, pages=PAGES_PER_STEP, progress=progress, sleep=STEP_SLEEP_SECONDS
+            )
+        except _TooManyRestarts:
+            src.backup(dst, pages=-1)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+def _snapshot_json(source: Path, target: Path) -> None:
+    """Copy a JSON store while holding its lock, so no write is half seen."""
+    with storage.file_lock(source):
+        shutil.copyfile(source, target)
+
+
+def _previous_copy(previous: dict | None, name: str) -> tuple[dict, Path] | None:
+    """Manifest entry and file of a store in the previous backup, if kept."""
+    if previous is None or name not in previous["files"]:
+        return None
+    path = backups_dir() / previous["id"] / name
+    return (previous["files"][name], path) if path.exists() else None
+
+
+@timed("backup.create")
+def create(label: str | None = None) -> dict:
+    """Back up the learner's stores into backups/<timestamp>/.
+
+    Incremental: a store unchanged since the previous backup (same source
+    mtime and size, or same checksum) is hard-linked to the previous copy
+    instead of being copied again. Writes a manifest with checksums, then
+    applies the retention policy.
+    """
+    source_dir = paths.profile_dir()
+    previous = next(iter(list_backups()), None)
+
+    backup_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    target_dir = backups_dir() / backup_id
+    tmp_dir = backups_dir() / f".{backup_id}.tmp"
+    tmp_dir.mkdir(parents=True)
+
+    files = {}
+    for name in (*DATABASES, *JSON_STORES):
+        source = source_dir / name
+        if not source.exists():
+            continue
+
+        stat = source.stat()
+        entry = {"source_mtime_ns": stat.st_mtime_ns, "source_size": stat.st_size}
+        old = _previous_copy(previous, name)
+        target = tmp_dir / name
+
+        if old is not None:
+            old_entry, old_copy = old
+            if (
+                old_entry["source_mtime_ns"] == entry["source_mtime_ns"]
+                and old_entry["source_size"] == entry["source_size"]
+            ):
+                os.link(old_copy, target)
+                files[name] = {**old_entry, **entry, "linked": True}
+                continue
+
+        if name in DATABASES:
+            _copy_database(source, target)
+        else:
+            _snapshot_json(source, target)
+
+        checksum = _sha256(target)
+        linked = False
+        if old is not None and old[0]["sha256"] == checksum:
+            # Touched but unchanged: share the previous copy
+            target.unlink()
+            os.link(old[1], target)
+            linked = True
+
+        files[name] = {
+            **entry,
+            "sha256": checksum,
+            "size": target.stat().st_size,
+            "linked": linked,
+        }
+
+    manifest: dict = {
+        "id": backup_id,
+        "created_at": datetime.now().isoformat(),
+        "user": paths.current_user(),
+        "label": label,
+        "files": files,
+    }
+    storage.write_json(tmp_dir / MANIFEST, manifest)
+    # A backup only becomes visible once it is complete
+    os.rename(tmp_dir, target_dir)
+
+    manifest["removed"] = rotate()
+    return manifest
+
+
+def rotate(keep_last: int = KEEP_LAST, keep_daily: int = KEEP_DAILY) -> list[str]:
+    """Delete backups outside the retention policy; returns their ids."""
+    backups = list_backups()
+    keep = {b["id"] for b in backups[:keep_last]}
+
+    cutoff = (datetime.now() - timedelta(days=keep_daily)).strftime("%Y%m%d")
+    seen_days = set()
+    for b in backups:
+        day = b["id"][:8]
+        if day >= cutoff and day not in seen_days:
+            seen_days.add(day)
+            keep.add(b["id"])
+
+    removed = []
+    for b in backups:
+        if b["id"] not in keep:
+            shutil.rmtree(backups_dir() / b["id"])
+            removed.append(b["id"])
+    return removed
+
+
+def verify(manifest: dict) -> list[str]:
+    """Names of files in a backup whose checksum doesn't match."""
+    directory = backups_dir() / manifest["id"]
+    return [
+        name
+        for name, entry in manifest["files"].items()
+        if not (directory / name).exists()
+        or _sha256(directory / name) != entry["sha256"]
+    ]
+
+
+def find(backup_id: str = "latest") -> dict | None:
+    """Manifest of a backup by id (or id prefix), or the latest one."""
+    backups = list_backups()
+    if backup_id == "latest":
+        return backups[0] if backups else None
+    return next((b for b in backups if b["id"].startswith(backup_id)), None)
+
+
+@timed("backup.restore")
+def restore(manifest: dict) -> list[str]:
+    """Put a backup's stores back in place; returns the restored names.
+
+    Databases are written through the backup API into the live file, so
+    open connections see a consistent switch; JSON stores are replaced
+    atomically under their lock.
+    """
+    directory = backups_dir() / manifest["id"]
+    target_dir = paths.profile_dir()
+
+    restored = []
+    for name in manifest["files"]:
+        source = directory / name
+        target = target_dir / name
+
+        if name in DATABASES:
+            _copy_database(source, target)
+        else:
+            with storage.file_lock(target):
+                tmp = target.with_name(f".{name}.restore")
+                shutil.copyfile(source, tmp)
+                os.replace(tmp, target)
+        restored.append(name)
+    return restored
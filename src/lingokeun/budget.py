@@ -0,0 +1,127 @@
+import math
+
+from .config import settings
+from .learners import LearnerRegistry
+from .metrics import timed
+from .token_monitor import TokenMonitor
+
+# Estimate for operations whose prompts haven't been measured yet
+CHARS_PER_TOKEN = 4
+# Output assumed for an operation without any recorded calls
+DEFAULT_OUTPUT_TOKENS = 2048
+# Percentile of past output sizes a call is budgeted for
+OUTPUT_PERCENTILE = 90
+# Smallest output cap a downgraded call is still made with
+MIN_DOWNGRADE_OUTPUT = 512
+
+
+class BudgetExceeded(RuntimeError):
+    """An API call was refused because it would overrun a token budget."""
+
+
+class OutputTruncated(RuntimeError):
+    """The model stopped at its output token limit; the reply is incomplete."""
+
+
+def percentile(values: list[int], pct: int) -> int:
+    """Nearest-rank percentile of a small sample."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+class BudgetPolicy:
+    """Decides, before a call, whether it fits the daily token budgets.
+
+    The call is projected as estimated input tokens (prompt length with the
+    operation's measured chars-per-token) plus the 90th percentile of its
+    recent output sizes. Spent tokens come from running counters, so a check
+    reads a few numbers and never the usage history.
+    """
+
+    def __init__(self, token_monitor: TokenMonitor | None = None):
+        self.token_monitor = token_monitor or TokenMonitor()
+
+    def project(self, operation: str, prompt: str) -> dict:
+        """Expected input and output tokens of one call."""
+        stats = self.token_monitor.get_counters()["operations"].get(operation, {})
+
+        if stats.get("prompt_chars"):
+            chars_per_token = stats["prompt_chars"] / max(stats["prompt_tokens"], 1)
+        else:
+            chars_per_token = CHARS_PER_TOKEN
+        outputs = stats.get("outputs") or [DEFAULT_OUTPUT_TOKENS]
+
+        return {
+            "input": math.ceil(len(prompt) / chars_per_token),
+            "output": percentile(outputs, OUTPUT_PERCENTILE),
+            "output_median": percentile(outputs, 50),
+        }
+
+    def remaining(self, operation: str) -> tuple[int, str] | None:
+        """Tokens left under the tightest budget and its name, None if unlimited."""
+        limits = []
+
+        if settings.TOKEN_BUDGET_DAILY:
+            usage = LearnerRegistry().get_day_usage()
+            spent = usage["input_tokens"] + usage["output_tokens"]
+            limits.append((settings.TOKEN_BUDGET_DAILY - spent, "daily"))
+
+        user_limit = settings.TOKEN_BUDGET_USER_DAILY
+        operation_limit = settings.TOKEN_BUDGET_OPERATIONS.get(operation)
+        if user_limit or operation_limit:
+            usage = self.token_monitor.day_usage()
+            if user_limit:
+                spent = usage["input"] + usage["output"]
+                limits.append((user_limit - spent, "user daily"))
+
+            if operation_limit:
+                op_usage = usage["operations"].get(operation, {})
+                spent = op_usage.get("input", 0) + op_usage.get("output", 0)
+                limits.append((operation_limit - spent, f"{operation} daily"))
+
+        return min(limits) if limits else None
+
+    @timed("budget.check")
+    def check(
+        self,
+        operation: str,
+        prompt: str,
+        projection: dict | None = None,
+        structured: bool = False,
+    ) -> dict:
+        """Return the decision for a call: allow, downgrade or refuse.
+
+        A call that doesn't fit is downgraded to a capped output size when
+        the cap still covers a typical (median) answer, and refused otherwise.
+        Structured (JSON schema) output is useless when cut off, so such
+        calls are never downgraded, only refused.
+        """
+        left = self.remaining(operation)
+        if left is None:
+            return {"action": "allow"}
+
+        remaining, budget = left
+        projection = projection or self.project(operation, prompt)
+        decision = {
+            "remaining": remaining,
+            "budget": budget,
+            "projected": projection["input"] + projection["output"],
+        }
+
+        if decision["projected"] <= remaining:
+            return {**decision, "action": "allow"}
+
+        cap = remaining - projection["input"]
+        if not structured and cap >= max(
+            MIN_DOWNGRADE_OUTPUT, projection["output_median"]
+        ):
+            return {**decision, "action": "downgrade", "max_output_tokens": cap}
+
+        return {
+            **decision,
+            "action": "refuse",
+            "reason": (
+                f"{operation} needs ~{decision['projected']:,} tokens but the "
+                f"{budget} budget has {max(remaining, 0):,} left"
+            ),
+        }
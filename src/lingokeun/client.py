@@ -0,0 +1,85 @@
+import json
+import os
+import urllib.error
+import urllib.request
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+from . import storage
+from .server import TOKEN_HEADER, discovery_file
+
+# Set to 1 to always run commands in-process
+NO_DAEMON_ENV = "LINGOKEUN_NO_DAEMON"
+
+
+class DaemonError(Exception):
+    """Error response from the daemon."""
+
+
+class DaemonClient:
+    def __init__(self, host: str, port: int, token: str = ""):
+        self.base_url = f"http://{host}:{port}"
+        self.token = token
+
+    @classmethod
+    def discover(cls) -> Optional["DaemonClient"]:
+        """Return a client if a daemon is up for this learner and directory."""
+        if os.environ.get(NO_DAEMON_ENV):
+            return None
+
+        info_file = discovery_file()
+        if not info_file.exists():
+            return None
+
+        info = storage.read_json(info_file, dict)
+        # The daemon resolves tasks/ and profile/ relative to its own cwd
+        if not info or info.get("cwd") != os.getcwd():
+            return None
+
+        try:
+            os.kill(info["pid"], 0)
+        except (OSError, KeyError):
+            # Stale file from a daemon that didn't shut down cleanly
+            info_file.unlink(missing_ok=True)
+            return None
+
+        return cls(info["host"], info["port"], info.get("token", ""))
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        payload: dict | None = None,
+        query: dict | None = None,
+        timeout: float = 300,
+    ) -> Any:
+        """Send one JSON request and return the decoded response."""
+        url = self.base_url + path
+        if query:
+            url += "?" + urlencode(query)
+
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urllib.request.Request(
+            url,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json", TOKEN_HEADER: self.token},
+        )
+
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", str(e))
+            except ValueError:
+                message = str(e)
+            if e.code == 404:
+                return None
+            raise DaemonError(message) from e
+
+    def get(self, path: str, **query: str) -> Any:
+        return self.request("GET", path, query=query or None)
+
+    def post(self, path: str, payload: dict) -> Any:
+        return self.request("POST", path, payload=payload)
@@ -5,6 +5,28 @@ class Settings(BaseSettings):
     APP_NAME: str = "Lingokeun"
     GEMINI_API_KEY: str
 
+    # Token budgets per day, checked before each API call (0 = no limit)
+    TOKEN_BUDGET_DAILY: int = 0  # all learners together
+    TOKEN_BUDGET_USER_DAILY: int = 0  # the active learner
+    TOKEN_BUDGET_OPERATIONS: dict[str, int] = {}  # per operation name
+
+    # Gemini rate limits shared by every process on the machine (0 = off)
+    RATE_LIMIT_RPM: int = 60
+    RATE_LIMIT_TPM: int = 1_000_000
+
+    # Gemini model per operation: primary first, then fallbacks. Operations
+    # without a route use MODEL_DEFAULT, then MODEL_FALLBACKS
+    MODEL_DEFAULT: str = "gemini-3-flash-preview"
+    MODEL_FALLBACKS: list[str] = ["gemini-2.5-flash"]
+    MODEL_ROUTES: dict[str, list[str]] = {
+        "review_task4": ["gemini-2.5-flash-lite", "gemini-3-flash-preview"],
+    }
+    # Calls slower than this count against a model like errors do
+    MODEL_SLOW_MS: int = 60_000
+
+    # Take an incremental backup (see `lingokeun backup`) after each review
+    BACKUP_AFTER_REVIEW: bool = False
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
@@ -0,0 +1,144 @@
+import csv
+import json
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import TextIO
+
+from . import paths, storage
+from .metrics import timed
+from .user_profile import UserProfileManager
+from .vocabulary_db import VocabularyDatabase
+
+# Column each table's --since filter is keyed on (all indexed)
+SINCE_COLUMNS = {
+    "vocabulary": "updated_at",
+    "forms_mastery": "updated_at",
+    "review_history": "recorded_at",
+}
+# Weaknesses are a few dozen rows, so they are always exported in full
+TABLES = (*SINCE_COLUMNS, "weaknesses")
+FORMATS = ("jsonl", "csv")
+MANIFEST = "manifest.json"
+
+_QUERIES = {
+    "vocabulary": """
+        SELECT id, word, word_type, total_reviews, accuracy_score, last_reviewed,
+               source, meaning, created_at, updated_at
+        FROM vocabulary
+    """,
+    "forms_mastery": """
+        SELECT f.id, f.word_id, v.word, f.form_type, f.form_value, f.form_meaning,
+               f.is_mastered, f.updated_at
+        FROM forms_mastery f
+        JOIN vocabulary v ON v.id = f.word_id
+    """,
+    "review_history": """
+        SELECT h.id, h.word_id, v.word, h.review_date, h.accuracy, h.recorded_at
+        FROM review_history h
+        JOIN vocabulary v ON v.id = h.word_id
+    """,
+}
+_ALIASES = {"vocabulary": "", "forms_mastery": "f.", "review_history": "h."}
+
+
+def iter_table(db_path: Path, table: str, since: str | None = None) -> Iterator[dict]:
+    """Yield rows of one table lazily, optionally only those changed since."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    column = _ALIASES[table] + SINCE_COLUMNS[table]
+
+    sql = _QUERIES[table]
+    params: tuple = ()
+    if since:
+        sql += f" WHERE {column} >= ?"
+        params = (since,)
+    sql += f" ORDER BY {column}"
+
+    try:
+        # The cursor steps through the result set; rows are never all in memory
+        for row in conn.execute(sql, params):
+            yield dict(row)
+    finally:
+        conn.close()
+
+
+def iter_weaknesses(profile_manager: UserProfileManager) -> Iterator[dict]:
+    """Yield one row per grammar/translation weakness in the profile."""
+    profile = profile_manager.load_profile()
+
+    for category in ("grammar_weaknesses", "translation_weaknesses"):
+        for issue, data in profile[category].items():
+            history = data.get("history") or []
+            last_seen = history[-1]["date"] if history else data.get("first_seen")
+            yield {
+                "category": category.removesuffix("_weaknesses"),
+                "issue": issue,
+                "total_mistakes": data["total_mistakes"],
+                "recent_mistakes": data.get("recent_mistakes", 0),
+                "trend": data.get("trend"),
+                "first_seen": data.get("first_seen"),
+                "last_seen": last_seen,
+            }
+
+
+def write_rows(rows: Iterator[dict], out: TextIO, fmt: str) -> int:
+    """Stream rows as JSONL or CSV; returns the number written."""
+    count = 0
+    writer = None
+    for row in rows:
+        if fmt == "jsonl":
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+        count += 1
+    return count
+
+
+def last_export(output_dir: Path) -> str | None:
+    """Start time of the previous export into a directory, if any."""
+    manifest = storage.read_json(output_dir / MANIFEST, dict)
+    return manifest.get("exported_at")
+
+
+def rows_for(table: str, since: str | None = None) -> Iterator[dict]:
+    """Row generator for one export table of the active learner."""
+    if table == "weaknesses":
+        return iter_weaknesses(UserProfileManager())
+    return iter_table(VocabularyDatabase().db_path, table, since)
+
+
+@timed("export.run")
+def export(
+    output_dir: Path,
+    tables: tuple = TABLES,
+    fmt: str = "jsonl",
+    since: str | None = None,
+) -> dict:
+    """Export tables into output_dir/<table>.<fmt> and write a manifest.
+
+    The manifest records when the export started; passing that as `since`
+    next time exports only rows changed in between.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    exported_at = datetime.now().isoformat()
+
+    counts = {}
+    for table in tables:
+        filepath = output_dir / f"{table}.{fmt}"
+        with open(filepath, "w", encoding="utf-8", newline="") as f:
+            counts[table] = write_rows(rows_for(table, since), f, fmt)
+
+    manifest = {
+        "user": paths.current_user(),
+        "exported_at": exported_at,
+        "since": since,
+        "format": fmt,
+        "rows": counts,
+    }
+    storage.write_json(output_dir / MANIFEST, manifest)
+    return manifest
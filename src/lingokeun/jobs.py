@@ -0,0 +1,403 @@
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from . import metrics, migrations, paths, workflow
+
+JOB_KINDS = ("generate", "review", "material")
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 30
+
+
+class LeaseLost(RuntimeError):
+    """The job's lease moved to another worker, which now owns the job."""
+
+
+def review_key(task_date: str, task_number: int, answers: str) -> str:
+    """Idempotency key of a review: the same answers are only reviewed once."""
+    digest = hashlib.sha256(answers.strip().encode("utf-8")).hexdigest()[:16]
+    return f"review:{task_date}:{task_number}:{digest}"
+
+
+class JobQueue:
+    """Durable queue of AI operations in the learner's profile DB.
+
+    Workers claim jobs with a time-limited lease, so a job whose worker died
+    is picked up again once the lease expires. The model result is stored
+    before it is applied, so a retry never pays for the same call twice, and
+    each apply step is recorded so it isn't repeated.
+    """
+
+    def __init__(self):
+        self.db_path = paths.profile_dir() / "vocabulary_mastery.db"
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        """Create or upgrade the schema (see migrations.py)."""
+        migrations.migrate(self.db_path)
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        idempotency_key: str | None = None,
+        max_attempts: int = MAX_ATTEMPTS,
+    ) -> tuple[int, bool]:
+        """Add a job unless one with the same key exists.
+
+        Returns the job id and whether a new job was queued. A failed job
+        with the same key is reset and queued again.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}'")
+
+        conn = self._connect()
+        now = datetime.now().isoformat()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO jobs
+                        (kind, payload, idempotency_key, max_attempts,
+                         available_at, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(idempotency_key) DO NOTHING
+                    RETURNING id
+                    """,
+                    (
+                        kind,
+                        json.dumps(payload, ensure_ascii=False),
+                        idempotency_key,
+                        max_attempts,
+                        time.time(),
+                        now,
+                    ),
+                )
+                inserted = cursor.fetchall()
+                if inserted:
+                    return inserted[0][0], True
+
+                row = conn.execute(
+                    "SELECT id, status FROM jobs WHERE idempotency_key = ?",
+                    (idempotency_key,),
+                ).fetchone()
+                if row["status"] != "failed":
+                    return row["id"], False
+
+                conn.execute(
+                    """
+                    UPDATE jobs
+                    SET status = 'queued', attempts = 0, error = NULL,
+                        available_at = ?, lease_owner = NULL, finished_at = NULL
+                    WHERE id = ?
+                    """,
+                    (time.time(), row["id"]),
+                )
+                return row["id"], True
+        finally:
+            conn.close()
+
+    def claim(self, worker_id: str, lease_seconds: int = LEASE_SECONDS) -> dict | None:
+        """Lease the oldest runnable job, including ones with expired leases."""
+        conn = self._connect()
+        now = time.time()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+
+            # Jobs whose last lease ran out with no attempts left give up here
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'failed', finished_at = ?,
+                    error = COALESCE(error, 'Lease expired')
+                WHERE status = 'running' AND lease_expires_at < ?
+                  AND attempts >= max_attempts
+                """,
+                (datetime.now().isoformat(), now),
+            )
+
+            row = conn.execute(
+                """
+                SELECT * FROM jobs
+                WHERE (status = 'queued' AND available_at <= ?)
+                   OR (status = 'running' AND lease_expires_at < ?)
+                ORDER BY id
+                LIMIT 1
+                """,
+                (now, now),
+            ).fetchone()
+
+            if row is None:
+                conn.commit()
+                return None
+
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'running', attempts = attempts + 1,
+                    lease_owner = ?, lease_expires_at = ?,
+                    started_at = COALESCE(started_at, ?)
+                WHERE id = ?
+                """,
+                (
+                    worker_id,
+                    now + lease_seconds,
+                    datetime.now().isoformat(),
+                    row["id"],
+                ),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["attempts"] += 1
+        return job
+
+    def _update_leased(self, job_id: int, worker_id: str, sql: str, params: tuple):
+        """Run an UPDATE only while this worker still holds the lease."""
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {sql} WHERE id = ? AND lease_owner = ?",
+                (*params, job_id, worker_id),
+            )
+        conn.close()
+        return cursor.rowcount > 0
+
+    def extend_lease(
+        self, job_id: int, worker_id: str, lease_seconds: int = LEASE_SECONDS
+    ) -> bool:
+        """Push the lease deadline out; False if the lease was lost."""
+        return self._update_leased(
+            job_id, worker_id, "lease_expires_at = ?", (time.time() + lease_seconds,)
+        )
+
+    def save_result(self, job_id: int, worker_id: str, result: str) -> bool:
+        """Store the model output before applying it."""
+        return self._update_leased(job_id, worker_id, "result = ?", (result,))
+
+    def mark_applied(self, job_id: int, worker_id: str, step: str) -> bool:
+        """Record that one apply step is done; recording it again is a no-op."""
+        return self._update_leased(
+            job_id,
+            worker_id,
+            "applied_steps = CASE WHEN instr(',' || applied_steps, ?) "
+            "THEN applied_steps ELSE applied_steps || ? END",
+            (f",{step},", f"{step},"),
+        )
+
+    def complete(self, job_id: int, worker_id: str, result: str) -> bool:
+        """Mark a job as done, keeping a stored model result."""
+        return self._update_leased(
+            job_id,
+            worker_id,
+            "status = 'done', result = COALESCE(result, ?), error = NULL, lease_owner = NULL, "
+            "finished_at = ?",
+            (result, datetime.now().isoformat()),
+        )
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """Requeue a job with backoff, or fail it when out of attempts."""
+        return self._update_leased(
+            job_id,
+            worker_id,
+            """
+            status = CASE WHEN attempts >= max_attempts
+                          THEN 'failed' ELSE 'queued' END,
+            available_at = ? + ? * attempts,
+            finished_at = CASE WHEN attempts >= max_attempts
+                               THEN ? ELSE NULL END,
+            error = ?, lease_owner = NULL
+            """,
+            (time.time(), RETRY_BACKOFF_SECONDS, datetime.now().isoformat(), error),
+        )
+
+    def get(self, job_id: int) -> dict | None:
+        """Fetch one job."""
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def list_jobs(self, limit: int = 10, status: str | None = None) -> list[dict]:
+        """Most recent jobs, optionally filtered by status."""
+        conn = self._connect()
+        if status:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?",
+                (status, limit),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+    def stats(self, hours: int = 24) -> dict:
+        """Job counts per status and throughput over the last N hours."""
+        since = (datetime.now() - timedelta(hours=hours)).isoformat()
+        conn = self._connect()
+
+        counts = {
+            row["status"]: row["n"]
+            for row in conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            )
+        }
+        row = conn.execute(
+            """
+            SELECT COUNT(*) AS done,
+                   AVG((julianday(finished_at) - julianday(started_at)) * 86400)
+                       AS avg_seconds
+            FROM jobs
+            WHERE status = 'done' AND finished_at >= ?
+            """,
+            (since,),
+        ).fetchone()
+        conn.close()
+
+        return {
+            "counts": {
+                status: counts.get(status, 0)
+                for status in ("queued", "running", "done", "failed")
+            },
+            "done": row["done"],
+            "per_hour": round(row["done"] / hours, 2),
+            "avg_seconds": round(row["avg_seconds"] or 0, 1),
+        }
+
+
+class Worker:
+    """Processes queued jobs with N threads sharing one AI service."""
+
+    def __init__(self, concurrency: int = 2, lease_seconds: int = LEASE_SECONDS):
+        self.queue = JobQueue()
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._service = None
+        self._service_lock = threading.Lock()
+
+    @property
+    def service(self):
+        """AIService, built on the first job that needs it."""
+        with self._service_lock:
+            if self._service is None:
+                from .ai_service import AIService
+
+                self._service = AIService()
+            return self._service
+
+    def process(self, job: dict, worker_id: str) -> str:
+        """Run one job and apply its result; returns a short summary.
+
+        Raises LeaseLost as soon as a leased update fails, so a worker that
+        stalled past its lease stops before repeating the new owner's work.
+        """
+        payload = job["payload"]
+
+        def leased(updated: bool) -> None:
+            if not updated:
+                raise LeaseLost(f"Lease of job #{job['id']} moved to another worker")
+
+        def on_step(step: str) -> None:
+            leased(self.queue.mark_applied(job["id"], worker_id, step))
+            leased(self.queue.extend_lease(job["id"], worker_id, self.lease_seconds))
+
+        if job["kind"] == "generate":
+            task_file, _ = workflow.generate_task(payload.get("date"), self.service)
+            return str(task_file)
+
+        if job["kind"] == "material":
+            return str(workflow.generate_material(self.service, payload["topic"]))
+
+        task_number = int(payload["task"])
+        result = job["result"]
+        if result is None:
+            result = workflow.request_review(
+                self.service, payload["date"], task_number, payload["answers"]
+            )
+            leased(self.queue.save_result(job["id"], worker_id, result))
+
+        leased(self.queue.extend_lease(job["id"], worker_id, self.lease_seconds))
+        workflow.apply_review(
+            self.service,
+            payload["date"],
+            task_number,
+            result,
+            marker=f"<!-- job:{job['id']} -->",
+            skip=frozenset(filter(None, job["applied_steps"].split(","))),
+            on_step=on_step,
+        )
+        return str(workflow.task_file_path(payload["date"]))
+
+    def run_one(self, worker_id: str, on_event=None) -> bool:
+        """Claim and process one job; False when nothing was runnable."""
+        job = self.queue.claim(worker_id, self.lease_seconds)
+        if job is None:
+            return False
+
+        start = time.perf_counter()
+        try:
+            summary = self.process(job, worker_id)
+        except LeaseLost as e:
+            # The new owner finishes the job; nothing to record here
+            if on_event:
+                on_event(job, "error", str(e))
+        except Exception as e:
+            self.queue.fail(job["id"], worker_id, str(e))
+            if on_event:
+                on_event(job, "error", str(e))
+        else:
+            self.queue.complete(job["id"], worker_id, summary)
+            if on_event:
+                on_event(job, "done", summary)
+        finally:
+            metrics.record(f"job.{job['kind']}", (time.perf_counter() - start) * 1000)
+        return True
+
+    def run(
+        self,
+        stop: threading.Event,
+        drain: bool = False,
+        poll_interval: float = 2.0,
+        on_event=None,
+    ) -> None:
+        """Process jobs until `stop` is set, or until idle when draining."""
+
+        def _loop(index: int):
+            worker_id = f"{self.worker_id}:{index}"
+            while not stop.is_set():
+                if not self.run_one(worker_id, on_event):
+                    if drain:
+                        return
+                    stop.wait(poll_interval)
+
+        threads = [
+            threading.Thread(target=_loop, args=(i,), daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        last_flush = time.monotonic()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.5)
+                # Long-running workers persist latency samples as they go
+                if time.monotonic() - last_flush > 30:
+                    metrics.flush()
+                    last_flush = time.monotonic()
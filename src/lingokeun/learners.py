@@ -0,0 +1,161 @@
+import sqlite3
+from datetime import date, datetime
+
+from . import paths
+
+
+class LearnerRegistry:
+    """Installation-wide index of learners for cross-user admin queries.
+
+    Per-learner data stays in its own shard; this table only holds the
+    counters an admin needs, so e.g. token spend per user is one indexed
+    SELECT instead of opening thousands of token_usage.json files.
+    """
+
+    def __init__(self):
+        self.db_path = paths.shared_dir() / "learners.db"
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize database with tables."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS learners (
+                user_id TEXT PRIMARY KEY,
+                input_tokens INTEGER NOT NULL DEFAULT 0,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                api_calls INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                last_active TEXT NOT NULL
+            )
+        """)
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_learners_tokens
+            ON learners((input_tokens + output_tokens) DESC)
+            """
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_learners_active ON learners(last_active)"
+        )
+        # Installation-wide spend per day, for the shared daily budget
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_usage (
+                day TEXT PRIMARY KEY,
+                input_tokens INTEGER NOT NULL DEFAULT 0,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                api_calls INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def record_tokens(
+        self, user_id: str, input_tokens: int, output_tokens: int
+    ) -> None:
+        """Add one API call's tokens to a learner's counters."""
+        conn = sqlite3.connect(self.db_path)
+        now = datetime.now().isoformat()
+
+        conn.execute(
+            """
+            INSERT INTO learners
+                (user_id, input_tokens, output_tokens, api_calls, created_at, last_active)
+            VALUES (?, ?, ?, 1, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                input_tokens = input_tokens + excluded.input_tokens,
+                output_tokens = output_tokens + excluded.output_tokens,
+                api_calls = api_calls + 1,
+                last_active = excluded.last_active
+            """,
+            (user_id, input_tokens, output_tokens, now, now),
+        )
+        conn.execute(
+            """
+            INSERT INTO daily_usage (day, input_tokens, output_tokens, api_calls)
+            VALUES (?, ?, ?, 1)
+            ON CONFLICT(day) DO UPDATE SET
+                input_tokens = input_tokens + excluded.input_tokens,
+                output_tokens = output_tokens + excluded.output_tokens,
+                api_calls = api_calls + 1
+            """,
+            (now[:10], input_tokens, output_tokens),
+        )
+
+        conn.commit()
+        conn.close()
+
+    def get_learners(self, limit: int = 50, order: str = "tokens") -> list[dict]:
+        """List learners by token spend (default) or last activity."""
+        order_sql = {
+            "tokens": "(input_tokens + output_tokens) DESC",
+            "active": "last_active DESC",
+        }[order]
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(
+            f"""
+            SELECT user_id, input_tokens, output_tokens, api_calls, last_active
+            FROM learners
+            ORDER BY {order_sql}
+            LIMIT ?
+            """,
+            (limit,),
+        )
+
+        learners = [
+            {
+                "user_id": row[0],
+                "input_tokens": row[1],
+                "output_tokens": row[2],
+                "total_tokens": row[1] + row[2],
+                "api_calls": row[3],
+                "last_active": row[4],
+            }
+            for row in cursor.fetchall()
+        ]
+        conn.close()
+        return learners
+
+    def get_day_usage(self, day: str | None = None) -> dict:
+        """Tokens all learners used on a day (default today)."""
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute(
+            """
+            SELECT input_tokens, output_tokens, api_calls FROM daily_usage
+            WHERE day = ?
+            """,
+            (day or date.today().isoformat(),),
+        ).fetchone()
+        conn.close()
+
+        input_tokens, output_tokens, api_calls = row or (0, 0, 0)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "api_calls": api_calls,
+        }
+
+    def get_totals(self) -> dict:
+        """Token spend summed over all learners."""
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute(
+            """
+            SELECT COUNT(*), COALESCE(SUM(input_tokens), 0),
+                   COALESCE(SUM(output_tokens), 0), COALESCE(SUM(api_calls), 0)
+            FROM learners
+            """
+        ).fetchone()
+        conn.close()
+
+        return {
+            "learners": row[0],
+            "input_tokens": row[1],
+            "output_tokens": row[2],
+            "api_calls": row[3],
+        }
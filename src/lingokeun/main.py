@@ -1,13 +1,21 @@
 import typer
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import Annotated
+import os
+import stat
 import threading
 import time
 import sys
-from .ai_service import AIService
+from . import archive, metrics, paths, profiling, tracing, workflow
+from .client import DaemonClient
+from .task_queue import TaskQueue
+from .user_profile import UserProfileManager
 
 # Inisialisasi aplikasi Typer
 app = typer.Typer()
+db_app = typer.Typer(help="Maintain the vocabulary database.")
+app.add_typer(db_app, name="db")
 
 
 def show_spinner(stop_event, message="Processing"):
@@ -23,18 +31,226 @@ def show_spinner(stop_event, message="Processing"):
     sys.stdout.flush()
 
 
+def run_with_spinner(message, func, *args):
+    """Call func(*args) while showing the spinner."""
+    stop_spinner = threading.Event()
+    spinner_thread = threading.Thread(target=show_spinner, args=(stop_spinner, message))
+    spinner_thread.start()
+    try:
+        return func(*args)
+    finally:
+        stop_spinner.set()
+        spinner_thread.join()
+
+
+def _prefetch_tasks(ahead: int) -> None:
+    """Pre-generate the next N days of tasks into the prefetch queue."""
+    from .ai_service import AIService
+
+    queue = TaskQueue()
+    service = AIService()
+    weak_words = service.profile_manager.get_vocabulary_context_for_ai()["weak"]
+    user_context = service.profile_manager.get_user_context_for_ai()
+
+    for offset in range(ahead):
+        task_date = (date.today() + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+        if archive.exists(workflow.task_file_path(task_date)):
+            typer.echo(f"   {task_date}: task file already exists, skipped")
+            continue
+
+        if queue.get(task_date, weak_words):
+            typer.echo(f"   {task_date}: already queued")
+            continue
+
+        markdown_content = service.generate_daily_task(
+            avoid_words=queue.queued_words(exclude_date=task_date)
+        )
+        if markdown_content.startswith("Error"):
+            typer.secho(f"   {task_date}: {markdown_content}", fg=typer.colors.RED)
+            raise typer.Exit(code=1)
+
+        queue.put(task_date, markdown_content, queue.snapshot(weak_words, user_context))
+        typer.secho(f"   {task_date}: queued", fg=typer.colors.GREEN)
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    user: str = typer.Option(
+        None,
+        "--user",
+        "-U",
+        envvar=paths.USER_ENV,
+        help="Learner id; each learner gets their own profile and tasks",
+    ),
+    trace: Annotated[
+        Path | None,
+        typer.Option(
+            "--trace",
+            help="Write nested spans of this command to FILE "
+            "(Chrome Trace JSON, or JSONL if FILE ends in .jsonl)",
+        ),
+    ] = None,
+    profile: str | None = typer.Option(
+        None,
+        "--profile",
+        help="Profile this command with cProfile (cpu) or tracemalloc (mem). "
+        f"Defaults to ${profiling.PROFILE_ENV}",
+    ),
+):
+    """Lingokeun: daily English tasks for Software Engineers."""
+    try:
+        paths.set_user(user)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--user")
+
+    command = ctx.invoked_subcommand or "lingokeun"
+    metrics.set_command(command)
+    if trace:
+        tracing.start(command)
+
+    profile = profile or profiling.mode_from_env()
+    profiler = None
+    if profile:
+        try:
+            profiler = profiling.Profiler(profile)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="--profile")
+        profiler.start()
+
+    start = time.perf_counter()
+
+    def _finish():
+        if profiler:
+            # Reports go next to the trace when there is one
+            report_dir = trace.parent if trace else profiling.default_output_dir()
+            report_file = profiler.stop(command, report_dir)
+            typer.echo(f"🔬 Profile report: {report_file}", err=True)
+        metrics.record("command.total", (time.perf_counter() - start) * 1000)
+        metrics.flush()
+        if trace:
+            tracing.finish(trace)
+
+    ctx.call_on_close(_finish)
+    # Root span, closed before _finish runs
+    ctx.with_resource(tracing.span(command))
+
+
+def _enqueue_job(kind: str, payload: dict, idempotency_key: str) -> None:
+    """Put an AI operation on the job queue and report its id."""
+    from .jobs import JobQueue
+
+    job_id, created = JobQueue().enqueue(kind, payload, idempotency_key)
+    if created:
+        typer.secho(f"\n📬 Queued job #{job_id} ({kind})", fg=typer.colors.GREEN)
+    else:
+        typer.secho(
+            f"\nℹ️  Same request already queued as job #{job_id}",
+            fg=typer.colors.YELLOW,
+        )
+    typer.echo("   Run `uv run lingokeun worker` to process it, `jobs` for status.")
+
+
+def _stdin_piped() -> bool:
+    """Whether stdin is a pipe or redirected file.
+
+    Terminals and the handles cron, IDEs or CI leave open are neither, and
+    reading them would block.
+    """
+    try:
+        mode = os.fstat(sys.stdin.fileno()).st_mode
+    except (OSError, ValueError):
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISREG(mode)
+
+
+def _read_answers(task_date: str, task_number: int, answers: str | None) -> str:
+    """Answers from --answers, the answers/ file, piped stdin, or the editor."""
+    if answers == "-":
+        typer.echo("\n📥 Answers read from stdin")
+        return sys.stdin.read()
+
+    answer_file = (
+        Path(answers) if answers else workflow.answer_file_path(task_date, task_number)
+    )
+    if answers and not answer_file.exists():
+        typer.secho(f"❌ Answer file not found: {answer_file}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+    if answer_file.exists():
+        typer.echo(f"\n📄 Answers read from {answer_file}")
+        return answer_file.read_text(encoding="utf-8")
+
+    if _stdin_piped():
+        user_input = sys.stdin.read()
+        if user_input.strip():
+            typer.echo("\n📥 Answers read from stdin")
+            return user_input
+
+    # Open editor for user input
+    typer.secho("\n✏️  Opening editor for your answers...", fg=typer.colors.YELLOW)
+    typer.echo("   Paste your completed task answers, save and close the editor.\n")
+
+    with metrics.timed("editor.wait"):
+        return typer.edit("")
+
+
 @app.command("generate")
-def generate():
+def generate(
+    ahead: int = typer.Option(
+        0,
+        "--ahead",
+        "-a",
+        help="Pre-generate tasks for the next N days into the prefetch queue",
+    ),
+    queue: bool = typer.Option(
+        False, "--queue", "-q", help="Enqueue as a job for `lingokeun worker`"
+    ),
+    status: bool = typer.Option(
+        False, "--status", help="Show the tasks waiting in the prefetch queue"
+    ),
+):
     """
     Generate materi latihan harian.
 
     Biarkan AI yang memilihkan 5 kata terbaik untukmu hari ini.
-    Usage: uv run lingokeun generate
+    Kalau task hari ini sudah ada di antrean prefetch, langsung dipakai.
+
+    Usage:
+    - uv run lingokeun generate
+    - uv run lingokeun generate --ahead 3 (cron: siapkan task 3 hari ke depan)
+    - uv run lingokeun generate --queue (dikerjakan oleh `lingokeun worker`)
+    - uv run lingokeun generate --status (lihat isi antrean prefetch)
     """
 
     # 1. Setup Tanggal
     today = date.today().strftime("%Y-%m-%d")
 
+    if status:
+        queued = TaskQueue().status()
+        if not queued:
+            typer.echo("📦 Antrean prefetch kosong.")
+            return
+        typer.secho(f"📦 {len(queued)} task di antrean prefetch:", fg=typer.colors.BLUE)
+        for task_date, created_at in queued.items():
+            typer.echo(f"   {task_date} | dibuat {created_at[:19].replace('T', ' ')}")
+        return
+
+    if queue:
+        _enqueue_job("generate", {"date": today}, f"generate:{today}")
+        return
+
+    if ahead > 0:
+        typer.secho(f"📦 Prefetching {ahead} day(s) of tasks...", fg=typer.colors.BLUE)
+        try:
+            _prefetch_tasks(ahead)
+        except typer.Exit:
+            raise
+        except Exception as e:
+            typer.secho(f"💥 Terjadi kesalahan sistem: {e}", fg=typer.colors.RED)
+            raise typer.Exit(code=1)
+        return
+
     # Header Tampilan
     typer.secho("=" * 40, fg=typer.colors.BLUE)
     typer.secho("🚀 LINGOKEUN: Daily Task Generator", fg=typer.colors.BLUE, bold=True)
@@ -42,39 +258,29 @@ def generate():
     typer.secho("=" * 40, fg=typer.colors.BLUE)
 
     try:
-        # 2. Proses AI
-        typer.secho("\n🤖 Menghubungi Gemini...", fg=typer.colors.YELLOW)
-
-        service = AIService()
-
-        # Start spinner
-        stop_spinner = threading.Event()
-        spinner_thread = threading.Thread(
-            target=show_spinner, args=(stop_spinner, "Generating task")
-        )
-        spinner_thread.start()
-
-        # Panggil fungsi tanpa argumen
-        markdown_content = service.generate_daily_task()
+        # 2. Pakai antrean prefetch kalau ada, kalau tidak minta ke Gemini
+        typer.secho("\n🤖 Menyiapkan task...", fg=typer.colors.YELLOW)
 
-        # Stop spinner
-        stop_spinner.set()
-        spinner_thread.join()
-
-        # 3. Cek Error dari Service
-        if markdown_content.startswith("Error"):
-            typer.secho(f"\n💥 Gagal: {markdown_content}", fg=typer.colors.RED)
-            raise typer.Exit(code=1)
-
-        # 4. Simpan ke File
-        tasks_dir = Path("tasks")
-        tasks_dir.mkdir(exist_ok=True)
-        filename = tasks_dir / f"task_{today}.md"
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
+        client = DaemonClient.discover()
+        if client:
+            result = run_with_spinner(
+                "Generating task", client.post, "/generate", {"date": today}
+            )
+            filename, from_queue = result["task_file"], result["from_queue"]
+        else:
+            filename, from_queue = run_with_spinner(
+                "Generating task", workflow.generate_task, today
+            )
 
-        # 5. Sukses
-        typer.secho("\n✅ BERHASIL!", fg=typer.colors.GREEN, bold=True)
+        # 3. Sukses
+        if from_queue:
+            typer.secho(
+                "\n⚡ BERHASIL! (dari antrean prefetch)",
+                fg=typer.colors.GREEN,
+                bold=True,
+            )
+        else:
+            typer.secho("\n✅ BERHASIL!", fg=typer.colors.GREEN, bold=True)
         typer.echo(f"   Materi telah disimpan di file: {filename}")
         typer.echo("   Selamat belajar! Jangan lupa 'commit' ilmu hari ini. 😉")
 
@@ -89,16 +295,29 @@ def review(
     task_number: int = typer.Option(
         1, "--task", "-t", help="Task number to review (1, 2, 3, or 4)"
     ),
+    queue: bool = typer.Option(
+        False, "--queue", "-q", help="Enqueue as a job for `lingokeun worker`"
+    ),
+    answers: str = typer.Option(
+        None,
+        "--answers",
+        "-a",
+        help="Read answers from a file ('-' for stdin) instead of the editor",
+    ),
 ):
     """
     Review completed task and append results to task file.
-    Opens editor for input.
+    Answers come from --answers, answers/YYYY-MM-DD/task_N.md, piped stdin,
+    or else the editor.
 
     Usage:
     - uv run lingokeun review 2026-01-29 --task 1
     - uv run lingokeun review 2026-01-29 -t 2
     - uv run lingokeun review 2026-01-29 -t 3
     - uv run lingokeun review 2026-01-29 -t 4
+    - uv run lingokeun review 2026-01-29 -t 1 --queue
+    - uv run lingokeun review 2026-01-29 -t 2 --answers my_answers.md
+    - cat my_answers.md | uv run lingokeun review 2026-01-29 -t 2
     """
 
     # Validate date format
@@ -108,103 +327,70 @@ def review(
         typer.secho("❌ Invalid date format. Use YYYY-MM-DD", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+    if task_number not in workflow.TASK_TITLES:
+        typer.secho("❌ Invalid task number. Use 1, 2, 3, or 4", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
     # Check task file exists
-    task_file = Path("tasks") / f"task_{task_date}.md"
-    if not task_file.exists():
+    task_file = workflow.task_file_path(task_date)
+    if not archive.exists(task_file):
         typer.secho(f"❌ Task file not found: {task_file}", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+    tracing.current().set(task_number=task_number, task_date=task_date)
+
     typer.secho("=" * 40, fg=typer.colors.BLUE)
     typer.secho("📝 LINGOKEUN: Task Review", fg=typer.colors.BLUE, bold=True)
     typer.secho(f"📅 Date: {task_date} | Task: {task_number}", fg=typer.colors.WHITE)
     typer.secho("=" * 40, fg=typer.colors.BLUE)
 
-    # Open editor for user input
-    typer.secho("\n✏️  Opening editor for your answers...", fg=typer.colors.YELLOW)
-    typer.echo("   Paste your completed task answers, save and close the editor.\n")
-
-    user_input = typer.edit("")
+    user_input = _read_answers(task_date, task_number, answers)
 
     if not user_input or user_input.strip() == "":
         typer.secho("❌ No input provided. Review cancelled.", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
-    try:
-        service = AIService()
-
-        # Start spinner
-        stop_spinner = threading.Event()
+    if queue:
+        from .jobs import review_key
 
-        if task_number == 1:
-            typer.secho(
-                "\n🤖 Reviewing Word Transformation Challenge...",
-                fg=typer.colors.YELLOW,
-            )
-            spinner_thread = threading.Thread(
-                target=show_spinner, args=(stop_spinner, "Reviewing Task 1")
-            )
-            spinner_thread.start()
-            review_result = service.review_task1(user_input)
-            stop_spinner.set()
-            spinner_thread.join()
-
-            # Extract vocabulary mastery from review
-            service.extract_vocabulary_mastery_from_review(review_result, task_date)
+        _enqueue_job(
+            "review",
+            {"date": task_date, "task": task_number, "answers": user_input},
+            review_key(task_date, task_number, user_input),
+        )
+        return
 
-        elif task_number == 2:
-            typer.secho(
-                "\n🤖 Reviewing Translation Challenge...", fg=typer.colors.YELLOW
-            )
-            task_content = task_file.read_text(encoding="utf-8")
-            spinner_thread = threading.Thread(
-                target=show_spinner, args=(stop_spinner, "Reviewing Task 2")
-            )
-            spinner_thread.start()
-            review_result = service.review_task2(task_content, user_input)
-            stop_spinner.set()
-            spinner_thread.join()
-        elif task_number == 3:
-            typer.secho(
-                "\n🤖 Reviewing Conversation Transliteration Challenge...",
-                fg=typer.colors.YELLOW,
-            )
-            task_content = task_file.read_text(encoding="utf-8")
-            spinner_thread = threading.Thread(
-                target=show_spinner, args=(stop_spinner, "Reviewing Task 3")
-            )
-            spinner_thread.start()
-            review_result = service.review_task3(task_content, user_input)
-            stop_spinner.set()
-            spinner_thread.join()
-        elif task_number == 4:
-            typer.secho(
-                "\n🤖 Reviewing Tense Construction Challenge...", fg=typer.colors.YELLOW
-            )
-            spinner_thread = threading.Thread(
-                target=show_spinner, args=(stop_spinner, "Reviewing Task 4")
+    try:
+        typer.secho(
+            f"\n🤖 Reviewing {workflow.TASK_TITLES[task_number]}...",
+            fg=typer.colors.YELLOW,
+        )
+        spinner_message = f"Reviewing Task {task_number}"
+
+        client = DaemonClient.discover()
+        if client:
+            result = run_with_spinner(
+                spinner_message,
+                client.post,
+                "/review",
+                {"date": task_date, "task": task_number, "answers": user_input},
             )
-            spinner_thread.start()
-            review_result = service.review_task4(user_input)
-            stop_spinner.set()
-            spinner_thread.join()
+            urgent, new_issues = result["urgent"], result["new_issues"]
         else:
-            typer.secho(
-                "❌ Invalid task number. Use 1, 2, 3, or 4", fg=typer.colors.RED
-            )
-            raise typer.Exit(code=1)
-
-        # Append review to task file
-        with open(task_file, "a", encoding="utf-8") as f:
-            f.write(f"\n\n---\n\n# Review - Task {task_number}\n")
-            f.write(
-                f"**Reviewed at:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            from .ai_service import AIService
+
+            service = AIService()
+            run_with_spinner(
+                spinner_message,
+                workflow.review_task,
+                service,
+                task_date,
+                task_number,
+                user_input,
             )
-            f.write(review_result)
-
-        # Update user profile with weaknesses
-        service.update_user_profile_after_review(
-            review_result, f"task_{task_number}", task_date
-        )
+            profile = service.profile_manager.load_profile()
+            urgent = profile["focus_areas"]["urgent"]
+            new_issues = profile["patterns"]["new_issues"]
 
         typer.secho(
             f"\n✅ Review completed and appended to {task_file}",
@@ -213,7 +399,7 @@ def review(
         )
 
         # Show weakness summary
-        _show_weakness_summary(service)
+        _show_weakness_summary(urgent, new_issues)
 
     except Exception as e:
         typer.secho(f"\n💥 Error: {str(e)}", fg=typer.colors.RED)
@@ -227,10 +413,14 @@ def show_profile():
 
     Usage: uv run lingokeun profile
     """
-    from .ai_service import AIService
-
-    service = AIService()
-    profile = service.profile_manager.load_profile()
+    client = DaemonClient.discover()
+    if client:
+        profile = client.get("/profile")
+        vocab_gaps = profile["vocabulary_gaps"]
+    else:
+        profile_manager = UserProfileManager()
+        profile = profile_manager.load_profile()
+        vocab_gaps = profile_manager.get_vocabulary_gaps(limit=5)
 
     typer.secho("=" * 50, fg=typer.colors.BLUE)
     typer.secho("📊 YOUR LEARNING PROFILE", fg=typer.colors.BLUE, bold=True)
@@ -272,27 +462,22 @@ def show_profile():
             typer.echo(f"   • {area}")
 
     # Vocabulary Gaps
-    if profile["vocabulary_gaps"]:
+    if vocab_gaps:
         typer.secho("\n📚 Vocabulary Gaps:", fg=typer.colors.YELLOW)
-        for vocab in profile["vocabulary_gaps"][:5]:
+        for vocab in vocab_gaps:
             typer.echo(f"   • {vocab['word']} (missed {vocab['missed_count']}x)")
 
     typer.echo()
 
 
-def _show_weakness_summary(service):
+def _show_weakness_summary(urgent: list[str], new_issues: list[str]):
     """Show brief weakness summary after review."""
-    profile = service.profile_manager.load_profile()
-
-    if profile["focus_areas"]["urgent"]:
-        typer.secho(
-            "\n⚠️  Focus on: " + ", ".join(profile["focus_areas"]["urgent"][:2]),
-            fg=typer.colors.YELLOW,
-        )
+    if urgent:
+        typer.secho("\n⚠️  Focus on: " + ", ".join(urgent[:2]), fg=typer.colors.YELLOW)
 
-    if profile["patterns"]["new_issues"]:
+    if new_issues:
         typer.secho(
-            f"🆕 New issues detected: {', '.join(profile['patterns']['new_issues'][:2])}",
+            f"🆕 New issues detected: {', '.join(new_issues[:2])}",
             fg=typer.colors.CYAN,
         )
 
@@ -314,15 +499,11 @@ def generate_material(
     - uv run lingokeun material --list (show suggestions)
     - uv run lingokeun material --topic "Phrasal Verbs"
     """
-    from .ai_service import AIService
-    import re
-
-    service = AIService()
-    material_dir = Path("material")
+    material_dir = workflow.MATERIAL_DIR
     material_dir.mkdir(exist_ok=True)
 
-    # List existing materials
-    existing_materials = [f.stem for f in material_dir.glob("*.md")]
+    # List existing materials, archived ones included
+    existing_materials = archive.list_names(material_dir)
 
     # Show suggestions
     if list_suggestions or not topic:
@@ -330,18 +511,15 @@ def generate_material(
         typer.secho("📚 SUGGESTED LEARNING MATERIALS", fg=typer.colors.BLUE, bold=True)
         typer.secho("=" * 50, fg=typer.colors.BLUE)
 
-        suggestions = service.suggest_material_topics()
+        from .ai_service import AIService
+
+        suggestions = AIService().suggest_material_topics()
 
         if suggestions:
             typer.secho("\n💡 Based on your weaknesses:", fg=typer.colors.YELLOW)
             for i, suggested_topic in enumerate(suggestions, 1):
                 # Check if already exists
-                filename = (
-                    re.sub(r"[^\w\s-]", "", suggested_topic)
-                    .strip()
-                    .replace(" ", "_")
-                    .lower()
-                )
+                filename = workflow.material_path(suggested_topic).stem
                 status = (
                     "✓ Generated" if filename in existing_materials else "○ Not yet"
                 )
@@ -370,12 +548,10 @@ def generate_material(
     typer.secho(f"Topic: {topic}", fg=typer.colors.WHITE)
     typer.secho("=" * 50, fg=typer.colors.BLUE)
 
-    # Create filename
-    filename = re.sub(r"[^\w\s-]", "", topic).strip().replace(" ", "_").lower()
-    filepath = material_dir / f"{filename}.md"
+    filepath = workflow.material_path(topic)
 
     # Check if already exists
-    if filepath.exists():
+    if archive.exists(filepath):
         overwrite = typer.confirm(f"\n⚠️  Material '{topic}' already exists. Overwrite?")
         if not overwrite:
             typer.secho("❌ Cancelled", fg=typer.colors.RED)
@@ -384,26 +560,18 @@ def generate_material(
     try:
         typer.secho("\n🤖 Generating material with AI...", fg=typer.colors.YELLOW)
 
-        # Start spinner
-        stop_spinner = threading.Event()
-        spinner_thread = threading.Thread(
-            target=show_spinner, args=(stop_spinner, "Generating material")
-        )
-        spinner_thread.start()
-
-        material_content = service.generate_learning_material(topic)
-
-        # Stop spinner
-        stop_spinner.set()
-        spinner_thread.join()
-
-        if material_content.startswith("Error"):
-            typer.secho(f"\n💥 Failed: {material_content}", fg=typer.colors.RED)
-            raise typer.Exit(code=1)
+        client = DaemonClient.discover()
+        if client:
+            result = run_with_spinner(
+                "Generating material", client.post, "/material", {"topic": topic}
+            )
+            filepath = result["material_file"]
+        else:
+            from .ai_service import AIService
 
-        # Save material
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(material_content)
+            filepath = run_with_spinner(
+                "Generating material", workflow.generate_material, AIService(), topic
+            )
 
         typer.secho(
             f"\n✅ Material saved: {filepath}", fg=typer.colors.GREEN, bold=True
@@ -426,6 +594,15 @@ def manage_vocabulary(
     word: str = typer.Option(
         None, "--word", "-w", help="Show details of specific word"
     ),
+    history: int = typer.Option(
+        5, "--history", "-H", help="Number of recent reviews shown with --word"
+    ),
+    progress: bool = typer.Option(
+        False, "--progress", "-p", help="Show learning progress dashboard"
+    ),
+    select: bool = typer.Option(
+        False, "--select", help="Show the words the next task would use, with scores"
+    ),
     update_form: str = typer.Option(
         None,
         "--update-form",
@@ -440,12 +617,15 @@ def manage_vocabulary(
     - uv run lingokeun vocab --add prominently --type adv --meaning "secara menonjol"
     - uv run lingokeun vocab --stats
     - uv run lingokeun vocab --word facilitate
+    - uv run lingokeun vocab --word facilitate --history 20
+    - uv run lingokeun vocab --progress
+    - uv run lingokeun vocab --select
     - uv run lingokeun vocab --update-form "facilitate:noun:facilitation"
     """
-    from .ai_service import AIService
+    from .vocabulary_db import VocabularyDatabase
 
-    service = AIService()
-    vocab_db = service.profile_manager.vocab_db
+    vocab_db = VocabularyDatabase()
+    client = DaemonClient.discover()
 
     # Update word form
     if update_form:
@@ -491,7 +671,10 @@ def manage_vocabulary(
 
     # Show statistics
     if stats:
-        stats_data = vocab_db.get_vocabulary_stats()
+        if client:
+            stats_data = client.get("/vocab/stats")
+        else:
+            stats_data = vocab_db.get_vocabulary_stats()
 
         typer.secho("=" * 50, fg=typer.colors.BLUE)
         typer.secho("📊 VOCABULARY STATISTICS", fg=typer.colors.BLUE, bold=True)
@@ -513,9 +696,79 @@ def manage_vocabulary(
         typer.echo()
         return
 
+    # Show the daily word selection
+    if select:
+        from .morphology import MorphologyIndex
+
+        morphology = MorphologyIndex(vocab_db)
+        selected = vocab_db.select_daily_words(family=morphology.base_form)
+
+        typer.secho("\n🎯 Next task vocabulary", fg=typer.colors.BLUE, bold=True)
+        for i, w in enumerate(selected, 1):
+            breakdown = ", ".join(
+                f"{name} {value:.2f}"
+                for name, value in w["score"].items()
+                if name != "total" and value
+            )
+            typer.echo(
+                f"   {i}. {w['word']} ({w['word_type'] or '-'}, {w['kind']}) "
+                f"score {w['adjusted']:.2f}" + (f" [{breakdown}]" if breakdown else "")
+            )
+        typer.echo()
+        return
+
+    # Show progress dashboard
+    if progress:
+        overview = vocab_db.get_progress_overview()
+        totals = overview["totals"]
+
+        typer.secho("=" * 50, fg=typer.colors.BLUE)
+        typer.secho("📈 LEARNING PROGRESS", fg=typer.colors.BLUE, bold=True)
+        typer.secho("=" * 50, fg=typer.colors.BLUE)
+
+        typer.echo(f"\n📚 Reviewed words: {totals['words']}")
+        typer.secho(f"✅ Mastered: {totals['mastered']}", fg=typer.colors.GREEN)
+        typer.secho(f"📉 Regressed: {totals['regressed']}", fg=typer.colors.RED)
+        if totals["words"]:
+            typer.echo(f"🎯 Rolling accuracy: {totals['rolling_accuracy']}%")
+        if totals["days_to_mastery"] is not None:
+            typer.echo(f"⏱️  Avg days to mastery: {totals['days_to_mastery']}")
+
+        if overview["regressions"]:
+            typer.secho(
+                "\n📉 Slipping (mastered before, weak now):", fg=typer.colors.RED
+            )
+            for item in overview["regressions"]:
+                typer.echo(
+                    f"   • {item['word']}: last {item['last_accuracy']}% "
+                    f"(mastered {item['mastered_at']})"
+                )
+
+        if overview["streaks"]:
+            typer.secho("\n🔥 Longest streaks:", fg=typer.colors.GREEN)
+            for item in overview["streaks"]:
+                typer.echo(f"   • {item['word']}: {item['streak']} correct in a row")
+
+        cohorts = vocab_db.get_cohorts()
+        if cohorts:
+            typer.secho("\n🗓️  Words added per month:", fg=typer.colors.CYAN)
+            for cohort in cohorts:
+                days = cohort["days_to_mastery"]
+                typer.echo(
+                    f"   {cohort['cohort']}: {cohort['words']:4d} words, "
+                    f"{cohort['mastered_pct']:5.1f}% mastered"
+                    + (f", {days} days to mastery" if days is not None else "")
+                )
+
+        typer.echo()
+        return
+
     # Show word details
     if word:
-        details = vocab_db.get_word_details(word)
+        if client:
+            details = client.get("/vocab/word", word=word, history=str(history))
+        else:
+            details = vocab_db.get_word_details(word, history_limit=history)
 
         if not details:
             typer.secho(f"❌ Word '{word}' not found in database", fg=typer.colors.RED)
@@ -539,6 +792,22 @@ def manage_vocabulary(
 
         typer.echo(f"📌 Source: {details['source']}")
 
+        word_progress = details.get("progress")
+        if word_progress:
+            typer.echo(
+                f"\n📈 Rolling: {word_progress['rolling_accuracy']}% | "
+                f"Best/Worst: {word_progress['best_accuracy']}%/"
+                f"{word_progress['worst_accuracy']}% | "
+                f"Streak: {word_progress['streak']}"
+            )
+            if word_progress["mastered_at"]:
+                typer.echo(
+                    f"🏁 Mastered on {word_progress['mastered_at']} "
+                    f"after {word_progress['days_to_mastery']} day(s)"
+                )
+            if word_progress["regressed"]:
+                typer.secho("📉 Slipping since mastery", fg=typer.colors.RED)
+
         # Show forms with values and meanings
         if details["forms"]:
             typer.echo("\n📝 Word Forms:")
@@ -549,8 +818,13 @@ def manage_vocabulary(
                 typer.echo(f"   {status} {form.title()}: {value} ({meaning})")
 
         if details["history"]:
-            typer.echo("\n📈 Review History:")
-            for h in details["history"][:5]:
+            summary = details["history_summary"]
+            typer.echo(
+                f"\n📈 Review History ({summary['reviews']} reviews since "
+                f"{summary['first_review']}, average {summary['avg_accuracy']}%, "
+                f"last {summary['rolling_window']}: {summary['rolling_accuracy']}%):"
+            )
+            for h in details["history"]:
                 typer.echo(f"   {h['date']}: {h['accuracy']}%")
 
         typer.echo()
@@ -564,31 +838,661 @@ def manage_vocabulary(
 def show_token_usage():
     """Show AI token usage statistics."""
     from .token_monitor import TokenMonitor
-    
-    monitor = TokenMonitor()
-    stats = monitor.get_stats()
-    
+
+    client = DaemonClient.discover()
+    stats = client.get("/stats") if client else TokenMonitor().get_stats()
+
     typer.secho("=" * 50, fg=typer.colors.BLUE)
     typer.secho("🤖 AI TOKEN USAGE STATISTICS", fg=typer.colors.BLUE, bold=True)
     typer.secho("=" * 50, fg=typer.colors.BLUE)
-    
+
     typer.echo("\n📊 Total Usage:")
     typer.echo(f"   Input Tokens:  {stats['total_input']:,}")
     typer.echo(f"   Output Tokens: {stats['total_output']:,}")
-    typer.secho(f"   Total Tokens:  {stats['total']:,}", fg=typer.colors.CYAN, bold=True)
-    
+    typer.secho(
+        f"   Total Tokens:  {stats['total']:,}", fg=typer.colors.CYAN, bold=True
+    )
+
     typer.echo(f"\n📈 API Calls: {stats['total_calls']}")
-    
-    if stats['recent']:
+
+    today = stats.get("today")
+    if today and today["calls"]:
+        typer.echo(
+            f"\n📅 Today: {today['input'] + today['output']:,} tokens "
+            f"in {today['calls']} calls"
+        )
+        for operation, usage in sorted(today["operations"].items()):
+            typer.echo(
+                f"   {operation:25s} | {usage['input'] + usage['output']:,} tokens"
+            )
+
+    if stats["recent"]:
         typer.echo("\n🕐 Recent Operations (last 10):")
-        for entry in stats['recent']:
-            timestamp = entry['timestamp'][:19].replace('T', ' ')
-            operation = entry['operation']
-            total = entry['total_tokens']
+        for entry in stats["recent"]:
+            timestamp = entry["timestamp"][:19].replace("T", " ")
+            operation = entry["operation"]
+            total = entry["total_tokens"]
             typer.echo(f"   {timestamp} | {operation:25s} | {total:,} tokens")
-    
+
+    typer.echo()
+
+
+@app.command("perf")
+def show_performance(
+    days: int = typer.Option(7, "--days", "-d", help="Window size in days"),
+    command: str = typer.Option(
+        None, "--command", "-c", help="Only show stages of this command"
+    ),
+):
+    """
+    Show latency percentiles per command and stage, and model health.
+
+    Usage:
+    - uv run lingokeun perf
+    - uv run lingokeun perf --days 30 --command review
+    """
+    summary = metrics.MetricsStore().summary(days=days, command=command)
+
+    typer.secho("=" * 78, fg=typer.colors.BLUE)
+    typer.secho(
+        f"⏱️  LATENCY REPORT (last {days} days)", fg=typer.colors.BLUE, bold=True
+    )
+    typer.secho("=" * 78, fg=typer.colors.BLUE)
+
+    if not summary:
+        typer.echo("\nNo measurements recorded yet.")
+    else:
+        typer.echo(
+            f"\n{'Command':10s} {'Stage':32s} {'Count':>6s} "
+            f"{'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}"
+        )
+        for (cmd, stage), data in summary.items():
+            typer.echo(
+                f"{cmd:10s} {stage:32s} {data['count']:6d} "
+                f"{data['p50']:8.1f} {data['p95']:8.1f} {data['p99']:8.1f}"
+            )
+
+    _show_model_health()
     typer.echo()
 
 
+def _show_model_health() -> None:
+    """Moving averages the router keeps per operation and model."""
+    from .routing import ModelRouter
+
+    health = ModelRouter().health()
+    if not health:
+        return
+
+    typer.echo("\n🧭 Model health:")
+    typer.echo(
+        f"   {'Operation':24s} {'Model':28s} {'Calls':>6s} {'Avg ms':>8s} {'Fail':>6s}"
+    )
+    now = time.time()
+    for key, stats in sorted(health.items()):
+        operation, model = key.split("|", 1)
+        line = (
+            f"   {operation:24s} {model:28s} {stats['calls']:6d} "
+            f"{stats['latency_ms']:8.1f} {stats['failures']:6.2f}"
+        )
+        if stats.get("demoted_until", 0) > now:
+            typer.secho(
+                f"{line}  demoted {int(stats['demoted_until'] - now)}s",
+                fg=typer.colors.YELLOW,
+            )
+        else:
+            typer.echo(line)
+
+
+@app.command("users")
+def show_users(
+    limit: int = typer.Option(50, "--limit", "-n", help="Number of learners"),
+    active: bool = typer.Option(
+        False, "--active", help="Sort by last activity instead of token spend"
+    ),
+):
+    """
+    Show all learners on this installation and their token spend.
+
+    Usage:
+    - uv run lingokeun users
+    - uv run lingokeun users --active --limit 10
+    """
+    from .learners import LearnerRegistry
+
+    registry = LearnerRegistry()
+    totals = registry.get_totals()
+    learners = registry.get_learners(
+        limit=limit, order="active" if active else "tokens"
+    )
+
+    typer.secho("=" * 70, fg=typer.colors.BLUE)
+    typer.secho("👥 LEARNERS", fg=typer.colors.BLUE, bold=True)
+    typer.secho("=" * 70, fg=typer.colors.BLUE)
+
+    typer.echo(f"\n📊 Learners: {totals['learners']}")
+    typer.echo(
+        f"   Tokens: {totals['input_tokens'] + totals['output_tokens']:,} "
+        f"in {totals['api_calls']:,} API calls"
+    )
+
+    if learners:
+        typer.echo(f"\n{'User':24s} {'Tokens':>12s} {'Calls':>7s}  Last active")
+        for learner in learners:
+            last_active = learner["last_active"][:19].replace("T", " ")
+            typer.echo(
+                f"{learner['user_id']:24s} {learner['total_tokens']:12,} "
+                f"{learner['api_calls']:7,}  {last_active}"
+            )
+
+    typer.echo()
+
+
+def _print_job_event(job: dict, outcome: str, detail: str) -> None:
+    """Report a finished job attempt of a worker."""
+    if outcome == "done":
+        typer.secho(
+            f"✅ Job #{job['id']} ({job['kind']}) done: {detail}",
+            fg=typer.colors.GREEN,
+        )
+    else:
+        typer.secho(
+            f"💥 Job #{job['id']} ({job['kind']}) attempt "
+            f"{job['attempts']}/{job['max_attempts']} failed: {detail}",
+            fg=typer.colors.RED,
+        )
+
+
+@app.command("worker")
+def run_worker(
+    concurrency: int = typer.Option(
+        2, "--concurrency", "-c", help="Number of jobs processed at once"
+    ),
+    drain: bool = typer.Option(
+        False, "--drain", help="Exit once the queue is empty (for cron)"
+    ),
+):
+    """
+    Process queued generate/review/material jobs.
+
+    Usage:
+    - uv run lingokeun worker --concurrency 4
+    - uv run lingokeun worker --drain
+    """
+    from .jobs import Worker
+
+    typer.secho(
+        f"👷 Worker started with {concurrency} slot(s) (Ctrl+C to stop)",
+        fg=typer.colors.BLUE,
+        bold=True,
+    )
+    stop = threading.Event()
+    try:
+        Worker(concurrency).run(stop, drain=drain, on_event=_print_job_event)
+    except KeyboardInterrupt:
+        # Running jobs are picked up again when their lease expires
+        stop.set()
+    typer.echo("👋 Worker stopped")
+
+
+def _ingest_answer_file(queue, root: Path, path: Path) -> None:
+    """Queue a review of one saved answer file, skipping unusable ones."""
+    from .jobs import review_key
+
+    parsed = workflow.parse_answer_path(path)
+    # Other learners' answers live in subdirectories of the default root
+    if parsed is None or path.parent.parent != root:
+        return
+    task_date, task_number = parsed
+
+    try:
+        answers = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        # Deleted or renamed since the event, or not a text file
+        typer.secho(f"⚠️  {path}: cannot read ({e}), skipped", fg=typer.colors.YELLOW)
+        return
+    if not answers.strip():
+        return
+    if not archive.exists(workflow.task_file_path(task_date)):
+        typer.secho(
+            f"⚠️  {path}: no task file for {task_date}, skipped",
+            fg=typer.colors.YELLOW,
+        )
+        return
+
+    job_id, created = queue.enqueue(
+        "review",
+        {"date": task_date, "task": task_number, "answers": answers},
+        review_key(task_date, task_number, answers),
+    )
+    if created:
+        typer.secho(f"📬 {path}: queued job #{job_id}", fg=typer.colors.GREEN)
+
+
+@app.command("watch")
+def watch_answers(
+    polling: bool = typer.Option(
+        False, "--polling", help="Poll file mtimes instead of using inotify"
+    ),
+    workers: int = typer.Option(
+        0, "--workers", "-w", help="Also process queued jobs here with N slots"
+    ),
+    existing: bool = typer.Option(
+        True,
+        "--existing/--no-existing",
+        help="Queue answer files already present at start",
+    ),
+):
+    """
+    Queue a review whenever an answer file is saved.
+
+    Watches answers/YYYY-MM-DD/task_N.md (answers/<user>/... with --user).
+    The same answers are only queued once, so re-saving unchanged files or
+    restarting the watcher doesn't review twice.
+
+    Usage:
+    - uv run lingokeun watch
+    - uv run lingokeun watch --workers 2
+    """
+    from . import watcher as file_watcher
+    from .jobs import JobQueue, Worker
+
+    root = paths.answers_dir()
+    queue = JobQueue()
+    watcher = file_watcher.create_watcher(root, polling=polling)
+    stop = threading.Event()
+
+    if workers:
+        threading.Thread(
+            target=Worker(workers).run,
+            args=(stop,),
+            kwargs={"on_event": _print_job_event},
+            daemon=True,
+        ).start()
+
+    typer.secho(
+        f"👀 Watching {root}/ with {watcher.name} (Ctrl+C to stop)",
+        fg=typer.colors.BLUE,
+        bold=True,
+    )
+    try:
+        if existing:
+            for path in sorted(root.glob("*/task_*.md")):
+                _ingest_answer_file(queue, root, path)
+        for path in file_watcher.watch(watcher, stop):
+            _ingest_answer_file(queue, root, path)
+    except KeyboardInterrupt:
+        stop.set()
+    typer.echo("👋 Watcher stopped")
+
+
+@app.command("jobs")
+def show_jobs(
+    limit: int = typer.Option(10, "--limit", "-n", help="Number of recent jobs"),
+    status: str = typer.Option(
+        None, "--status", "-s", help="Only queued, running, done or failed"
+    ),
+):
+    """
+    Show the job queue: status counts, throughput and recent jobs.
+
+    Usage:
+    - uv run lingokeun jobs
+    - uv run lingokeun jobs --status failed
+    """
+    from .jobs import JobQueue
+
+    job_queue = JobQueue()
+    stats = job_queue.stats()
+
+    typer.secho("=" * 70, fg=typer.colors.BLUE)
+    typer.secho("📬 JOB QUEUE", fg=typer.colors.BLUE, bold=True)
+    typer.secho("=" * 70, fg=typer.colors.BLUE)
+
+    counts = stats["counts"]
+    typer.echo(
+        f"\n⏳ Queued: {counts['queued']}   🏃 Running: {counts['running']}   "
+        f"✅ Done: {counts['done']}   ❌ Failed: {counts['failed']}"
+    )
+    typer.echo(
+        f"📈 Last 24h: {stats['done']} done ({stats['per_hour']}/hour), "
+        f"avg {stats['avg_seconds']}s per job"
+    )
+
+    jobs = job_queue.list_jobs(limit=limit, status=status)
+    if jobs:
+        typer.echo(f"\n{'ID':>5s} {'Kind':9s} {'Status':8s} {'Tries':>5s}  Created")
+        for job in jobs:
+            created = job["created_at"][:19].replace("T", " ")
+            typer.echo(
+                f"{job['id']:5d} {job['kind']:9s} {job['status']:8s} "
+                f"{job['attempts']:>2d}/{job['max_attempts']:<2d}  {created}"
+            )
+            if job["status"] != "done" and job["error"]:
+                typer.secho(f"      {job['error'][:100]}", fg=typer.colors.RED)
+
+    typer.echo()
+
+
+@app.command("export")
+def export_data(
+    output: Annotated[
+        Path,
+        typer.Option("--output", "-o", help="Output directory, or - for stdout"),
+    ] = Path("export"),
+    fmt: Annotated[str, typer.Option("--format", "-f", help="jsonl or csv")] = "jsonl",
+    since: Annotated[
+        str | None,
+        typer.Option(
+            "--since",
+            help="Only rows changed since this ISO date/time, or 'last' for the "
+            "previous export into --output",
+        ),
+    ] = None,
+    table: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--table",
+            "-t",
+            help="vocabulary, forms_mastery, review_history or weaknesses "
+            "(repeatable, default all)",
+        ),
+    ] = None,
+):
+    """
+    Export vocabulary, forms, review history and weaknesses for analysis.
+
+    Rows are streamed, so memory use doesn't grow with the database.
+    --since applies to the database tables; weaknesses are always exported
+    in full.
+
+    Usage:
+    - uv run lingokeun export --format csv
+    - uv run lingokeun export --since last (nightly delta)
+    - uv run lingokeun export --table review_history --output - | jq .
+    """
+    from . import export
+
+    tables = tuple(table) if table else export.TABLES
+    unknown = set(tables) - set(export.TABLES)
+    if unknown:
+        raise typer.BadParameter(
+            f"Unknown table(s): {', '.join(sorted(unknown))}", param_hint="--table"
+        )
+    if fmt not in export.FORMATS:
+        raise typer.BadParameter("Use jsonl or csv", param_hint="--format")
+
+    to_stdout = str(output) == "-"
+    if since == "last":
+        since = None if to_stdout else export.last_export(output)
+
+    if to_stdout:
+        if len(tables) != 1:
+            raise typer.BadParameter(
+                "Pick one --table when writing to stdout", param_hint="--table"
+            )
+        export.write_rows(export.rows_for(tables[0], since), sys.stdout, fmt)
+        return
+
+    manifest = export.export(output, tables, fmt, since)
+
+    typer.secho(f"📦 Exported to {output}/", fg=typer.colors.GREEN, bold=True)
+    if since:
+        typer.echo(f"   Changes since {since}")
+    for name, count in manifest["rows"].items():
+        typer.echo(f"   {name}.{fmt}: {count:,} rows")
+    typer.echo(f"   Next delta: --since {manifest['exported_at']} (or --since last)")
+
+
+@app.command("archive")
+def archive_files(
+    days: int = typer.Option(
+        archive.ARCHIVE_AFTER_DAYS,
+        "--days",
+        "-d",
+        help="Archive files not modified for this many days",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Only list the files that would be archived"
+    ),
+    show: str = typer.Option(
+        None,
+        "--show",
+        "-s",
+        help="Print a task or material file, archived or not (e.g. task_2025-01-05.md)",
+    ),
+):
+    """
+    Pack old task and material files into compressed yearly archives.
+
+    Archived files are still found by review, material and --show.
+
+    Usage:
+    - uv run lingokeun archive --dry-run
+    - uv run lingokeun archive --days 30
+    - uv run lingokeun archive --show task_2025-01-05.md
+    """
+    directories = (paths.tasks_dir(), workflow.MATERIAL_DIR)
+
+    if show:
+        for directory in directories:
+            path = directory / show
+            if archive.exists(path):
+                typer.echo(archive.read_text(path))
+                return
+        typer.secho(f"❌ File not found: {show}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    typer.secho("=" * 50, fg=typer.colors.BLUE)
+    typer.secho("🗜️  ARCHIVE", fg=typer.colors.BLUE, bold=True)
+    typer.secho("=" * 50, fg=typer.colors.BLUE)
+
+    for directory, pattern in zip(directories, ("task_*.md", "*.md")):
+        store = archive.Archive(directory)
+        files = store.candidates(days, pattern) if directory.exists() else []
+
+        typer.echo(f"\n📁 {directory}/: {len(files)} file(s) older than {days} days")
+        if dry_run:
+            for path in files:
+                typer.echo(f"   {path.name}")
+        elif files:
+            for archive_name, count in store.add(files).items():
+                typer.echo(f"   {count} → {archive.ARCHIVE_DIR}/{archive_name}")
+
+        stats = store.stats() if store.index_file.exists() else None
+        if stats and stats["files"]:
+            typer.echo(
+                f"   Archived: {stats['files']} file(s), "
+                f"{stats['original_bytes'] / 1024:.0f} KB → "
+                f"{stats['archive_bytes'] / 1024:.0f} KB in {stats['archives']} zip(s)"
+            )
+
+    if dry_run:
+        typer.echo("\nDry run: nothing was changed.")
+
+
+@app.command("backup")
+def backup_stores(
+    list_only: bool = typer.Option(False, "--list", "-l", help="List backups"),
+    label: str = typer.Option(None, "--label", help="Note stored in the manifest"),
+):
+    """
+    Back up the vocabulary DB and JSON stores of the active learner.
+
+    Safe while other commands write: the database is copied with SQLite's
+    online backup API. Unchanged stores are hard-linked to the previous
+    backup, and old backups are rotated out.
+
+    Usage:
+    - uv run lingokeun backup
+    - uv run lingokeun backup --list
+    """
+    from . import backup
+
+    if list_only:
+        backups = backup.list_backups()
+        if not backups:
+            typer.echo("No backups yet.")
+            return
+        typer.secho(f"🗄️  Backups in {backup.backups_dir()}/", fg=typer.colors.BLUE)
+        for manifest in backups:
+            size = sum(f["size"] for f in manifest["files"].values())
+            note = f"  ({manifest['label']})" if manifest.get("label") else ""
+            typer.echo(
+                f"   {manifest['id']}  {len(manifest['files'])} file(s), "
+                f"{size / 1024:.0f} KB{note}"
+            )
+        return
+
+    manifest = backup.create(label)
+    typer.secho(f"✅ Backup {manifest['id']} created", fg=typer.colors.GREEN, bold=True)
+    for name, entry in manifest["files"].items():
+        state = "unchanged, linked" if entry["linked"] else f"{entry['size']:,} bytes"
+        typer.echo(f"   {name}: {state}")
+    if manifest["removed"]:
+        typer.echo(f"   Rotated out {len(manifest['removed'])} old backup(s)")
+
+
+@app.command("restore")
+def restore_stores(
+    backup_id: str = typer.Argument("latest", help="Backup id (or prefix)"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Don't ask for confirmation"),
+):
+    """
+    Restore the learner's stores from a backup.
+
+    Checksums are verified first, and the current state is backed up
+    (label "before-restore") so a restore can be undone.
+
+    Usage:
+    - uv run lingokeun restore
+    - uv run lingokeun restore 20260201-0930
+    """
+    from . import backup
+
+    manifest = backup.find(backup_id)
+    if manifest is None:
+        typer.secho(f"❌ Backup not found: {backup_id}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    corrupt = backup.verify(manifest)
+    if corrupt:
+        typer.secho(
+            f"❌ Checksum mismatch in backup {manifest['id']}: {', '.join(corrupt)}",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(code=1)
+
+    files = ", ".join(manifest["files"])
+    if not yes and not typer.confirm(
+        f"Restore {files} from {manifest['id']}? Current data will be replaced"
+    ):
+        raise typer.Exit(code=0)
+
+    safety = backup.create("before-restore")
+    restored = backup.restore(manifest)
+    typer.secho(
+        f"✅ Restored {len(restored)} store(s) from {manifest['id']}",
+        fg=typer.colors.GREEN,
+        bold=True,
+    )
+    typer.echo(f"   Previous state kept as backup {safety['id']}")
+
+
+@db_app.command("migrate")
+def migrate_db(
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Only show the planned steps and rows touched"
+    ),
+):
+    """
+    Upgrade profile/vocabulary_mastery.db to the latest schema version.
+
+    Usage:
+    - uv run lingokeun db migrate --dry-run
+    - uv run lingokeun db migrate
+    """
+    from . import migrations
+
+    db_path = paths.profile_dir() / "vocabulary_mastery.db"
+    version = migrations.get_version(db_path)
+
+    typer.secho("=" * 60, fg=typer.colors.BLUE)
+    typer.secho("🗄️  DATABASE MIGRATIONS", fg=typer.colors.BLUE, bold=True)
+    typer.secho("=" * 60, fg=typer.colors.BLUE)
+    typer.echo(f"\n📄 {db_path}")
+    typer.echo(f"   Schema version: {version} (latest {migrations.LATEST_VERSION})")
+
+    pending = migrations.plan(db_path)
+    if not pending:
+        typer.secho("\n✅ Schema is up to date", fg=typer.colors.GREEN)
+        return
+
+    for migration in pending:
+        typer.secho(
+            f"\n▶ {migration['version']}: {migration['name']}", fg=typer.colors.YELLOW
+        )
+        for step in migration["steps"]:
+            sql = step["sql"] if len(step["sql"]) <= 70 else step["sql"][:67] + "..."
+            typer.echo(f"   {sql}")
+            if step["rows"]:
+                typer.echo(f"      ~{step['rows']:,} rows")
+
+    if dry_run:
+        typer.echo("\nDry run: nothing was changed.")
+        return
+
+    applied = migrations.migrate(db_path)
+    typer.secho(
+        f"\n✅ Applied {len(applied)} migration(s), now at version "
+        f"{migrations.get_version(db_path)}",
+        fg=typer.colors.GREEN,
+        bold=True,
+    )
+
+
+@app.command("serve")
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Address to listen on"),
+    port: int = typer.Option(8765, "--port", "-p", help="Port to listen on"),
+    workers: int = typer.Option(
+        4, "--workers", "-w", help="Maximum concurrent AI calls"
+    ),
+    allow_remote: bool = typer.Option(
+        False,
+        "--allow-remote",
+        help="Allow a --host reachable from other machines",
+    ),
+):
+    """
+    Run lingokeun as a local daemon with warm state.
+
+    Other lingokeun commands started in the same directory (and for the same
+    --user) send their work to the daemon instead of starting cold.
+    Set LINGOKEUN_NO_DAEMON=1 to bypass it.
+
+    Usage:
+    - uv run lingokeun serve
+    - uv run lingokeun serve --port 9000 --workers 2
+    """
+    from . import server
+
+    if not allow_remote and not server.is_loopback(host):
+        typer.secho(
+            f"❌ {host} is reachable from other machines; "
+            "pass --allow-remote if that is intended",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(code=1)
+
+    typer.secho(
+        f"🛰️  Lingokeun daemon listening on http://{host}:{port} (Ctrl+C to stop)",
+        fg=typer.colors.BLUE,
+        bold=True,
+    )
+    server.run(host, port, workers, allow_remote)
+    typer.echo("\n👋 Daemon stopped")
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,155 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from . import paths, storage, tracing
+
+# Fixed histogram bucket upper bounds in milliseconds; one overflow bucket follows
+BUCKET_BOUNDS_MS = (
+    0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500,
+    1000, 2500, 5000, 10000, 30000, 60000,
+)  # fmt: skip
+RETENTION_DAYS = 90
+
+# Latencies recorded by the current process, flushed once per command
+_pending: dict[tuple[str, str], list[float]] = {}
+_pending_lock = threading.Lock()
+_current_command = "-"
+
+
+def set_command(command: str | None) -> None:
+    """Set the CLI command that subsequent measurements belong to."""
+    global _current_command
+    _current_command = command or "-"
+
+
+def record(stage: str, duration_ms: float) -> None:
+    """Add one latency sample to the in-memory histogram."""
+    key = (_current_command, stage)
+    with _pending_lock:
+        counts = _pending.get(key)
+        if counts is None:
+            counts = _pending[key] = [0] * (len(BUCKET_BOUNDS_MS) + 2)
+
+        counts[bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+        # Last slot keeps the running sum for mean latency
+        counts[-1] = round(counts[-1] + duration_ms, 3)
+
+
+@contextmanager
+def timed(stage: str, **attrs):
+    """Measure a block (or, used as decorator, a function call) as a stage.
+
+    The stage is also opened as a trace span, yielded for extra attributes.
+    """
+    start = time.perf_counter()
+    with tracing.span(stage, **attrs) as span:
+        try:
+            yield span
+        finally:
+            record(stage, (time.perf_counter() - start) * 1000)
+
+
+def flush() -> None:
+    """Merge pending samples into the on-disk metrics store."""
+    with _pending_lock:
+        if not _pending:
+            return
+        samples = dict(_pending)
+        _pending.clear()
+
+    MetricsStore().merge(date.today().strftime("%Y-%m-%d"), samples)
+
+
+class MetricsStore:
+    def __init__(self):
+        self.metrics_dir = paths.shared_dir()
+        self.metrics_file = self.metrics_dir / "metrics.json"
+
+    def _load(self) -> dict:
+        """Load metrics file or return an empty store."""
+        empty = {"bucket_bounds_ms": list(BUCKET_BOUNDS_MS), "days": {}}
+        data = storage.read_json(self.metrics_file, lambda: empty)
+
+        # Bucket layout changed: old histograms can't be merged
+        if data.get("bucket_bounds_ms") != list(BUCKET_BOUNDS_MS):
+            return empty
+        return data
+
+    def merge(self, day: str, samples: dict[tuple[str, str], list[float]]) -> None:
+        """Add histogram counts for one day and drop expired days."""
+        with storage.file_lock(self.metrics_file):
+            self._merge(day, samples)
+
+    def _merge(self, day: str, samples: dict[tuple[str, str], list[float]]) -> None:
+        data = self._load()
+        day_data = data["days"].setdefault(day, {})
+
+        for (command, stage), counts in samples.items():
+            stored = day_data.setdefault(command, {}).get(stage)
+            if stored is None:
+                day_data[command][stage] = list(counts)
+            else:
+                day_data[command][stage] = [
+                    round(a + b, 3) for a, b in zip(stored, counts)
+                ]
+
+        cutoff = (date.today() - timedelta(days=RETENTION_DAYS)).strftime("%Y-%m-%d")
+        data["days"] = {d: v for d, v in data["days"].items() if d >= cutoff}
+
+        storage.write_json(self.metrics_file, data, indent=None)
+
+    def summary(
+        self, days: int = 7, command: str | None = None
+    ) -> dict[tuple[str, str], dict]:
+        """Get count, mean and p50/p95/p99 per (command, stage) over a window."""
+        data = self._load()
+        cutoff = (date.today() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+
+        merged: dict[tuple[str, str], list[float]] = defaultdict(
+            lambda: [0] * (len(BUCKET_BOUNDS_MS) + 2)
+        )
+        for day, day_data in data["days"].items():
+            if day < cutoff:
+                continue
+            for cmd, stages in day_data.items():
+                if command and cmd != command:
+                    continue
+                for stage, counts in stages.items():
+                    total = merged[(cmd, stage)]
+                    for i, value in enumerate(counts):
+                        total[i] += value
+
+        result = {}
+        for key, counts in sorted(merged.items()):
+            buckets = counts[:-1]
+            count = int(sum(buckets))
+            if count == 0:
+                continue
+            result[key] = {
+                "count": count,
+                "mean": counts[-1] / count,
+                "p50": _percentile(buckets, 0.50),
+                "p95": _percentile(buckets, 0.95),
+                "p99": _percentile(buckets, 0.99),
+            }
+        return result
+
+
+def _percentile(buckets: list[float], q: float) -> float:
+    """Estimate a percentile by interpolating inside the matching bucket."""
+    target = q * sum(buckets)
+    seen = 0.0
+    for i, count in enumerate(buckets):
+        if count and seen + count >= target:
+            lower = BUCKET_BOUNDS_MS[i - 1] if i > 0 else 0
+            # Overflow bucket has no upper bound, report its lower edge
+            if i >= len(BUCKET_BOUNDS_MS):
+                return float(lower)
+            upper = BUCKET_BOUNDS_MS[i]
+            return lower + (upper - lower) * (target - seen) / count
+        seen += count
+    return 0.0
@@ -0,0 +1,464 @@
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from .metrics import timed
+
+# Databases already at the latest version in this process
+_current: set[str] = set()
+
+
+class AddColumn:
+    """ALTER TABLE ... ADD COLUMN that is a no-op when the column exists."""
+
+    def __init__(self, table: str, column: str, declaration: str):
+        self.table = table
+        self.column = column
+        self.declaration = declaration
+
+    def describe(self) -> str:
+        return f"ALTER TABLE {self.table} ADD COLUMN {self.column} {self.declaration}"
+
+    def estimate(self, conn: sqlite3.Connection) -> int:
+        return 0
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}
+        if self.column not in columns:
+            conn.execute(self.describe())
+
+
+class Backfill:
+    """Data change run in small committed chunks so writers aren't blocked.
+
+    `chunk_sql` must handle at most :limit rows per run and touch only rows
+    that still need it, so the loop ends when a chunk changes nothing and an
+    interrupted backfill simply resumes.
+    """
+
+    def __init__(
+        self,
+        description: str,
+        count_sql: str,
+        chunk_sql: str,
+        chunk_size: int = 5000,
+        table: str | None = None,
+    ):
+        self.description = description
+        self.count_sql = count_sql
+        self.chunk_sql = chunk_sql
+        self.chunk_size = chunk_size
+        self.table = table
+
+    @classmethod
+    def update(cls, table: str, assignments: str, where: str, chunk_size: int = 5000):
+        """Chunked UPDATE of the rows matching `where`."""
+        return cls(
+            f"UPDATE {table} SET {assignments} WHERE {where}",
+            f"SELECT COUNT(*) FROM {table} WHERE {where}",
+            f"""
+            UPDATE {table} SET {assignments}
+            WHERE rowid IN (SELECT rowid FROM {table} WHERE {where} LIMIT :limit)
+            """,
+            chunk_size,
+            table,
+        )
+
+    def describe(self) -> str:
+        return f"backfill: {self.description} ({self.chunk_size} rows per chunk)"
+
+    def estimate(self, conn: sqlite3.Connection) -> int:
+        try:
+            return conn.execute(self.count_sql).fetchone()[0]
+        except sqlite3.OperationalError:
+            # Refers to columns added earlier in the same migration
+            return _count_rows(conn, self.table) if self.table else 0
+
+    def run(self, conn: sqlite3.Connection) -> int:
+        """Run chunks until nothing is left; returns rows touched."""
+        total = 0
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            changed = conn.execute(self.chunk_sql, {"limit": self.chunk_size}).rowcount
+            conn.execute("COMMIT")
+            total += changed
+            if changed <= 0:
+                return total
+            # Let other connections get the write lock between chunks
+            time.sleep(0)
+
+
+Step = str | AddColumn | Backfill
+
+
+class Migration:
+    def __init__(self, version: int, name: str, steps: list[Step]):
+        self.version = version
+        self.name = name
+        self.steps = steps
+
+
+MIGRATIONS = [
+    Migration(
+        1,
+        "base vocabulary schema",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS vocabulary (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                word TEXT UNIQUE NOT NULL,
+                word_type TEXT,
+                total_reviews INTEGER DEFAULT 0,
+                accuracy_score INTEGER DEFAULT 0,
+                last_reviewed TEXT,
+                source TEXT DEFAULT 'task',
+                meaning TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS forms_mastery (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                word_id INTEGER NOT NULL,
+                form_type TEXT NOT NULL,
+                form_value TEXT,
+                form_meaning TEXT,
+                is_mastered BOOLEAN DEFAULT 0,
+                FOREIGN KEY (word_id) REFERENCES vocabulary(id),
+                UNIQUE(word_id, form_type)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS review_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                word_id INTEGER NOT NULL,
+                review_date TEXT NOT NULL,
+                accuracy INTEGER NOT NULL,
+                FOREIGN KEY (word_id) REFERENCES vocabulary(id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_accuracy ON vocabulary(accuracy_score)",
+            "CREATE INDEX IF NOT EXISTS idx_word ON vocabulary(word)",
+        ],
+    ),
+    Migration(
+        2,
+        "vocabulary gaps table",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS vocabulary_gaps (
+                word TEXT PRIMARY KEY,
+                context TEXT DEFAULT 'workplace_communication',
+                missed_count INTEGER NOT NULL DEFAULT 0,
+                last_seen TEXT,
+                created_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_gaps_rank
+            ON vocabulary_gaps(missed_count DESC, last_seen DESC)
+            """,
+        ],
+    ),
+    Migration(
+        3,
+        "indexed review history",
+        [
+            # Covers per-word history lookups (scanned backwards for newest
+            # first) without touching the table; id keeps same-day reviews in order
+            """
+            CREATE INDEX IF NOT EXISTS idx_history_word_date
+            ON review_history(word_id, review_date, id, accuracy)
+            """,
+            # Per-word history aggregates; WHERE word_id = ? is pushed into the
+            # GROUP BY, so reading one word only scans that word's index range
+            """
+            CREATE VIEW IF NOT EXISTS word_history_stats AS
+            SELECT word_id,
+                   COUNT(*) AS reviews,
+                   MIN(review_date) AS first_review,
+                   MAX(review_date) AS last_review,
+                   ROUND(AVG(accuracy), 1) AS avg_accuracy
+            FROM review_history
+            GROUP BY word_id
+            """,
+        ],
+    ),
+    Migration(
+        4,
+        "job queue",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                idempotency_key TEXT UNIQUE,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                result TEXT,
+                applied_steps TEXT NOT NULL DEFAULT '',
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, available_at)",
+            "CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs(finished_at)",
+        ],
+    ),
+    Migration(
+        5,
+        "change timestamps for incremental export",
+        [
+            AddColumn("forms_mastery", "updated_at", "TEXT"),
+            AddColumn("review_history", "recorded_at", "TEXT"),
+            "CREATE INDEX IF NOT EXISTS idx_vocab_updated ON vocabulary(updated_at)",
+            "CREATE INDEX IF NOT EXISTS idx_forms_updated ON forms_mastery(updated_at)",
+            """
+            CREATE INDEX IF NOT EXISTS idx_history_recorded
+            ON review_history(recorded_at)
+            """,
+            Backfill.update(
+                "forms_mastery",
+                """updated_at = COALESCE(
+                    (SELECT updated_at FROM vocabulary WHERE id = word_id),
+                    '1970-01-01T00:00:00'
+                )""",
+                "updated_at IS NULL",
+            ),
+            Backfill.update(
+                "review_history", "recorded_at = review_date", "recorded_at IS NULL"
+            ),
+        ],
+    ),
+    Migration(
+        6,
+        "materialized word progress",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS word_progress (
+                word_id INTEGER PRIMARY KEY,
+                reviews INTEGER NOT NULL,
+                recent TEXT NOT NULL,
+                rolling_accuracy REAL NOT NULL,
+                best_accuracy INTEGER NOT NULL,
+                worst_accuracy INTEGER NOT NULL,
+                last_accuracy INTEGER NOT NULL,
+                streak INTEGER NOT NULL,
+                first_review TEXT NOT NULL,
+                last_review TEXT NOT NULL,
+                mastered_at TEXT,
+                days_to_mastery INTEGER,
+                regressed INTEGER NOT NULL DEFAULT 0,
+                regressions INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (word_id) REFERENCES vocabulary(id)
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_progress_regressed
+            ON word_progress(regressed, last_review DESC)
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_progress_streak ON word_progress(streak)",
+            "CREATE INDEX IF NOT EXISTS idx_vocab_created ON vocabulary(created_at)",
+            # Replays review_history per word with window functions, a chunk
+            # of words at a time
+            Backfill(
+                "word_progress from review_history",
+                """
+                SELECT COUNT(DISTINCT word_id) FROM review_history
+                WHERE word_id NOT IN (SELECT word_id FROM word_progress)
+                """,
+                """
+                INSERT INTO word_progress
+                    (word_id, reviews, recent, rolling_accuracy, best_accuracy,
+                     worst_accuracy, last_accuracy, streak, first_review,
+                     last_review, mastered_at, days_to_mastery, regressed,
+                     regressions)
+                WITH todo AS (
+                    SELECT DISTINCT word_id FROM review_history
+                    WHERE word_id NOT IN (SELECT word_id FROM word_progress)
+                    LIMIT :limit
+                ),
+                ranked AS (
+                    SELECT h.word_id, h.review_date, h.accuracy,
+                           ROW_NUMBER() OVER w AS rn,
+                           LAG(h.accuracy) OVER w AS previous,
+                           COUNT(*) OVER (PARTITION BY h.word_id) AS total
+                    FROM review_history h JOIN todo USING (word_id)
+                    WINDOW w AS (PARTITION BY h.word_id ORDER BY h.review_date, h.id)
+                ),
+                summary AS (
+                    SELECT word_id,
+                           COUNT(*) AS reviews,
+                           GROUP_CONCAT(
+                               CASE WHEN rn > total - 5 THEN accuracy END
+                           ) AS recent,
+                           ROUND(AVG(CASE WHEN rn > total - 5 THEN accuracy END), 1)
+                               AS rolling_accuracy,
+                           MAX(accuracy) AS best_accuracy,
+                           MIN(accuracy) AS worst_accuracy,
+                           MAX(CASE WHEN rn = total THEN accuracy END)
+                               AS last_accuracy,
+                           COUNT(*) - COALESCE(MAX(CASE WHEN accuracy < 80 THEN rn END), 0)
+                               AS streak,
+                           MIN(review_date) AS first_review,
+                           MAX(review_date) AS last_review,
+                           MIN(CASE WHEN accuracy >= 80 THEN review_date END)
+                               AS mastered_at,
+                           SUM(accuracy < 80 AND previous >= 80) AS regressions
+                    FROM (SELECT * FROM ranked ORDER BY word_id, rn)
+                    GROUP BY word_id
+                )
+                SELECT word_id, reviews, recent, rolling_accuracy, best_accuracy,
+                       worst_accuracy, last_accuracy, streak, first_review,
+                       last_review, mastered_at,
+                       CAST(julianday(mastered_at) - julianday(first_review) AS INTEGER),
+                       mastered_at IS NOT NULL AND last_accuracy < 80,
+                       regressions
+                FROM summary
+                """,
+                chunk_size=500,
+            ),
+        ],
+    ),
+    Migration(
+        7,
+        "word selection index",
+        [
+            # Mastered words due for a refresher, least recently reviewed first
+            """
+            CREATE INDEX IF NOT EXISTS idx_progress_last_review
+            ON word_progress(last_review)
+            """,
+        ],
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+_INDEX_TABLE = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX.*?\bON\s+(\w+)", re.IGNORECASE | re.DOTALL
+)
+
+
+def _describe(step: Step) -> str:
+    if isinstance(step, str):
+        return " ".join(step.split())
+    return step.describe()
+
+
+def _estimate(conn: sqlite3.Connection, step: Step) -> int:
+    """Rows a step is expected to read or write."""
+    if not isinstance(step, str):
+        return step.estimate(conn)
+
+    # Building an index reads the whole table
+    match = _INDEX_TABLE.search(step)
+    return _count_rows(conn, match.group(1)) if match else 0
+
+
+def _count_rows(conn: sqlite3.Connection, table: str) -> int:
+    """Row count of a table, 0 if it doesn't exist yet."""
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    # Autocommit mode: transactions are opened explicitly below
+    return sqlite3.connect(db_path, timeout=30, isolation_level=None)
+
+
+def get_version(db_path: Path) -> int:
+    """Schema version stored in the database header."""
+    conn = _connect(db_path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    return version
+
+
+def plan(db_path: Path) -> list[dict]:
+    """Pending migrations with their steps and estimated rows touched."""
+    conn = _connect(db_path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    pending = [
+        {
+            "version": migration.version,
+            "name": migration.name,
+            "steps": [
+                {"sql": _describe(step), "rows": _estimate(conn, step)}
+                for step in migration.steps
+            ],
+        }
+        for migration in MIGRATIONS
+        if migration.version > version
+    ]
+    conn.close()
+    return pending
+
+
+@timed("db.migrate")
+def migrate(db_path: Path) -> list[int]:
+    """Bring a database up to LATEST_VERSION; returns applied versions.
+
+    Each migration's DDL runs in one transaction together with the version
+    bump. Backfills run afterwards in their own chunked transactions and the
+    version is only bumped once they finish, so an interrupted migration is
+    re-run (its steps are idempotent) on the next start.
+    """
+    key = str(Path(db_path).resolve())
+    if key in _current:
+        return []
+
+    conn = _connect(db_path)
+    applied = []
+    try:
+        # Fast path: one header read when the schema is current
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= LATEST_VERSION:
+            _current.add(key)
+            return []
+
+        for migration in MIGRATIONS:
+            conn.execute("BEGIN IMMEDIATE")
+            # Another process may have migrated while we waited for the lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= migration.version:
+                conn.execute("COMMIT")
+                continue
+
+            backfills = []
+            try:
+                for step in migration.steps:
+                    if isinstance(step, Backfill):
+                        backfills.append(step)
+                    elif isinstance(step, AddColumn):
+                        step.apply(conn)
+                    else:
+                        conn.execute(step)
+                if not backfills:
+                    conn.execute(f"PRAGMA user_version = {migration.version}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            if backfills:
+                for backfill in backfills:
+                    backfill.run(conn)
+                conn.execute(f"PRAGMA user_version = {migration.version}")
+
+            applied.append(migration.version)
+    finally:
+        conn.close()
+
+    _current.add(key)
+    return applied
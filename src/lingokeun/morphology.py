@@ -0,0 +1,131 @@
+from .metrics import timed
+from .review_schema import FORM_TYPES
+from .word_families import FAMILIES
+
+# Form picked as the base of a family for the Word Transformation Challenge
+BASE_PREFERENCE = ("verb", "adjective", "noun", "adverb")
+
+
+def _has_value(value: str | None) -> bool:
+    return value is not None and value.strip() not in ("", "-", "...")
+
+
+class MorphologyIndex:
+    """Maps any surface form of a word to its derivational family.
+
+    Built from the bundled word families plus forms confirmed in reviews
+    (forms_mastery), which win over bundled values. Every verb, noun,
+    adjective and adverb of a family is a key, so a lookup is one dict hit.
+    Only confirmed families are trusted as an answer key; bundled ones are
+    hints for the model.
+    """
+
+    def __init__(self, vocab_db=None):
+        self._families: dict[str, dict] = {}
+        self._build(vocab_db)
+
+    @timed("morphology.build")
+    def _build(self, vocab_db) -> None:
+        for entry in FAMILIES:
+            self._add(dict(zip(FORM_TYPES, entry)), {}, "bundled")
+
+        if vocab_db is not None:
+            for word, forms in vocab_db.get_confirmed_forms().items():
+                values = {form: data["value"] for form, data in forms.items()}
+                meanings = {form: data["meaning"] for form, data in forms.items()}
+                # The reviewed word itself belongs to the family even when
+                # the review didn't repeat it as one of the forms
+                self._add(values, meanings, "confirmed", extra=word)
+
+    def _add(
+        self,
+        values: dict,
+        meanings: dict,
+        source: str,
+        extra: str | None = None,
+    ) -> None:
+        """Merge one family into the index."""
+        surfaces = [
+            values[form].lower()
+            for form in FORM_TYPES[:4]
+            if _has_value(values.get(form))
+        ]
+        if extra:
+            surfaces.append(extra.lower())
+
+        # Extend an existing family sharing a form, otherwise start a new one
+        family = next(
+            (self._families[s] for s in surfaces if s in self._families), None
+        )
+        if family is None:
+            family = {"forms": {}, "meanings": {}, "source": source}
+
+        for form in FORM_TYPES:
+            # A confirmed blank doesn't erase a bundled form
+            if values.get(form) and (
+                form not in family["forms"]
+                or (source == "confirmed" and _has_value(values[form]))
+            ):
+                family["forms"][form] = values[form].lower()
+            if _has_value(meanings.get(form)):
+                family["meanings"][form] = meanings[form]
+        if source == "confirmed":
+            family["source"] = "confirmed"
+
+        for surface in surfaces:
+            self._families.setdefault(surface, family)
+
+    def learn(self, word: str, values: dict, meanings: dict) -> None:
+        """Add forms confirmed by a new review to a built index."""
+        values = {form: values.get(form) or "-" for form in FORM_TYPES}
+        self._add(values, meanings, "confirmed", extra=word)
+
+    def lookup(self, word: str) -> dict | None:
+        """Family of a surface form: {"forms", "meanings", "source"}."""
+        return self._families.get(word.strip().lower())
+
+    def base_form(self, word: str) -> str:
+        """Base form used for transformations, the word itself if unknown."""
+        family = self.lookup(word)
+        if family is None:
+            return word
+        for form in BASE_PREFERENCE:
+            if _has_value(family["forms"].get(form)):
+                return family["forms"][form]
+        return word
+
+    def is_confirmed(self, word: str) -> bool:
+        """True when the word's family comes from reviewed forms."""
+        family = self.lookup(word)
+        return family is not None and family["source"] == "confirmed"
+
+    def is_complete(self, word: str) -> bool:
+        """True when all five forms of the word's family are known."""
+        family = self.lookup(word)
+        return family is not None and all(
+            form in family["forms"] for form in FORM_TYPES
+        )
+
+    def describe(self, words: list[str], confirmed: bool = True) -> list[str]:
+        """Prompt lines with the known forms of each complete family.
+
+        Lists confirmed families, or with confirmed=False the bundled ones.
+        """
+        lines = []
+        seen = set()
+        for word in words:
+            family = self.lookup(word)
+            if (
+                family is None
+                or not self.is_complete(word)
+                or self.is_confirmed(word) != confirmed
+                or id(family) in seen
+            ):
+                continue
+            seen.add(id(family))
+            forms = family["forms"]
+            lines.append(
+                f"- {self.base_form(word)}: "
+                + ", ".join(f"{form}={forms[form]}" for form in FORM_TYPES)
+            )
+        return lines
@@ -0,0 +1,70 @@
+import os
+import re
+from pathlib import Path
+
+# Learner selection: --user flag, else LINGOKEUN_USER, else the default learner
+USER_ENV = "LINGOKEUN_USER"
+PROFILE_ROOT = Path("profile")
+TASKS_ROOT = Path("tasks")
+ANSWERS_ROOT = Path("answers")
+# Id the default learner (profile/ itself) is recorded under, so reserved
+DEFAULT_USER = "default"
+
+_USER_ID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+_active_user: str | None = None
+
+
+def validate_user(user_id: str) -> str:
+    """Reject ids that can't be used safely as a directory name."""
+    if not _USER_ID.match(user_id):
+        raise ValueError(
+            f"Invalid user id '{user_id}'. Use letters, digits, '.', '_' or '-'."
+        )
+    if user_id.lower() == DEFAULT_USER:
+        raise ValueError(
+            f"User id '{user_id}' is reserved for the default learner; "
+            "leave --user out to use it."
+        )
+    return user_id
+
+
+def set_user(user_id: str | None) -> None:
+    """Select the learner whose stores are used for the rest of the process."""
+    global _active_user
+    _active_user = validate_user(user_id) if user_id else None
+
+
+def current_user() -> str | None:
+    """Active learner id, or None for the default single-learner layout."""
+    user_id = _active_user or os.environ.get(USER_ENV) or None
+    return validate_user(user_id) if user_id else None
+
+
+def profile_dir(user_id: str | None = None) -> Path:
+    """Directory holding one learner's profile, vocabulary DB and tokens.
+
+    The default learner keeps using profile/ so existing installs need no
+    migration; named learners get their own shard under profile/users/.
+    """
+    user_id = user_id or current_user()
+    path = PROFILE_ROOT / "users" / user_id if user_id else PROFILE_ROOT
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def shared_dir() -> Path:
+    """Installation-wide directory (metrics, learner registry)."""
+    PROFILE_ROOT.mkdir(exist_ok=True)
+    return PROFILE_ROOT
+
+
+def tasks_dir(user_id: str | None = None) -> Path:
+    """Directory of one learner's daily task files."""
+    user_id = user_id or current_user()
+    return TASKS_ROOT / user_id if user_id else TASKS_ROOT
+
+
+def answers_dir(user_id: str | None = None) -> Path:
+    """Directory of one learner's answer files (answers/YYYY-MM-DD/task_N.md)."""
+    user_id = user_id or current_user()
+    return ANSWERS_ROOT / user_id if user_id else ANSWERS_ROOT
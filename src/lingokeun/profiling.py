@@ -0,0 +1,122 @@
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from . import paths
+
+# Lets benchmark runs turn profiling on without touching the CLI call
+PROFILE_ENV = "LINGOKEUN_PROFILE"
+PROFILE_DIR_ENV = "LINGOKEUN_PROFILE_DIR"
+MODES = ("cpu", "mem")
+TOP_N = 40
+
+
+class Profiler:
+    def __init__(self, mode: str):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'. Use: {', '.join(MODES)}")
+        self.mode = mode
+        self._cpu: cProfile.Profile | None = None
+
+    def start(self) -> None:
+        """Start cProfile or tracemalloc."""
+        if self.mode == "cpu":
+            self._cpu = cProfile.Profile()
+            self._cpu.enable()
+        else:
+            # Deep enough frames to tell apart callers inside sqlite3/json
+            tracemalloc.start(25)
+
+    def stop(self, label: str, output_dir: Path) -> Path:
+        """Stop profiling and write a sorted text report."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        report_file = output_dir / f"{label}-{timestamp}.{self.mode}.txt"
+
+        if self.mode == "cpu":
+            report = self._cpu_report()
+        else:
+            report = self._mem_report()
+
+        report_file.write_text(report, encoding="utf-8")
+        return report_file
+
+    def _cpu_report(self) -> str:
+        """Top functions by cumulative time, then by own time."""
+        if self._cpu is None:
+            raise RuntimeError("CPU profiler was not started")
+        self._cpu.disable()
+        out = io.StringIO()
+        stats = pstats.Stats(self._cpu, stream=out).strip_dirs()
+
+        out.write(f"# Top {TOP_N} functions by cumulative time\n\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_N)
+        out.write(f"\n# Top {TOP_N} functions by own time\n\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(TOP_N)
+        return out.getvalue()
+
+    def _mem_report(self) -> str:
+        """Top allocation sites by size, with tracebacks for the largest."""
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ]
+        )
+
+        lines = [
+            f"# Current: {current / 1024:.1f} KiB | Peak: {peak / 1024:.1f} KiB",
+            "",
+            f"# Top {TOP_N} allocation sites",
+            "",
+        ]
+        for stat in snapshot.statistics("lineno")[:TOP_N]:
+            lines.append(str(stat))
+
+        lines += ["", "# Tracebacks of the 5 largest allocation sites", ""]
+        for stat in snapshot.statistics("traceback")[:5]:
+            lines.append(f"{stat.count} blocks, {stat.size / 1024:.1f} KiB")
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+            lines.append("")
+
+        return "\n".join(lines) + "\n"
+
+
+def mode_from_env() -> str | None:
+    """Read the profile mode from LINGOKEUN_PROFILE, if set."""
+    mode = os.environ.get(PROFILE_ENV, "").strip().lower()
+    return mode or None
+
+
+def default_output_dir() -> Path:
+    """Report directory: LINGOKEUN_PROFILE_DIR or profile/reports."""
+    return Path(os.environ.get(PROFILE_DIR_ENV, paths.shared_dir() / "reports"))
+
+
+@contextmanager
+def profiled(label: str, mode: str | None = None, output_dir: Path | None = None):
+    """Profile a block, e.g. one benchmark case.
+
+    Without an explicit mode this follows LINGOKEUN_PROFILE and does nothing
+    when the variable is unset.
+    """
+    mode = mode or mode_from_env()
+    if not mode:
+        yield None
+        return
+
+    profiler = Profiler(mode)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop(label, output_dir or default_output_dir())
@@ -0,0 +1,206 @@
+import os
+import sqlite3
+import time
+
+from . import paths
+from .metrics import timed
+
+# Seconds between checks while waiting for a turn or for tokens
+POLL_SECONDS = 0.05
+MAX_SLEEP_SECONDS = 1.0
+# A waiting ticket not refreshed for this long belongs to a dead process
+TICKET_STALE_SECONDS = 30
+
+
+class RateLimiter:
+    """Requests- and tokens-per-minute buckets shared by all processes.
+
+    State lives in profile/ratelimit.db, so every AIService on the machine
+    (CLI, daemon, workers, prefetch) draws from the same two buckets. Callers
+    take a ticket and are served strictly in ticket order: only the oldest
+    ticket may take from the buckets, so a large request isn't starved by a
+    stream of small ones.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.db_path = paths.shared_dir() / "ratelimit.db"
+        self.limits = {
+            "requests": requests_per_minute,
+            "tokens": tokens_per_minute,
+        }
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        """Initialize database with tables."""
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS buckets (
+                name TEXT PRIMARY KEY,
+                level REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tickets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pid INTEGER NOT NULL,
+                cost INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                seen_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    @property
+    def enabled(self) -> bool:
+        return any(self.limits.values())
+
+    def _levels(self, conn: sqlite3.Connection, now: float) -> dict[str, float]:
+        """Current bucket levels, refilled for the time since the last update."""
+        levels = {}
+        for name, per_minute in self.limits.items():
+            row = conn.execute(
+                "SELECT level, updated_at FROM buckets WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                levels[name] = float(per_minute)
+            else:
+                level, updated_at = row
+                refill = (now - updated_at) * per_minute / 60
+                levels[name] = min(level + refill, float(per_minute))
+        return levels
+
+    def _store(self, conn: sqlite3.Connection, levels: dict, now: float) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO buckets (name, level, updated_at) VALUES (?, ?, ?)",
+            [(name, level, now) for name, level in levels.items()],
+        )
+
+    def acquire(self, tokens: int) -> float:
+        """Block until a request of about `tokens` tokens may be sent.
+
+        Returns the seconds spent waiting. A request larger than the whole
+        tokens-per-minute bucket waits for a full bucket instead of forever.
+        """
+        if not self.enabled:
+            return 0.0
+
+        cost = min(tokens, self.limits["tokens"]) if self.limits["tokens"] else 0
+        start = time.time()
+        ticket = self._take_ticket(cost, start)
+
+        with timed("ratelimit.wait") as span:
+            try:
+                while True:
+                    delay = self._try_serve(ticket, cost)
+                    if delay is None:
+                        break
+                    time.sleep(delay)
+            except BaseException:
+                self._drop_ticket(ticket)
+                raise
+
+            waited = time.time() - start
+            span.set(tokens=cost, waited_ms=round(waited * 1000, 1))
+        return waited
+
+    def _take_ticket(self, cost: int, now: float) -> int:
+        conn = self._connect()
+        ticket = conn.execute(
+            """
+            INSERT INTO tickets (pid, cost, created_at, seen_at)
+            VALUES (?, ?, ?, ?)
+            RETURNING id
+            """,
+            (os.getpid(), cost, now, now),
+        ).fetchone()[0]
+        conn.commit()
+        conn.close()
+        return ticket
+
+    def _drop_ticket(self, ticket: int) -> None:
+        conn = self._connect()
+        conn.execute("DELETE FROM tickets WHERE id = ?", (ticket,))
+        conn.commit()
+        conn.close()
+
+    def _try_serve(self, ticket: int, cost: int) -> float | None:
+        """Serve the ticket if it is first and the buckets allow it.
+
+        Returns None once served, otherwise how long to sleep before the
+        next attempt. A ticket another process dropped as stale (we were
+        suspended or stalled) is put back with its original id, so the
+        caller keeps its place in line.
+        """
+        conn = self._connect()
+        now = time.time()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            refreshed = conn.execute(
+                "UPDATE tickets SET seen_at = ? WHERE id = ?", (now, ticket)
+            ).rowcount
+            if not refreshed:
+                conn.execute(
+                    """
+                    INSERT INTO tickets (id, pid, cost, created_at, seen_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (ticket, os.getpid(), cost, now, now),
+                )
+            conn.execute(
+                "DELETE FROM tickets WHERE seen_at < ?",
+                (now - TICKET_STALE_SECONDS,),
+            )
+
+            head = conn.execute("SELECT MIN(id) FROM tickets").fetchone()[0]
+            if head != ticket:
+                conn.commit()
+                return POLL_SECONDS
+
+            levels = self._levels(conn, now)
+            needs = {"requests": 1, "tokens": cost}
+            shortfall = 0.0
+            for name, per_minute in self.limits.items():
+                if per_minute and levels[name] < needs[name]:
+                    missing = needs[name] - levels[name]
+                    shortfall = max(shortfall, missing * 60 / per_minute)
+
+            if shortfall:
+                conn.commit()
+                return min(max(shortfall, POLL_SECONDS), MAX_SLEEP_SECONDS)
+
+            for name, per_minute in self.limits.items():
+                if per_minute:
+                    levels[name] -= needs[name]
+            self._store(conn, levels, now)
+            conn.execute("DELETE FROM tickets WHERE id = ?", (ticket,))
+            conn.commit()
+            return None
+        finally:
+            conn.close()
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct the tokens bucket once a call's real usage is known.
+
+        Usage above the estimate may take the bucket below zero; the debt
+        delays the next requests instead of being forgotten.
+        """
+        if not self.limits["tokens"] or actual == estimated:
+            return
+
+        conn = self._connect()
+        now = time.time()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            levels = self._levels(conn, now)
+            levels["tokens"] -= min(actual, self.limits["tokens"]) - min(
+                estimated, self.limits["tokens"]
+            )
+            self._store(conn, levels, now)
+            conn.commit()
+        finally:
+            conn.close()
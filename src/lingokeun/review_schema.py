@@ -0,0 +1,95 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+FormType = Literal["verb", "noun", "adjective", "adverb", "opposite"]
+FormStatus = Literal["correct", "wrong", "added"]
+WordType = Literal["n", "v", "adj", "adv"]
+
+FORM_TYPES: tuple[FormType, ...] = ("verb", "noun", "adjective", "adverb", "opposite")
+STATUS_MARKS = {"correct": "✓", "wrong": "✗", "added": "+"}
+
+
+class FormReview(BaseModel):
+    form: FormType
+    correct_answer: str = Field(description="Correct word for this form, '-' if none")
+    student_answer: str = Field(description="Student's answer, '-' if left blank")
+    status: FormStatus = Field(
+        description="correct, wrong, or added when the student left it blank"
+    )
+    meaning: str = Field(
+        description="Arti utama (konteks/nuansa penggunaan) in Bahasa Indonesia"
+    )
+
+
+class WordReview(BaseModel):
+    word: str
+    word_type: WordType | None = Field(
+        default=None, description="Primary word type of the word"
+    )
+    forms: list[FormReview]
+
+    @property
+    def accuracy(self) -> int:
+        """Percentage of the five forms answered correctly."""
+        return int(len(self.forms_correct) / len(FORM_TYPES) * 100)
+
+    @property
+    def forms_correct(self) -> list[str]:
+        # A form the model repeats still counts once
+        correct = {f.form for f in self.forms if f.status == "correct"}
+        return [form for form in FORM_TYPES if form in correct]
+
+    @property
+    def forms_weak(self) -> list[str]:
+        correct = set(self.forms_correct)
+        return [form for form in FORM_TYPES if form not in correct]
+
+    @property
+    def forms_data(self) -> dict[str, str]:
+        return {
+            f.form: f.correct_answer for f in self.forms if _has_value(f.correct_answer)
+        }
+
+    @property
+    def forms_meanings(self) -> dict[str, str]:
+        return {f.form: f.meaning for f in self.forms if _has_value(f.meaning)}
+
+
+class Task1Review(BaseModel):
+    words: list[WordReview]
+    summary: str = Field(
+        description="1-2 sentences: overall score and main improvement area"
+    )
+
+    def to_markdown(self) -> str:
+        """Render the review in the Markdown layout appended to task files."""
+        lines = []
+        for i, word in enumerate(self.words, 1):
+            word_type = f" (type: {word.word_type})" if word.word_type else ""
+            lines += [
+                f"### Word {i}: {word.word}{word_type}",
+                "",
+                "| Form | Correct Answer | Student's Answer | Status | Arti |",
+                "|------|----------------|------------------|--------|------|",
+            ]
+            for form in word.forms:
+                lines.append(
+                    f"| {form.form.title()} | {_cell(form.correct_answer)} "
+                    f"| {_cell(form.student_answer)} | {STATUS_MARKS[form.status]} "
+                    f"| {_cell(form.meaning)} |"
+                )
+            lines.append("")
+
+        lines += ["---", "", f"**Summary:** {self.summary}", ""]
+        return "\n".join(lines)
+
+
+def _has_value(value: str) -> bool:
+    return bool(value) and value.strip() not in ("-", "...")
+
+
+def _cell(value: str) -> str:
+    """Keep table cells on one line and free of column separators."""
+    value = " ".join(value.split()).replace("|", "/")
+    return value or "-"
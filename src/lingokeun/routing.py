@@ -0,0 +1,94 @@
+import time
+
+import httpx
+from google.genai import errors
+
+from . import paths, storage
+from .config import settings
+
+# Weight of the newest call in the moving averages
+EWMA_ALPHA = 0.3
+# A model whose failure average (errors and slow calls) reaches this is
+# skipped for COOLDOWN_SECONDS, then tried again
+FAILURE_LIMIT = 0.5
+MIN_CALLS = 3
+COOLDOWN_SECONDS = 300
+# HTTP codes another model may not hit: timeouts and rate limits (and 5xx)
+TRANSIENT_CODES = (408, 429)
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether another model is worth trying after this error.
+
+    True when the model was unavailable (timeout, rate limit, server error),
+    False when the request itself was rejected or the error is ours.
+    """
+    if isinstance(error, errors.APIError):
+        return error.code in TRANSIENT_CODES or (error.code or 0) >= 500
+    return isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError))
+
+
+class ModelRouter:
+    """Picks the Gemini model for each operation, failing over when needed.
+
+    Routes come from settings.MODEL_ROUTES (operation -> models, primary
+    first), else MODEL_DEFAULT then MODEL_FALLBACKS. Latency and failures
+    are tracked per operation and model in profile/model_health.json as
+    moving averages, shared by all processes; a model that keeps erroring
+    or answering slower than MODEL_SLOW_MS moves behind its fallbacks for a
+    while.
+    """
+
+    def __init__(self):
+        self.health_file = paths.shared_dir() / "model_health.json"
+
+    def route(self, operation: str) -> list[str]:
+        """Configured models of an operation, primary first."""
+        models = settings.MODEL_ROUTES.get(operation)
+        if not models:
+            models = [settings.MODEL_DEFAULT, *settings.MODEL_FALLBACKS]
+        # Keep the first mention of each model
+        return list(dict.fromkeys(models))
+
+    def candidates(self, operation: str) -> list[str]:
+        """Models to try in order: healthy ones first, in route order."""
+        health = storage.read_json(self.health_file, dict)
+        now = time.time()
+
+        healthy, demoted = [], []
+        for model in self.route(operation):
+            stats = health.get(f"{operation}|{model}", {})
+            if stats.get("demoted_until", 0) > now:
+                demoted.append(model)
+            else:
+                healthy.append(model)
+        return healthy + demoted
+
+    def record(self, operation: str, model: str, latency_ms: float, ok: bool) -> None:
+        """Fold one call's outcome into the model's moving averages."""
+        failed = not ok or latency_ms > settings.MODEL_SLOW_MS
+
+        with storage.file_lock(self.health_file):
+            health = storage.read_json(self.health_file, dict)
+            stats = health.setdefault(
+                f"{operation}|{model}",
+                {"calls": 0, "latency_ms": latency_ms, "failures": 0.0},
+            )
+            stats["calls"] += 1
+            stats["latency_ms"] = round(
+                EWMA_ALPHA * latency_ms + (1 - EWMA_ALPHA) * stats["latency_ms"], 1
+            )
+            stats["failures"] = round(
+                EWMA_ALPHA * failed + (1 - EWMA_ALPHA) * stats["failures"], 3
+            )
+
+            if stats["calls"] >= MIN_CALLS and stats["failures"] >= FAILURE_LIMIT:
+                stats["demoted_until"] = time.time() + COOLDOWN_SECONDS
+                # Half open: after the cooldown, two more failures demote again
+                stats["failures"] = FAILURE_LIMIT / 2
+
+            storage.write_json(self.health_file, health)
+
+    def health(self) -> dict[str, dict]:
+        """Recorded stats per "operation|model"."""
+        return storage.read_json(self.health_file, dict)
@@ -0,0 +1,306 @@
+import asyncio
+import hmac
+import ipaddress
+import json
+import os
+import secrets
+from datetime import datetime
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from . import metrics, paths, workflow
+from .token_monitor import TokenMonitor
+from .user_profile import UserProfileManager
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+# Header carrying the per-run secret from daemon.json
+TOKEN_HEADER = "X-Lingokeun-Token"
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    500: "Internal Server Error",
+}
+
+
+class _Rejected(Exception):
+    """Request refused before its body is read."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def discovery_file():
+    """File announcing a running daemon for the active learner."""
+    return paths.profile_dir() / "daemon.json"
+
+
+def is_loopback(host: str) -> bool:
+    """Whether an address only accepts connections from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _write_private_json(path, data: dict) -> None:
+    """Atomically write a JSON file only the owner can read (0600)."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class LingokeunServer:
+    """Long-running local JSON API with warm state.
+
+    The Gemini client, schema-checked vocabulary DB and parsed profile are
+    created once. Non-AI queries run directly on the event loop; AI calls
+    run in worker threads so several can be in flight at once.
+
+    Every request must carry the secret generated at startup (stored in the
+    owner-only daemon.json) and POST bodies must be application/json, so a
+    web page can't drive the daemon with cross-origin form posts.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        ai_workers: int = 4,
+        allow_remote: bool = False,
+    ) -> None:
+        if not allow_remote and not is_loopback(host):
+            raise ValueError(
+                f"Refusing to listen on non-loopback address {host} "
+                "without allow_remote"
+            )
+        self.host = host
+        self.port = port
+        self.token = secrets.token_urlsafe(32)
+        self.profile_manager = UserProfileManager()
+        self.token_monitor = TokenMonitor()
+        self._service = None
+        self._ai_slots = asyncio.Semaphore(ai_workers)
+        self._profile_cache: tuple[int, dict] | None = None
+
+    @property
+    def service(self):
+        """AIService, built on first AI request (imports google.genai)."""
+        if self._service is None:
+            from .ai_service import AIService
+
+            self._service = AIService()
+        return self._service
+
+    def _profile(self) -> dict:
+        """Profile JSON, re-parsed only when the file changed on disk."""
+        try:
+            mtime = self.profile_manager.profile_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return self.profile_manager.load_profile()
+
+        if self._profile_cache is None or self._profile_cache[0] != mtime:
+            self._profile_cache = (mtime, self.profile_manager.load_profile())
+        return self._profile_cache[1]
+
+    async def _run_ai(self, func, *args) -> Any:
+        async with self._ai_slots:
+            return await asyncio.to_thread(func, *args)
+
+    async def dispatch(
+        self, method: str, path: str, query: dict, payload: dict
+    ) -> tuple[int, Any]:
+        """Route one request to its handler."""
+        vocab_db = self.profile_manager.vocab_db
+
+        if method == "GET":
+            if path == "/health":
+                return 200, {"status": "ok", "pid": os.getpid()}
+            if path == "/vocab/stats":
+                return 200, vocab_db.get_vocabulary_stats()
+            if path == "/vocab/word":
+                details = vocab_db.get_word_details(
+                    query.get("word", ""), int(query.get("history", 5))
+                )
+                if details is None:
+                    return 404, {"error": "Word not found"}
+                return 200, details
+            if path == "/vocab/history":
+                page = vocab_db.get_review_history(
+                    query.get("word", ""),
+                    limit=min(int(query.get("limit", 20)), 500),
+                    before=query.get("before"),
+                )
+                if page is None:
+                    return 404, {"error": "Word not found"}
+                return 200, page
+            if path == "/profile":
+                profile = self._profile()
+                return 200, {
+                    "total_reviews": profile["total_reviews"],
+                    "focus_areas": profile["focus_areas"],
+                    "patterns": profile["patterns"],
+                    "vocabulary_gaps": self.profile_manager.get_vocabulary_gaps(5),
+                }
+            if path == "/stats":
+                return 200, self.token_monitor.get_stats()
+            return 404, {"error": f"Unknown endpoint {path}"}
+
+        if method != "POST":
+            return 405, {"error": "Use GET or POST"}
+
+        if path == "/generate":
+            task_file, from_queue = await self._run_ai(
+                workflow.generate_task, payload.get("date"), self.service
+            )
+            return 200, {"task_file": str(task_file), "from_queue": from_queue}
+
+        if path == "/review":
+            review_result = await self._run_ai(
+                workflow.review_task,
+                self.service,
+                payload["date"],
+                int(payload.get("task", 1)),
+                payload["answers"],
+            )
+            profile = self.profile_manager.load_profile()
+            return 200, {
+                "review": review_result,
+                "task_file": str(workflow.task_file_path(payload["date"])),
+                "urgent": profile["focus_areas"]["urgent"],
+                "new_issues": profile["patterns"]["new_issues"],
+            }
+
+        if path == "/material":
+            if not payload.get("topic"):
+                return 400, {"error": "topic is required"}
+            filepath = await self._run_ai(
+                workflow.generate_material, self.service, payload["topic"]
+            )
+            return 200, {"material_file": str(filepath)}
+
+        return 404, {"error": f"Unknown endpoint {path}"}
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Parse one HTTP/1.1 request and write a JSON response."""
+        status, result = 500, {"error": "Internal error"}
+        try:
+            request_line = (await reader.readline()).decode("latin-1")
+            method, target, _ = request_line.split(" ", 2)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            self._check_access(method, headers)
+
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY_BYTES:
+                raise OverflowError
+            body = await reader.readexactly(length) if length else b""
+
+            url = urlsplit(target)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            payload = json.loads(body) if body else {}
+
+            with metrics.timed(f"serve.{url.path.strip('/').replace('/', '.')}"):
+                status, result = await self.dispatch(method, url.path, query, payload)
+        except _Rejected as e:
+            status, result = e.status, {"error": str(e)}
+        except OverflowError:
+            status, result = 413, {"error": "Request body too large"}
+        except (ValueError, KeyError, FileNotFoundError) as e:
+            status, result = 400, {"error": str(e)}
+        except Exception as e:
+            status, result = 500, {"error": str(e)}
+
+        data = json.dumps(result, ensure_ascii=False, default=str).encode("utf-8")
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + data
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    def _check_access(self, method: str, headers: dict) -> None:
+        """Raise _Rejected unless the request has the token and a JSON body."""
+        token = headers.get(TOKEN_HEADER.lower(), "")
+        if not hmac.compare_digest(token.encode(), self.token.encode()):
+            raise _Rejected(401, f"Missing or wrong {TOKEN_HEADER} header")
+
+        content_type = headers.get("content-type", "").split(";")[0].strip()
+        if method == "POST" and content_type.lower() != "application/json":
+            raise _Rejected(415, "POST bodies must be application/json")
+
+    async def _flush_metrics(self, interval: float = 30.0) -> None:
+        """Persist latency samples periodically instead of per request."""
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(metrics.flush)
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled, announcing the daemon while it runs."""
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+
+        _write_private_json(
+            discovery_file(),
+            {
+                "host": self.host,
+                "port": self.port,
+                "pid": os.getpid(),
+                "cwd": os.getcwd(),
+                "user": paths.current_user(),
+                "started_at": datetime.now().isoformat(),
+                "token": self.token,
+            },
+        )
+        flusher = asyncio.create_task(self._flush_metrics())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            flusher.cancel()
+            discovery_file().unlink(missing_ok=True)
+
+
+def run(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    ai_workers: int = 4,
+    allow_remote: bool = False,
+):
+    """Run the daemon in the foreground until interrupted."""
+
+    async def _main():
+        await LingokeunServer(host, port, ai_workers, allow_remote).serve_forever()
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,118 @@
+import json
+import os
+import shutil
+import sys
+import threading
+from collections.abc import Callable
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process locking
+    fcntl = None  # type: ignore[assignment]
+
+_locks_guard = threading.Lock()
+_locks: dict[str, threading.RLock] = {}
+_held: dict[str, int] = {}
+
+
+def backup_path(path: Path) -> Path:
+    """Location of the last good snapshot of a JSON store."""
+    return path.with_name(path.name + ".bak")
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Hold an exclusive advisory lock on a store for read-modify-write.
+
+    Uses flock on a sidecar <file>.lock across processes and an RLock across
+    threads. Re-entrant within a process, so a locked section can call
+    helpers that lock the same file again.
+    """
+    key = str(path.resolve())
+    with _locks_guard:
+        rlock = _locks.setdefault(key, threading.RLock())
+
+    with rlock:
+        if _held.get(key):
+            _held[key] += 1
+            try:
+                yield
+            finally:
+                _held[key] -= 1
+            return
+
+        lock_file = path.with_name(path.name + ".lock")
+        with open(lock_file, "a") as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            _held[key] = 1
+            try:
+                yield
+            finally:
+                _held[key] = 0
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def write_json(path: Path, data: Any, indent: int | None = 2) -> None:
+    """Atomically replace a JSON file, keeping the previous one as .bak.
+
+    The new content is written to a temp file, fsynced and renamed over the
+    target, so readers see either the old or the new file, never a
+    truncated one. The previous version is kept by hard link (no copy).
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    separators = None if indent else (",", ":")
+
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, separators=separators, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+
+    if path.exists():
+        backup = backup_path(path)
+        backup.unlink(missing_ok=True)
+        try:
+            os.link(path, backup)
+        except OSError:
+            shutil.copy2(path, backup)
+
+    os.replace(tmp, path)
+
+
+def read_json(path: Path, default: Callable[[], Any]) -> Any:
+    """Read a JSON store, recovering from corruption.
+
+    A file that doesn't parse is moved aside as <file>.corrupt-<time> and the
+    last good .bak snapshot is restored. Only when there is no usable
+    snapshot either does this fall back to `default()`.
+    """
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return default()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        pass
+
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    corrupt = path.with_name(f"{path.name}.corrupt-{timestamp}")
+    try:
+        os.replace(path, corrupt)
+        sys.stderr.write(f"⚠️  {path} is corrupted, moved to {corrupt.name}\n")
+    except FileNotFoundError:
+        # Another process got here first
+        pass
+
+    backup = backup_path(path)
+    try:
+        data = json.loads(backup.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
+        return default()
+
+    sys.stderr.write(f"   Restored last good snapshot from {backup.name}\n")
+    shutil.copy2(backup, path)
+    return data
@@ -0,0 +1,174 @@
+import re
+
+from .morphology import MorphologyIndex
+from .review_schema import FORM_TYPES, FormReview, FormStatus, WordReview
+from .vocabulary_db import WORD_TYPES
+
+_ANSWER_LINE = re.compile(
+    r"^\s*(?:[-*•]\s*)?\**\s*(verb|noun|adjective|adverb|opposite)\s*\**\s*[:：]\s*\**(.*?)\**\s*$",
+    re.IGNORECASE,
+)
+_HEADER_NOISE = re.compile(
+    r"\(.*?\)|[#*_`>|]|^\s*\d+[.)]?|\bword\s*\d*\b[:.]?", re.IGNORECASE
+)
+_BLANK = {"", "-", "--", "?", "...", "…", "n/a", "none"}
+
+
+def normalize(answer: str) -> str:
+    """Lowercase, trim punctuation and whitespace; blanks become ""."""
+    value = " ".join(answer.lower().strip().strip(".,;:!\"'`*_").split())
+    return "" if value in _BLANK else value
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up (limit + 1) once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def typo_tolerance(word: str) -> int:
+    """Edits still read as a misspelling of a word of this length."""
+    return 1 if len(word) <= 6 else 2
+
+
+def parse_answers(text: str) -> list[dict]:
+    """Split Task 1 answers into words with their five form answers.
+
+    Accepts the layouts the task file and editors produce: a header line
+    naming the word ("**1. facilitate**", "### Facilitate (v)", ...)
+    followed by "Verb: ..." style lines. Returns [] when nothing parses.
+    """
+    words: list[dict] = []
+    current: dict | None = None
+
+    for line in text.splitlines():
+        match = _ANSWER_LINE.match(line)
+        if match:
+            if current is not None:
+                current["answers"][match.group(1).lower()] = match.group(2).strip()
+            continue
+
+        header = _HEADER_NOISE.sub(" ", line)
+        tokens = re.findall(r"[A-Za-z][A-Za-z-]*", header)
+        if len(tokens) == 1:
+            current = {"word": tokens[0].lower(), "answers": {}}
+            words.append(current)
+
+    return [w for w in words if w["answers"]]
+
+
+def grade_form(
+    form: str, answer: str, family: dict, morphology: MorphologyIndex
+) -> FormStatus | None:
+    """Status of one answer against a known family, None if unsure.
+
+    A blank answer is "added", a match "correct", a near miss of the right
+    word (typo) or another form of the same family "wrong". Anything else
+    might be a valid form the index doesn't know, so it goes to the model.
+    """
+    answer = normalize(answer)
+    expected = family["forms"].get(form, "-")
+    alternatives = [
+        normalize(value) for value in re.split(r"[/,]", expected) if normalize(value)
+    ]
+
+    if not alternatives:
+        # The family has no such form
+        return "correct" if not answer else None
+
+    if not answer:
+        return "added"
+    if answer in alternatives:
+        return "correct"
+    if any(
+        edit_distance(answer, value, typo_tolerance(value)) <= typo_tolerance(value)
+        for value in alternatives
+    ):
+        return "wrong"
+    if morphology.lookup(answer) is family:
+        return "wrong"
+    return None
+
+
+def grade_word(
+    parsed: dict, morphology: MorphologyIndex, word_type: str | None = None
+) -> WordReview | None:
+    """Review one word locally, or None if any form needs the model.
+
+    Only families confirmed in reviews, with every form and meaning known,
+    are graded here, so the local review is as complete as the model's.
+    """
+    family = morphology.lookup(parsed["word"])
+    if (
+        family is None
+        or family["source"] != "confirmed"
+        or not morphology.is_complete(parsed["word"])
+    ):
+        return None
+
+    forms = []
+    for form in FORM_TYPES:
+        expected = family["forms"][form]
+        meaning = family["meanings"].get(form)
+        if expected != "-" and not meaning:
+            return None
+
+        answer = parsed["answers"].get(form, "")
+        status = grade_form(form, answer, family, morphology)
+        if status is None:
+            return None
+
+        forms.append(
+            FormReview(
+                form=form,
+                correct_answer=expected,
+                student_answer=answer.strip() or "-",
+                status=status,
+                meaning=meaning or "-",
+            )
+        )
+
+    return WordReview(
+        word=parsed["word"],
+        word_type=WORD_TYPES.get((word_type or "").lower()),
+        forms=forms,
+    )
+
+
+def render_answers(parsed_words: list[dict]) -> str:
+    """Answers of some words back in the Task 1 layout, for the model."""
+    lines = []
+    for parsed in parsed_words:
+        lines.append(f"**{parsed['word']}**")
+        for form in FORM_TYPES:
+            lines.append(f"- {form.title()}: {parsed['answers'].get(form, '')}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def local_summary(words: list[WordReview]) -> str:
+    """Summary line in Bahasa Indonesia for a locally graded review."""
+    total = len(words) * len(FORM_TYPES)
+    correct = sum(len(w.forms_correct) for w in words)
+    weak = sorted({form for w in words for form in w.forms_weak})
+
+    summary = f"Skor {correct}/{total} bentuk benar ({int(correct / total * 100)}%)."
+    if weak:
+        summary += f" Perlu latihan lagi: {', '.join(weak)}."
+    return summary
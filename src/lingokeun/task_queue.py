@@ -0,0 +1,95 @@
+import re
+from datetime import datetime
+
+from . import paths, storage
+
+# Only the weak words that actually reach the prompt matter for invalidation
+WEAK_WORD_WINDOW = 10
+
+
+class TaskQueue:
+    def __init__(self, invalidate_threshold: float = 0.3):
+        self.queue_dir = paths.profile_dir()
+        self.queue_file = self.queue_dir / "task_queue.json"
+        self.invalidate_threshold = invalidate_threshold
+
+    def _load(self) -> dict:
+        """Load queue file or return an empty queue."""
+        return storage.read_json(self.queue_file, lambda: {"tasks": {}})
+
+    def _save(self, data: dict) -> None:
+        """Save queue file."""
+        storage.write_json(self.queue_file, data)
+
+    def snapshot(self, weak_words: list[str], user_context: str) -> dict:
+        """Capture the learner state a task is generated from."""
+        return {
+            "weak_words": sorted(weak_words[:WEAK_WORD_WINDOW]),
+            "user_context": user_context,
+            "created_at": datetime.now().isoformat(),
+        }
+
+    def is_fresh(self, entry: dict, weak_words: list[str]) -> bool:
+        """Check whether the weak-word set is still close to the snapshot.
+
+        Uses Jaccard distance between the snapshot and current weak words,
+        so one word moving in or out of a 10-word window does not throw
+        away a prepared task.
+        """
+        built = set(entry["snapshot"]["weak_words"])
+        current = set(weak_words[:WEAK_WORD_WINDOW])
+
+        if not built and not current:
+            return True
+
+        distance = 1 - len(built & current) / len(built | current)
+        return distance <= self.invalidate_threshold
+
+    def put(self, task_date: str, content: str, snapshot: dict) -> None:
+        """Store a pre-generated task for the given date."""
+        with storage.file_lock(self.queue_file):
+            data = self._load()
+            data["tasks"][task_date] = {"content": content, "snapshot": snapshot}
+            self._save(data)
+
+    def get(self, task_date: str, weak_words: list[str]) -> str | None:
+        """Return a queued task if it exists and is still fresh."""
+        entry = self._load()["tasks"].get(task_date)
+        if entry and self.is_fresh(entry, weak_words):
+            return entry["content"]
+        return None
+
+    def pop(self, task_date: str, weak_words: list[str]) -> str | None:
+        """Take a fresh queued task out of the queue.
+
+        Stale entries are dropped as well so they get regenerated.
+        """
+        with storage.file_lock(self.queue_file):
+            data = self._load()
+            entry = data["tasks"].pop(task_date, None)
+            if entry is None:
+                return None
+
+            # Drop anything older than the requested date while we're here
+            data["tasks"] = {d: t for d, t in data["tasks"].items() if d > task_date}
+            self._save(data)
+
+        return entry["content"] if self.is_fresh(entry, weak_words) else None
+
+    def queued_words(self, exclude_date: str | None = None) -> list[str]:
+        """List vocabulary already selected by queued tasks."""
+        words: list[str] = []
+        for task_date, entry in sorted(self._load()["tasks"].items()):
+            if task_date == exclude_date:
+                continue
+            match = re.search(r"\*\*Selected Vocabulary:\*\*\s*(.+)", entry["content"])
+            if match:
+                words.extend(w.strip() for w in match.group(1).split(",") if w.strip())
+        return words
+
+    def status(self) -> dict[str, str]:
+        """Map queued dates to their creation timestamps."""
+        return {
+            task_date: entry["snapshot"]["created_at"]
+            for task_date, entry in sorted(self._load()["tasks"].items())
+        }
@@ -1,21 +1,38 @@
-import json
-from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Optional
 
+from . import paths, storage
+from .learners import LearnerRegistry
+from .metrics import timed
+
+# Output token counts kept per operation for budget projections
+OUTPUT_SAMPLES = 50
+# Days of per-day counters kept
+COUNTER_DAYS = 31
+
 
 class TokenMonitor:
     def __init__(self):
-        self.log_dir = Path("profile")
-        self.log_dir.mkdir(exist_ok=True)
+        self.log_dir = paths.profile_dir()
         self.log_file = self.log_dir / "token_usage.json"
+        # Running counters, so budget checks never read the history
+        self.counters_file = self.log_dir / "token_counters.json"
         self._ensure_log_file()
 
     def _ensure_log_file(self):
         """Create log file if it doesn't exist."""
         if not self.log_file.exists():
-            self.log_file.write_text(json.dumps({"total": {"input": 0, "output": 0}, "history": []}, indent=2))
+            with storage.file_lock(self.log_file):
+                if not self.log_file.exists():
+                    storage.write_json(self.log_file, self._empty_log())
+
+    def _empty_log(self) -> dict:
+        return {"total": {"input": 0, "output": 0}, "history": []}
+
+    def _empty_counters(self) -> dict:
+        return {"days": {}, "operations": {}}
 
+    @timed("tokens.log_usage")
     def log_usage(
         self,
         operation: str,
@@ -23,9 +40,40 @@ class TokenMonitor:
         output_tokens: int,
         model: str = "gemini-3-flash-preview",
         metadata: Optional[dict] = None,
+        prompt_chars: int | None = None,
     ):
         """Log token usage for an API call."""
-        data = json.loads(self.log_file.read_text())
+        with storage.file_lock(self.log_file):
+            # Load (or rebuild from history) before this call is in the history,
+            # so a rebuild doesn't count it twice
+            counters = self.get_counters()
+            self._append_usage(operation, input_tokens, output_tokens, model, metadata)
+
+            self._count(
+                counters,
+                date.today().isoformat(),
+                operation,
+                input_tokens,
+                output_tokens,
+                prompt_chars,
+            )
+            self._prune(counters)
+            storage.write_json(self.counters_file, counters)
+
+        # Keep the cross-learner counters in sync for admin queries
+        LearnerRegistry().record_tokens(
+            paths.current_user() or paths.DEFAULT_USER, input_tokens, output_tokens
+        )
+
+    def _append_usage(
+        self,
+        operation: str,
+        input_tokens: int,
+        output_tokens: int,
+        model: str,
+        metadata: dict | None,
+    ) -> None:
+        data = storage.read_json(self.log_file, self._empty_log)
 
         # Update totals
         data["total"]["input"] += input_tokens
@@ -47,20 +95,89 @@ class TokenMonitor:
         data["history"].append(entry)
 
         # Save
-        self.log_file.write_text(json.dumps(data, indent=2))
+        storage.write_json(self.log_file, data)
+
+    def _count(
+        self,
+        counters: dict,
+        day: str,
+        operation: str,
+        input_tokens: int,
+        output_tokens: int,
+        prompt_chars: int | None = None,
+    ) -> None:
+        """Fold one call into the per-day and per-operation counters."""
+        usage = counters["days"].setdefault(
+            day, {"input": 0, "output": 0, "calls": 0, "operations": {}}
+        )
+        op_usage = usage["operations"].setdefault(
+            operation, {"input": 0, "output": 0, "calls": 0}
+        )
+        for bucket in (usage, op_usage):
+            bucket["input"] += input_tokens
+            bucket["output"] += output_tokens
+            bucket["calls"] += 1
+
+        stats = counters["operations"].setdefault(
+            operation, {"prompt_chars": 0, "prompt_tokens": 0, "outputs": []}
+        )
+        stats["outputs"] = (stats["outputs"] + [output_tokens])[-OUTPUT_SAMPLES:]
+        if prompt_chars:
+            # Calibrates the chars-per-token estimate of this operation
+            stats["prompt_chars"] += prompt_chars
+            stats["prompt_tokens"] += input_tokens
+
+    def _prune(self, counters: dict) -> None:
+        cutoff = (date.today() - timedelta(days=COUNTER_DAYS)).isoformat()
+        counters["days"] = {
+            day: usage for day, usage in counters["days"].items() if day >= cutoff
+        }
+
+    def get_counters(self) -> dict:
+        """Per-day and per-operation counters, rebuilt from history once."""
+        counters = storage.read_json(self.counters_file, dict)
+        if counters:
+            return counters
+
+        with storage.file_lock(self.log_file):
+            counters = storage.read_json(self.counters_file, dict)
+            if counters:
+                return counters
+
+            counters = self._empty_counters()
+            data = storage.read_json(self.log_file, self._empty_log)
+            for entry in data["history"]:
+                self._count(
+                    counters,
+                    entry["timestamp"][:10],
+                    entry["operation"],
+                    entry["input_tokens"],
+                    entry["output_tokens"],
+                )
+            self._prune(counters)
+            storage.write_json(self.counters_file, counters)
+            return counters
+
+    def day_usage(self, day: str | None = None) -> dict:
+        """Tokens used on a day (default today), in total and per operation."""
+        day = day or date.today().isoformat()
+        return self.get_counters()["days"].get(
+            day, {"input": 0, "output": 0, "calls": 0, "operations": {}}
+        )
 
     def get_stats(self) -> dict:
         """Get token usage statistics."""
-        data = json.loads(self.log_file.read_text())
-        
+        data = storage.read_json(self.log_file, self._empty_log)
+
         total_input = data["total"]["input"]
         total_output = data["total"]["output"]
         total = total_input + total_output
-        
+
         return {
             "total_input": total_input,
             "total_output": total_output,
             "total": total,
             "total_calls": len(data["history"]),
+            "today": self.day_usage(),
             "recent": data["history"][-10:] if data["history"] else [],
         }
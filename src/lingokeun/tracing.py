@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+class _NoopSpan:
+    """Shared span returned while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+_tracer: Optional["Tracer"] = None
+
+
+class Span:
+    def __init__(self, tracer: "Tracer", name: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start_us = 0.0
+
+    def __enter__(self):
+        self.tracer._stack().append(self)
+        self.start_us = self.tracer._now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_us = self.tracer._now_us()
+        self.tracer._stack().pop()
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer._add(self, end_us)
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes (task number, tokens, rows written, ...)."""
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    def __init__(self, command: str):
+        self.command = command
+        self.pid = os.getpid()
+        self.events: list[dict] = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _add(self, span: Span, end_us: float) -> None:
+        event = {
+            "name": span.name,
+            "cat": span.name.split(".")[0],
+            "ph": "X",
+            "ts": round(span.start_us, 3),
+            "dur": round(end_us - span.start_us, 3),
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+            "args": span.attrs,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def write(self, path: Path) -> None:
+        """Write spans as JSONL (for .jsonl) or Chrome Trace Event JSON."""
+        events = sorted(self.events, key=lambda e: e["ts"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if path.suffix == ".jsonl":
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(
+                    json.dumps(event, ensure_ascii=False, default=str) + "\n"
+                    for event in events
+                )
+            return
+
+        metadata = {
+            "name": "process_name",
+            "ph": "M",
+            "pid": self.pid,
+            "args": {"name": f"lingokeun {self.command}"},
+        }
+        trace = {"traceEvents": [metadata, *events], "displayTimeUnit": "ms"}
+        path.write_text(
+            json.dumps(trace, ensure_ascii=False, default=str), encoding="utf-8"
+        )
+
+
+def start(command: str) -> None:
+    """Enable tracing for the rest of this process."""
+    global _tracer
+    _tracer = Tracer(command)
+
+
+def finish(path: Path) -> None:
+    """Write collected spans and disable tracing."""
+    global _tracer
+    if _tracer is None:
+        return
+    _tracer.write(path)
+    _tracer = None
+
+
+def span(name: str, **attrs: Any):
+    """Open a span; returns a shared no-op object while tracing is off."""
+    if _tracer is None:
+        return _NOOP
+    return Span(_tracer, name, attrs)
+
+
+def current():
+    """Get the innermost open span of this thread (no-op when disabled)."""
+    if _tracer is None:
+        return _NOOP
+    stack = _tracer._stack()
+    return stack[-1] if stack else _NOOP
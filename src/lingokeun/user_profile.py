@@ -1,32 +1,55 @@
-import json
-from pathlib import Path
+import heapq
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Any, Dict, List, Optional
+
+from . import paths, storage
+from .metrics import timed
 from .vocabulary_db import VocabularyDatabase
 
+# How many issues each focus area shows, worst first
+FOCUS_LIMITS = {"urgent": 3, "practice": 5, "maintain": 3}
+
+# Daily mistake buckets per weakness (ring buffer over the last 90 days)
+DAILY_WINDOW = 90
+RECENT_DAYS = 30
+NEW_DAYS = 14
+HISTORY_LIMIT = 20
+TREND_LABELS = {
+    "persistent_issues": "persistent",
+    "improving_areas": "improving",
+    "new_issues": "new",
+    "resolved_issues": "resolved",
+    None: "stable",
+}
+
 
 class UserProfileManager:
     def __init__(self):
-        self.profile_dir = Path("profile")
+        self.profile_dir = paths.profile_dir()
         self.profile_file = self.profile_dir / "user_profile.json"
-        self.profile_dir.mkdir(exist_ok=True)
         self.vocab_db = VocabularyDatabase()
 
+    @timed("profile.load")
     def load_profile(self) -> Dict[str, Any]:
         """Load user profile or create default if not exists."""
-        if not self.profile_file.exists():
-            return self._create_default_profile()
+        profile = storage.read_json(self.profile_file, self._create_default_profile)
 
-        try:
-            with open(self.profile_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return self._create_default_profile()
+        # Vocabulary gaps used to live in this file as a list
+        if "vocabulary_gaps" in profile:
+            with storage.file_lock(self.profile_file):
+                profile = storage.read_json(
+                    self.profile_file, self._create_default_profile
+                )
+                if "vocabulary_gaps" in profile:
+                    self.vocab_db.import_vocabulary_gaps(profile.pop("vocabulary_gaps"))
+                    self.save_profile(profile)
+
+        return profile
 
+    @timed("profile.save")
     def save_profile(self, profile: Dict[str, Any]) -> None:
-        """Save user profile to file."""
-        with open(self.profile_file, "w", encoding="utf-8") as f:
-            json.dump(profile, f, indent=2, ensure_ascii=False)
+        """Save user profile to file (atomic replace, previous kept as .bak)."""
+        storage.write_json(self.profile_file, profile)
 
     def _create_default_profile(self) -> Dict[str, Any]:
         """Create default user profile structure."""
@@ -35,7 +58,6 @@ class UserProfileManager:
             "total_reviews": 0,
             "grammar_weaknesses": {},
             "translation_weaknesses": {},
-            "vocabulary_gaps": [],
             "vocabulary_mastery": {},
             "patterns": {
                 "persistent_issues": [],
@@ -44,6 +66,7 @@ class UserProfileManager:
                 "resolved_issues": [],
             },
             "focus_areas": {"urgent": [], "practice": [], "maintain": []},
+            "focus_index": {name: {"members": {}, "top": []} for name in FOCUS_LIMITS},
             "review_history": [],
         }
 
@@ -97,62 +120,40 @@ class UserProfileManager:
 
         return weaknesses
 
+    @timed("profile.update_weaknesses")
     def update_weaknesses(self, review_content: str, task_type: str, date: str) -> None:
         """Update user profile with new weaknesses from review."""
+        # Read-modify-write under the profile lock so parallel reviews
+        # don't lose each other's updates
+        with storage.file_lock(self.profile_file):
+            self._update_weaknesses(review_content, task_type, date)
+
+    def _update_weaknesses(
+        self, review_content: str, task_type: str, date: str
+    ) -> None:
         profile = self.load_profile()
         weaknesses = self.extract_weaknesses_from_review(
             review_content, task_type, date
         )
 
+        changed = []
+
         # Update grammar weaknesses
         for grammar_issue in weaknesses["grammar"]:
-            if grammar_issue not in profile["grammar_weaknesses"]:
-                profile["grammar_weaknesses"][grammar_issue] = {
-                    "total_mistakes": 0,
-                    "recent_mistakes": 0,
-                    "trend": "new",
-                    "history": [],
-                }
-
-            profile["grammar_weaknesses"][grammar_issue]["total_mistakes"] += 1
-            profile["grammar_weaknesses"][grammar_issue]["recent_mistakes"] += 1
-            profile["grammar_weaknesses"][grammar_issue]["history"].append(
-                {"date": date, "count": 1, "task_type": task_type}
+            self._record_mistake(
+                profile["grammar_weaknesses"], grammar_issue, date, task_type
             )
+            changed.append(("grammar_weaknesses", grammar_issue))
 
         # Update translation weaknesses
         for trans_issue in weaknesses["translation"]:
-            if trans_issue not in profile["translation_weaknesses"]:
-                profile["translation_weaknesses"][trans_issue] = {
-                    "total_mistakes": 0,
-                    "recent_mistakes": 0,
-                    "trend": "new",
-                    "history": [],
-                }
-
-            profile["translation_weaknesses"][trans_issue]["total_mistakes"] += 1
-            profile["translation_weaknesses"][trans_issue]["recent_mistakes"] += 1
-            profile["translation_weaknesses"][trans_issue]["history"].append(
-                {"date": date, "count": 1, "task_type": task_type}
+            self._record_mistake(
+                profile["translation_weaknesses"], trans_issue, date, task_type
             )
+            changed.append(("translation_weaknesses", trans_issue))
 
         # Update vocabulary gaps
-        for vocab in weaknesses["vocabulary"]:
-            existing_vocab = next(
-                (v for v in profile["vocabulary_gaps"] if v["word"] == vocab), None
-            )
-            if existing_vocab:
-                existing_vocab["missed_count"] += 1
-                existing_vocab["last_seen"] = date
-            else:
-                profile["vocabulary_gaps"].append(
-                    {
-                        "word": vocab,
-                        "context": "workplace_communication",
-                        "missed_count": 1,
-                        "last_seen": date,
-                    }
-                )
+        self.vocab_db.record_vocabulary_gaps(weaknesses["vocabulary"], date)
 
         # Update review history
         profile["review_history"].append(
@@ -167,77 +168,223 @@ class UserProfileManager:
 
         profile["total_reviews"] += 1
 
-        # Recalculate patterns and focus areas
-        self._update_patterns(profile)
-        self._update_focus_areas(profile)
+        # Re-classify only the weaknesses this review touched. Trends also
+        # shift as days pass, so everything is re-classified once per day.
+        today = datetime.now().strftime("%Y-%m-%d")
+        if "focus_index" not in profile or profile.get("classified_on") != today:
+            self._rebuild_indexes(profile)
+            profile["classified_on"] = today
+        else:
+            for category, issue in changed:
+                self._reclassify(profile, category, issue)
 
         self.save_profile(profile)
 
-    def _update_patterns(self, profile: Dict[str, Any]) -> None:
-        """Update patterns based on weakness history."""
-        persistent_issues = []
-        improving_areas = []
-        new_issues = []
-
-        # Check grammar weaknesses
-        for issue, data in profile["grammar_weaknesses"].items():
-            if data["total_mistakes"] >= 3:
-                persistent_issues.append(issue)
-            elif len(data["history"]) == 1:
-                new_issues.append(issue)
-            elif self._is_improving(data["history"]):
-                improving_areas.append(issue)
-
-        # Check translation weaknesses
-        for issue, data in profile["translation_weaknesses"].items():
-            if data["total_mistakes"] >= 3:
-                persistent_issues.append(issue)
-            elif len(data["history"]) == 1:
-                new_issues.append(issue)
-            elif self._is_improving(data["history"]):
-                improving_areas.append(issue)
-
-        profile["patterns"]["persistent_issues"] = persistent_issues
-        profile["patterns"]["improving_areas"] = improving_areas
-        profile["patterns"]["new_issues"] = new_issues
-
-    def _update_focus_areas(self, profile: Dict[str, Any]) -> None:
-        """Update focus areas based on current weaknesses."""
-        urgent = []
-        practice = []
-        maintain = []
-
-        # Grammar focus
-        for issue, data in profile["grammar_weaknesses"].items():
-            if data["total_mistakes"] >= 5:
-                urgent.append(issue)
-            elif data["total_mistakes"] >= 2:
-                practice.append(issue)
+    def _record_mistake(
+        self, weaknesses: dict[str, Any], issue: str, date: str, task_type: str
+    ) -> None:
+        """Count one mistake for a weakness in its totals, buckets and history."""
+        if issue not in weaknesses:
+            weaknesses[issue] = {
+                "total_mistakes": 0,
+                "recent_mistakes": 0,
+                "trend": "new",
+                "first_seen": date,
+                "history": [],
+            }
+
+        data = weaknesses[issue]
+        self._ensure_daily(data)
+        data["total_mistakes"] += 1
+        self._bump_daily(data, date)
+        data["history"].append({"date": date, "count": 1, "task_type": task_type})
+        # Buckets hold the trend now; history only keeps recent context
+        del data["history"][:-HISTORY_LIMIT]
+
+    def _ensure_daily(self, data: dict[str, Any]) -> None:
+        """Backfill daily buckets and first_seen for weaknesses from older profiles."""
+        if "daily" in data:
+            return
+
+        data.setdefault(
+            "first_seen", data["history"][0]["date"] if data["history"] else None
+        )
+        data["daily"] = {"end": 0, "counts": [0] * DAILY_WINDOW}
+        for entry in data["history"]:
+            for _ in range(entry.get("count", 1)):
+                self._bump_daily(data, entry["date"])
+        del data["history"][:-HISTORY_LIMIT]
+
+    def _bump_daily(self, data: dict[str, Any], date: str) -> None:
+        """Add one mistake to the ring buffer of daily buckets.
+
+        counts[day % DAILY_WINDOW] holds day `day`; moving `end` forward
+        clears the slots of the days that fall out of the window.
+        """
+        daily = data["daily"]
+        counts = daily["counts"]
+        day = datetime.fromisoformat(date).toordinal()
+
+        if day > daily["end"]:
+            start = max(daily["end"] + 1, day - DAILY_WINDOW + 1)
+            for d in range(start, day + 1):
+                counts[d % DAILY_WINDOW] = 0
+            daily["end"] = day
+        elif day <= daily["end"] - DAILY_WINDOW:
+            # Older than the window: only counted in total_mistakes
+            return
+
+        counts[day % DAILY_WINDOW] += 1
+
+    def _window_sum(self, data: dict[str, Any], days: int, offset: int = 0) -> int:
+        """Mistakes in the `days` days ending `offset` days before today."""
+        daily = data["daily"]
+        last_day = datetime.now().toordinal() - offset
+        first = max(last_day - days + 1, daily["end"] - DAILY_WINDOW + 1)
+        last = min(last_day, daily["end"])
+        return sum(daily["counts"][d % DAILY_WINDOW] for d in range(first, last + 1))
+
+    def _severity(self, data: dict[str, Any]) -> list[Any]:
+        """Ranking key: more mistakes first, then most recently seen.
+
+        Both parts only grow when a weakness is updated, which is what lets
+        the top-k heaps below be maintained without rescanning.
+        """
+        last_seen = data["history"][-1]["date"] if data["history"] else ""
+        return [data["total_mistakes"], last_seen]
+
+    def _focus_class(self, category: str, data: dict[str, Any]) -> str | None:
+        """Decide which focus area a weakness belongs to."""
+        total = data["total_mistakes"]
+
+        if category == "grammar_weaknesses":
+            if total >= 5:
+                return "urgent"
+            if total >= 2:
+                return "practice"
+            return "maintain"
+
+        if total >= 3:
+            return "urgent"
+        if total >= 2:
+            return "practice"
+        return None
+
+    def _pattern_class(self, data: dict[str, Any]) -> str | None:
+        """Decide which pattern list a weakness belongs to.
+
+        Everything is judged from the daily buckets, so an old mistake stops
+        counting as "recent" once it leaves the window.
+        """
+        recent = self._window_sum(data, RECENT_DAYS)
+        if recent == 0:
+            return "resolved_issues"
+        if recent >= 3:
+            return "persistent_issues"
+
+        first_seen = data.get("first_seen")
+        if first_seen and (
+            datetime.now().toordinal() - datetime.fromisoformat(first_seen).toordinal()
+            < NEW_DAYS
+        ):
+            return "new_issues"
+
+        if self._is_improving(data):
+            return "improving_areas"
+        return None
+
+    def _reclassify(self, profile: dict[str, Any], category: str, issue: str) -> None:
+        """Move one changed weakness between pattern lists and focus heaps.
+
+        Each focus area keeps all members with their severity plus a min-heap
+        of its top FOCUS_LIMITS entries. A changed issue is pushed into its
+        heap in O(log k); only when an issue leaves an area while sitting in
+        that area's top-k is the heap rebuilt from the members.
+        """
+        data = profile[category][issue]
+        self._ensure_daily(data)
+        data["recent_mistakes"] = self._window_sum(data, RECENT_DAYS)
+
+        # Patterns
+        new_pattern = self._pattern_class(data)
+        data["trend"] = TREND_LABELS[new_pattern]
+        for name in TREND_LABELS:
+            if name is None:
+                continue
+            issues = profile["patterns"].setdefault(name, [])
+            if name == new_pattern:
+                if issue not in issues:
+                    issues.append(issue)
+            elif issue in issues:
+                issues.remove(issue)
+
+        # Focus areas
+        index = profile["focus_index"]
+        new_focus = self._focus_class(category, data)
+        score = self._severity(data)
+
+        for name, bucket in index.items():
+            if name == new_focus or issue not in bucket["members"]:
+                continue
+            del bucket["members"][issue]
+            if any(entry[2] == issue for entry in bucket["top"]):
+                bucket["top"] = [
+                    [*member_score, member]
+                    for member, member_score in bucket["members"].items()
+                ]
+                heapq.heapify(bucket["top"])
+                while len(bucket["top"]) > FOCUS_LIMITS[name]:
+                    heapq.heappop(bucket["top"])
+            self._publish_focus(profile, name)
+
+        if new_focus:
+            bucket = index[new_focus]
+            bucket["members"][issue] = score
+            top = bucket["top"]
+
+            for entry in top:
+                if entry[2] == issue:
+                    entry[:2] = score
+                    heapq.heapify(top)
+                    break
             else:
-                maintain.append(issue)
-
-        # Translation focus
-        for issue, data in profile["translation_weaknesses"].items():
-            if data["total_mistakes"] >= 3:
-                urgent.append(issue)
-            elif data["total_mistakes"] >= 2:
-                practice.append(issue)
-
-        profile["focus_areas"]["urgent"] = urgent[:3]  # Top 3 urgent
-        profile["focus_areas"]["practice"] = practice[:5]  # Top 5 practice
-        profile["focus_areas"]["maintain"] = maintain[:3]  # Top 3 maintain
-
-    def _is_improving(self, history: List[Dict]) -> bool:
-        """Check if user is improving in this area."""
-        if len(history) < 3:
-            return False
-
-        recent_3 = history[-3:]
-        return all(
-            recent_3[i]["count"] >= recent_3[i + 1]["count"]
-            for i in range(len(recent_3) - 1)
+                heapq.heappush(top, [*score, issue])
+                if len(top) > FOCUS_LIMITS[new_focus]:
+                    heapq.heappop(top)
+
+            self._publish_focus(profile, new_focus)
+
+    def _publish_focus(self, profile: dict[str, Any], name: str) -> None:
+        """Expose a focus heap as a worst-first list of issue names."""
+        top = profile["focus_index"][name]["top"]
+        profile["focus_areas"][name] = [entry[2] for entry in sorted(top, reverse=True)]
+
+    def _rebuild_indexes(self, profile: dict[str, Any]) -> None:
+        """Build patterns and focus heaps from scratch (older profiles)."""
+        profile["patterns"].update(
+            {name: [] for name in TREND_LABELS if name is not None}
         )
+        profile["focus_index"] = {
+            name: {"members": {}, "top": []} for name in FOCUS_LIMITS
+        }
+        for name in FOCUS_LIMITS:
+            profile["focus_areas"][name] = []
+
+        for category in ("grammar_weaknesses", "translation_weaknesses"):
+            for issue in profile[category]:
+                self._reclassify(profile, category, issue)
+
+    def _is_improving(self, data: dict[str, Any]) -> bool:
+        """Fewer mistakes in the last half of the recent window than the first."""
+        half = RECENT_DAYS // 2
+        previous = self._window_sum(data, half, offset=half)
+        return previous > 0 and self._window_sum(data, half) < previous
+
+    def get_vocabulary_gaps(self, limit: int = 5) -> list[dict]:
+        """Get the most-missed vocabulary gaps."""
+        return self.vocab_db.get_vocabulary_gaps(limit=limit)
 
+    @timed("profile.user_context")
     def get_user_context_for_ai(self) -> str:
         """Generate context string for AI prompts."""
         profile = self.load_profile()
@@ -260,8 +407,9 @@ class UserProfileManager:
             )
 
         # Vocabulary gaps
-        if profile["vocabulary_gaps"]:
-            vocab_words = [v["word"] for v in profile["vocabulary_gaps"][:5]]
+        vocab_gaps = self.get_vocabulary_gaps(limit=5)
+        if vocab_gaps:
+            vocab_words = [v["word"] for v in vocab_gaps]
             context_parts.append(f"Vocabulary gaps: {', '.join(vocab_words)}")
 
         # Recent improvements
@@ -301,6 +449,7 @@ class UserProfileManager:
             date=date,
         )
 
+    @timed("profile.vocabulary_context")
     def get_vocabulary_context_for_ai(self) -> dict:
         """Get mastered and weak vocabulary for AI prompt."""
         mastered_words = self.vocab_db.get_mastered_words(threshold=80)
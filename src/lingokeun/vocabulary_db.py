@@ -1,70 +1,82 @@
 import sqlite3
-from pathlib import Path
+from collections.abc import Callable
+from datetime import date as Date
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Any, Dict, Optional
+
+from . import migrations, paths, tracing
+from .metrics import timed
+from .review_schema import WordType
+from .word_frequency import COMMON_WORDS
+
+# Accuracy from which a review counts as correct / a word as mastered
+MASTERY_THRESHOLD = 80
+# Reviews averaged into rolling accuracy
+ROLLING_WINDOW = 5
+# Candidates read per bucket when selecting the daily words
+SELECTION_POOL = 50
+# Days before a mastered word is due again: doubles with the streak
+MAX_REVIEW_INTERVAL = 60
+# Score multiplier per already selected word of the same type
+TYPE_REPEAT_PENALTY = 0.7
+# Short word types used by reviews, keyed by what `vocab --add` may store
+WORD_TYPES: dict[str, WordType] = {
+    "n": "n",
+    "noun": "n",
+    "v": "v",
+    "verb": "v",
+    "adj": "adj",
+    "adjective": "adj",
+    "adv": "adv",
+    "adverb": "adv",
+}
+
+
+def review_interval(streak: int) -> int:
+    """Days a word with this many correct reviews in a row can rest."""
+    return min(2**streak, MAX_REVIEW_INTERVAL)
+
+
+def score_candidate(candidate: dict, today: Date) -> dict:
+    """Score one selection candidate; higher is picked first.
+
+    weakness: how far rolling accuracy is below 100
+    recency:  days since the last review, saturating after two weeks
+    due:      how overdue a mastered word is for its spaced review
+    Unreviewed words get a flat bonus over new words, which are ranked by
+    frequency.
+    """
+    kind = candidate["kind"]
+    parts = {"weakness": 0.0, "recency": 0.0, "due": 0.0, "base": 0.0}
+
+    if kind in ("weak", "due"):
+        days = (today - Date.fromisoformat(candidate["last_review"][:10])).days
+        parts["weakness"] = 3 * (100 - candidate["accuracy"]) / 100
+        if candidate.get("regressed"):
+            parts["weakness"] += 0.5
+        parts["recency"] = min(days, 14) / 14
+        if kind == "due":
+            interval = review_interval(candidate["streak"])
+            parts["due"] = 2 * min((days - interval) / interval, 1)
+    elif kind == "unreviewed":
+        parts["base"] = 1.5
+    else:
+        parts["base"] = 1 - candidate["rank"] / len(COMMON_WORDS)
+
+    return {**parts, "total": round(sum(parts.values()), 3)}
 
 
 class VocabularyDatabase:
     def __init__(self):
-        self.db_path = Path("profile") / "vocabulary_mastery.db"
-        self.db_path.parent.mkdir(exist_ok=True)
+        self.db_path = paths.profile_dir() / "vocabulary_mastery.db"
         self._init_db()
 
+    @timed("db.init")
     def _init_db(self):
-        """Initialize database with tables."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Main vocabulary table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS vocabulary (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT UNIQUE NOT NULL,
-                word_type TEXT,
-                total_reviews INTEGER DEFAULT 0,
-                accuracy_score INTEGER DEFAULT 0,
-                last_reviewed TEXT,
-                source TEXT DEFAULT 'task',
-                meaning TEXT,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-        """)
-
-        # Forms mastery tracking
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS forms_mastery (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word_id INTEGER NOT NULL,
-                form_type TEXT NOT NULL,
-                form_value TEXT,
-                form_meaning TEXT,
-                is_mastered BOOLEAN DEFAULT 0,
-                FOREIGN KEY (word_id) REFERENCES vocabulary(id),
-                UNIQUE(word_id, form_type)
-            )
-        """)
-
-        # Review history
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS review_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word_id INTEGER NOT NULL,
-                review_date TEXT NOT NULL,
-                accuracy INTEGER NOT NULL,
-                FOREIGN KEY (word_id) REFERENCES vocabulary(id)
-            )
-        """)
-
-        # Create indexes for fast queries
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_accuracy ON vocabulary(accuracy_score)"
-        )
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_word ON vocabulary(word)")
-
-        conn.commit()
-        conn.close()
+        """Create or upgrade the schema (see migrations.py)."""
+        migrations.migrate(self.db_path)
 
+    @timed("db.add_vocabulary")
     def add_vocabulary(
         self,
         word: str,
@@ -124,6 +136,7 @@ class VocabularyDatabase:
         finally:
             conn.close()
 
+    @timed("db.update_vocabulary_mastery")
     def update_vocabulary_mastery(
         self,
         word: str,
@@ -193,24 +206,95 @@ class VocabularyDatabase:
 
             cursor.execute(
                 """
-                INSERT OR REPLACE INTO forms_mastery (word_id, form_type, form_value, form_meaning, is_mastered)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT OR REPLACE INTO forms_mastery
+                    (word_id, form_type, form_value, form_meaning, is_mastered, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                (word_id, form, form_value, form_meaning, is_mastered),
+                (word_id, form, form_value, form_meaning, is_mastered, now),
             )
 
         # Add to review history
         cursor.execute(
             """
-            INSERT INTO review_history (word_id, review_date, accuracy)
-            VALUES (?, ?, ?)
+            INSERT INTO review_history (word_id, review_date, accuracy, recorded_at)
+            VALUES (?, ?, ?, ?)
             """,
-            (word_id, date, accuracy_score),
+            (word_id, date, accuracy_score, now),
         )
 
+        self._update_progress(cursor, word_id, accuracy_score, date)
+
         conn.commit()
+        tracing.current().set(word=word_lower, rows_written=conn.total_changes)
         conn.close()
 
+    def _update_progress(self, cursor, word_id: int, accuracy: int, date: str) -> None:
+        """Fold one review into the word's materialized progress row.
+
+        O(1) per review: only the previous row is read, never the history.
+        Reviews are assumed to arrive in date order.
+        """
+        cursor.execute("SELECT * FROM word_progress WHERE word_id = ?", (word_id,))
+        row = cursor.fetchone()
+        correct = accuracy >= MASTERY_THRESHOLD
+
+        if row is None:
+            progress: dict[str, Any] = {
+                "reviews": 0,
+                "recent": "",
+                "best_accuracy": accuracy,
+                "worst_accuracy": accuracy,
+                "streak": 0,
+                "first_review": date,
+                "mastered_at": None,
+                "days_to_mastery": None,
+                "regressions": 0,
+            }
+        else:
+            columns = [c[0] for c in cursor.description]
+            progress = dict(zip(columns, row))
+
+        recent = [int(a) for a in progress["recent"].split(",") if a]
+        recent = (recent + [accuracy])[-ROLLING_WINDOW:]
+
+        mastered_at = progress["mastered_at"]
+        if correct and mastered_at is None:
+            mastered_at = date
+            progress["days_to_mastery"] = (
+                datetime.fromisoformat(date)
+                - datetime.fromisoformat(progress["first_review"])
+            ).days
+
+        regressed = mastered_at is not None and not correct
+
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO word_progress
+                (word_id, reviews, recent, rolling_accuracy, best_accuracy,
+                 worst_accuracy, last_accuracy, streak, first_review, last_review,
+                 mastered_at, days_to_mastery, regressed, regressions)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                word_id,
+                progress["reviews"] + 1,
+                ",".join(map(str, recent)),
+                round(sum(recent) / len(recent), 1),
+                max(progress["best_accuracy"], accuracy),
+                min(progress["worst_accuracy"], accuracy),
+                accuracy,
+                progress["streak"] + 1 if correct else 0,
+                progress["first_review"],
+                date,
+                mastered_at,
+                progress["days_to_mastery"],
+                int(regressed),
+                # Count the drop, not every weak review after it
+                progress["regressions"]
+                + int(regressed and not progress.get("regressed")),
+            ),
+        )
+
     def get_mastered_words(self, threshold: int = 80) -> list[str]:
         """Get words with accuracy >= threshold."""
         conn = sqlite3.connect(self.db_path)
@@ -266,6 +350,156 @@ class VocabularyDatabase:
         conn.close()
         return words
 
+    def _selection_candidates(self, cursor, today: Date) -> list[dict]:
+        """Weak, due, unreviewed and new words, each from an indexed query."""
+        candidates = []
+
+        # Weak words, weakest first (idx_accuracy)
+        cursor.execute(
+            """
+            SELECT v.word, v.word_type,
+                   COALESCE(p.rolling_accuracy, v.accuracy_score),
+                   COALESCE(p.last_review, v.last_reviewed), COALESCE(p.regressed, 0)
+            FROM vocabulary v
+            LEFT JOIN word_progress p ON p.word_id = v.id
+            WHERE v.accuracy_score < ? AND v.total_reviews > 0
+            ORDER BY v.accuracy_score, v.id
+            LIMIT ?
+            """,
+            (MASTERY_THRESHOLD, SELECTION_POOL),
+        )
+        for word, word_type, accuracy, last_review, regressed in cursor.fetchall():
+            candidates.append(
+                {
+                    "word": word,
+                    "word_type": word_type,
+                    "kind": "weak",
+                    "accuracy": accuracy,
+                    "last_review": last_review or today.isoformat(),
+                    "regressed": regressed,
+                }
+            )
+
+        # Mastered words, least recently reviewed first. CROSS JOIN keeps
+        # word_progress outer so idx_progress_last_review gives the order
+        cursor.execute(
+            """
+            SELECT v.word, v.word_type, p.rolling_accuracy, p.last_review, p.streak
+            FROM word_progress p
+            CROSS JOIN vocabulary v ON v.id = p.word_id
+            WHERE v.accuracy_score >= ?
+            ORDER BY p.last_review, p.word_id
+            LIMIT ?
+            """,
+            (MASTERY_THRESHOLD, SELECTION_POOL),
+        )
+        for word, word_type, accuracy, last_review, streak in cursor.fetchall():
+            days = (today - Date.fromisoformat(last_review[:10])).days
+            if days >= review_interval(streak):
+                candidates.append(
+                    {
+                        "word": word,
+                        "word_type": word_type,
+                        "kind": "due",
+                        "accuracy": accuracy,
+                        "last_review": last_review,
+                        "streak": streak,
+                    }
+                )
+
+        # Unreviewed words in the order they were added (idx_vocab_created)
+        cursor.execute(
+            """
+            SELECT word, word_type FROM vocabulary
+            WHERE total_reviews = 0
+            ORDER BY created_at, id
+            LIMIT ?
+            """,
+            (SELECTION_POOL,),
+        )
+        for word, word_type in cursor.fetchall():
+            candidates.append(
+                {"word": word, "word_type": word_type, "kind": "unreviewed"}
+            )
+
+        # New words from the frequency list that aren't in the database (idx_word)
+        placeholders = ", ".join("?" for _ in COMMON_WORDS)
+        cursor.execute(
+            f"SELECT word FROM vocabulary WHERE word IN ({placeholders})",
+            [word for word, _ in COMMON_WORDS],
+        )
+        known = {row[0] for row in cursor.fetchall()}
+        for rank, (word, word_type) in enumerate(COMMON_WORDS):
+            if word not in known:
+                candidates.append(
+                    {"word": word, "word_type": word_type, "kind": "new", "rank": rank}
+                )
+
+        return candidates
+
+    @timed("db.select_daily_words")
+    def select_daily_words(
+        self,
+        count: int = 5,
+        avoid: list[str] | None = None,
+        today: Date | None = None,
+        family: Callable[[str], str] | None = None,
+    ) -> list[dict]:
+        """Pick the words of a daily task, deterministically.
+
+        Candidates are scored with score_candidate, then picked greedily:
+        each pick lowers the score of remaining words of the same type, and
+        words of a family already picked (per `family`, e.g. base forms) or
+        in `avoid` are skipped. Ties go to the alphabetically first word.
+        """
+        today = today or Date.today()
+        family = family or str.lower
+        taken = {family(word) for word in avoid or []}
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        candidates = self._selection_candidates(cursor, today)
+        conn.close()
+
+        scored = {}
+        for candidate in candidates:
+            # A word is only scored once, in the first bucket it appears in
+            if candidate["word"] not in scored:
+                candidate["word_type"] = WORD_TYPES.get(
+                    (candidate["word_type"] or "").lower()
+                )
+                candidate["score"] = score_candidate(candidate, today)
+                scored[candidate["word"]] = candidate
+
+        selected: list[dict] = []
+        type_counts: dict[str | None, int] = {}
+        while len(selected) < count:
+            ranked = [
+                (
+                    -candidate["score"]["total"]
+                    * TYPE_REPEAT_PENALTY ** type_counts.get(candidate["word_type"], 0),
+                    candidate["word"],
+                )
+                for candidate in scored.values()
+                if family(candidate["word"]) not in taken
+            ]
+            if not ranked:
+                break
+
+            score, word = min(ranked)
+            best = scored[word]
+            selected.append({**best, "adjusted": round(-score, 3)})
+            taken.add(family(word))
+            word_type = best["word_type"]
+            if word_type:
+                type_counts[word_type] = type_counts.get(word_type, 0) + 1
+
+        tracing.current().set(
+            selected=[w["word"] for w in selected], candidates=len(scored)
+        )
+        return selected
+
+    @timed("db.get_vocabulary_stats")
     def get_vocabulary_stats(self) -> dict:
         """Get overall vocabulary statistics."""
         conn = sqlite3.connect(self.db_path)
@@ -296,8 +530,9 @@ class VocabularyDatabase:
             "unreviewed": unreviewed,
         }
 
-    def get_word_details(self, word: str) -> Optional[dict]:
-        """Get detailed information about a word."""
+    @timed("db.get_word_details")
+    def get_word_details(self, word: str, history_limit: int = 5) -> dict | None:
+        """Get detailed information about a word with its latest reviews."""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
@@ -337,17 +572,24 @@ class VocabularyDatabase:
                 "is_mastered": bool(form_row[3]),
             }
 
-        # Get review history
+        history = self._history_page(cursor, word_id, history_limit)[0]
+        summary = self._history_summary(cursor, word_id)
+
         cursor.execute(
             """
-            SELECT review_date, accuracy 
-            FROM review_history 
+            SELECT rolling_accuracy, best_accuracy, worst_accuracy, streak,
+                   mastered_at, days_to_mastery, regressed, regressions
+            FROM word_progress
             WHERE word_id = ?
-            ORDER BY review_date DESC
             """,
             (word_id,),
         )
-        history = [{"date": h[0], "accuracy": h[1]} for h in cursor.fetchall()]
+        progress_row = cursor.fetchone()
+        progress = (
+            dict(zip([c[0] for c in cursor.description], progress_row))
+            if progress_row
+            else None
+        )
 
         conn.close()
 
@@ -362,8 +604,234 @@ class VocabularyDatabase:
             "created_at": vocab_row[8],
             "forms": forms,
             "history": history,
+            "history_summary": summary,
+            "progress": progress,
         }
 
+    def _history_page(
+        self, cursor, word_id: int, limit: int, before: str | None = None
+    ) -> tuple[list[dict], str | None]:
+        """One page of a word's reviews, newest first, plus the next cursor.
+
+        Pages are keyed on (review_date, id) rather than OFFSET, so deep
+        pages cost the same as the first one.
+        """
+        if before:
+            before_date, before_id = before.rsplit(":", 1)
+            cursor.execute(
+                """
+                SELECT id, review_date, accuracy
+                FROM review_history
+                WHERE word_id = ? AND (review_date, id) < (?, ?)
+                ORDER BY review_date DESC, id DESC
+                LIMIT ?
+                """,
+                (word_id, before_date, int(before_id), limit + 1),
+            )
+        else:
+            cursor.execute(
+                """
+                SELECT id, review_date, accuracy
+                FROM review_history
+                WHERE word_id = ?
+                ORDER BY review_date DESC, id DESC
+                LIMIT ?
+                """,
+                (word_id, limit + 1),
+            )
+
+        rows = cursor.fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1][1]}:{rows[-1][0]}"
+
+        return [{"date": h[1], "accuracy": h[2]} for h in rows], next_cursor
+
+    def _history_summary(self, cursor, word_id: int, window: int = 5) -> dict:
+        """Review count, first/last date and accuracy computed in SQL."""
+        cursor.execute(
+            """
+            SELECT reviews, first_review, last_review, avg_accuracy
+            FROM word_history_stats
+            WHERE word_id = ?
+            """,
+            (word_id,),
+        )
+        row = cursor.fetchone() or (0, None, None, None)
+
+        cursor.execute(
+            """
+            SELECT ROUND(AVG(accuracy), 1) FROM (
+                SELECT accuracy FROM review_history
+                WHERE word_id = ?
+                ORDER BY review_date DESC, id DESC
+                LIMIT ?
+            )
+            """,
+            (word_id, window),
+        )
+
+        return {
+            "reviews": row[0],
+            "first_review": row[1],
+            "last_review": row[2],
+            "avg_accuracy": row[3],
+            "rolling_accuracy": cursor.fetchone()[0],
+            "rolling_window": window,
+        }
+
+    @timed("db.get_review_history")
+    def get_review_history(
+        self, word: str, limit: int = 20, before: str | None = None
+    ) -> dict | None:
+        """Page through a word's review history, newest first.
+
+        Pass the returned `next_cursor` as `before` to get the next page.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT id FROM vocabulary WHERE word = ?", (word.lower(),))
+        row = cursor.fetchone()
+        if not row:
+            conn.close()
+            return None
+
+        items, next_cursor = self._history_page(cursor, row[0], limit, before)
+        conn.close()
+        return {"items": items, "next_cursor": next_cursor}
+
+    def get_word_types(self, words: list[str]) -> dict[str, str]:
+        """Stored word types of the given words (unknown words left out)."""
+        if not words:
+            return {}
+
+        conn = sqlite3.connect(self.db_path)
+        placeholders = ", ".join("?" for _ in words)
+        rows = conn.execute(
+            f"""
+            SELECT word, word_type FROM vocabulary
+            WHERE word IN ({placeholders}) AND word_type IS NOT NULL
+            """,
+            [w.lower() for w in words],
+        ).fetchall()
+        conn.close()
+        return dict(rows)
+
+    @timed("db.get_confirmed_forms")
+    def get_confirmed_forms(self) -> dict[str, dict]:
+        """Forms confirmed by reviews or manual edits, keyed by word.
+
+        A reviewed word has a row for every form; a form without value
+        there means the review found none, returned as "-".
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.execute(
+            """
+            SELECT v.word, f.form_type, f.form_value, f.form_meaning
+            FROM forms_mastery f
+            JOIN vocabulary v ON v.id = f.word_id
+            WHERE f.form_value IS NOT NULL OR v.total_reviews > 0
+            """
+        )
+
+        words: dict[str, dict] = {}
+        for word, form_type, form_value, form_meaning in cursor:
+            words.setdefault(word, {})[form_type] = {
+                "value": form_value or "-",
+                "meaning": form_meaning,
+            }
+
+        conn.close()
+        return words
+
+    @timed("db.get_progress_overview")
+    def get_progress_overview(self, limit: int = 5) -> dict:
+        """Learning-curve dashboard read from the word_progress table."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+
+        totals = dict(
+            conn.execute(
+                """
+                SELECT COUNT(*) AS words,
+                       COUNT(mastered_at) AS mastered,
+                       COALESCE(SUM(regressed), 0) AS regressed,
+                       ROUND(AVG(rolling_accuracy), 1) AS rolling_accuracy,
+                       ROUND(AVG(days_to_mastery), 1) AS days_to_mastery
+                FROM word_progress
+                """
+            ).fetchone()
+        )
+
+        regressions = [
+            dict(row)
+            for row in conn.execute(
+                """
+                SELECT v.word, p.rolling_accuracy, p.last_accuracy, p.mastered_at,
+                       p.last_review
+                FROM word_progress p JOIN vocabulary v ON v.id = p.word_id
+                WHERE p.regressed = 1
+                ORDER BY p.last_review DESC
+                LIMIT ?
+                """,
+                (limit,),
+            )
+        ]
+
+        streaks = [
+            dict(row)
+            for row in conn.execute(
+                """
+                SELECT v.word, p.streak, p.rolling_accuracy
+                FROM word_progress p JOIN vocabulary v ON v.id = p.word_id
+                WHERE p.streak > 0
+                ORDER BY p.streak DESC
+                LIMIT ?
+                """,
+                (limit,),
+            )
+        ]
+
+        conn.close()
+        return {"totals": totals, "regressions": regressions, "streaks": streaks}
+
+    @timed("db.get_cohorts")
+    def get_cohorts(self, months: int = 6) -> list[dict]:
+        """Mastery per month of words added, with running totals.
+
+        E.g. "words added in 2026-01: 40, 55% mastered, 12 days to mastery".
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+
+        rows = conn.execute(
+            """
+            WITH cohorts AS (
+                SELECT substr(v.created_at, 1, 7) AS cohort,
+                       COUNT(*) AS words,
+                       COUNT(p.mastered_at) AS mastered,
+                       ROUND(AVG(p.days_to_mastery), 1) AS days_to_mastery
+                FROM vocabulary v
+                LEFT JOIN word_progress p ON p.word_id = v.id
+                WHERE v.created_at >= date('now', 'start of month', ?)
+                GROUP BY cohort
+            )
+            SELECT cohort, words, mastered, days_to_mastery,
+                   ROUND(100.0 * mastered / words, 1) AS mastered_pct,
+                   SUM(words) OVER (ORDER BY cohort) AS words_total,
+                   SUM(mastered) OVER (ORDER BY cohort) AS mastered_total
+            FROM cohorts
+            ORDER BY cohort DESC
+            """,
+            (f"-{months - 1} months",),
+        ).fetchall()
+
+        conn.close()
+        return [dict(row) for row in rows]
+
+    @timed("db.update_word_form")
     def update_word_form(self, word: str, form_type: str, form_value: str) -> bool:
         """Manually update a word form (verb/noun/adj/adv/opposite)."""
         conn = sqlite3.connect(self.db_path)
@@ -385,10 +853,11 @@ class VocabularyDatabase:
         # Update or insert form
         cursor.execute(
             """
-            INSERT OR REPLACE INTO forms_mastery (word_id, form_type, form_value, is_mastered)
-            VALUES (?, ?, ?, 1)
+            INSERT OR REPLACE INTO forms_mastery
+                (word_id, form_type, form_value, is_mastered, updated_at)
+            VALUES (?, ?, ?, 1, ?)
             """,
-            (word_id, form_type.lower(), form_value),
+            (word_id, form_type.lower(), form_value, now),
         )
 
         # Update vocabulary updated_at
@@ -402,3 +871,86 @@ class VocabularyDatabase:
         conn.commit()
         conn.close()
         return True
+
+    @timed("db.record_vocabulary_gaps")
+    def record_vocabulary_gaps(
+        self,
+        words: list[str],
+        date: str,
+        context: str = "workplace_communication",
+    ) -> None:
+        """Count one miss for each gap word (keyed upsert, no list scan)."""
+        if not words:
+            return
+
+        conn = sqlite3.connect(self.db_path)
+        now = datetime.now().isoformat()
+
+        conn.executemany(
+            """
+            INSERT INTO vocabulary_gaps (word, context, missed_count, last_seen, created_at)
+            VALUES (?, ?, 1, ?, ?)
+            ON CONFLICT(word) DO UPDATE SET
+                missed_count = missed_count + 1,
+                last_seen = MAX(COALESCE(last_seen, ''), excluded.last_seen)
+            """,
+            [(word.lower(), context, date, now) for word in words],
+        )
+
+        conn.commit()
+        conn.close()
+
+    def import_vocabulary_gaps(self, gaps: list[dict]) -> None:
+        """Merge gaps from the old user_profile.json list into the table."""
+        conn = sqlite3.connect(self.db_path)
+        now = datetime.now().isoformat()
+
+        conn.executemany(
+            """
+            INSERT INTO vocabulary_gaps (word, context, missed_count, last_seen, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(word) DO UPDATE SET
+                missed_count = MAX(missed_count, excluded.missed_count),
+                last_seen = MAX(COALESCE(last_seen, ''), excluded.last_seen)
+            """,
+            [
+                (
+                    gap["word"].lower(),
+                    gap.get("context", "workplace_communication"),
+                    gap.get("missed_count", 1),
+                    gap.get("last_seen"),
+                    now,
+                )
+                for gap in gaps
+            ],
+        )
+
+        conn.commit()
+        conn.close()
+
+    def get_vocabulary_gaps(self, limit: int = 5) -> list[dict]:
+        """Get the most-missed gap words, served from the ranking index."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            SELECT word, context, missed_count, last_seen
+            FROM vocabulary_gaps
+            ORDER BY missed_count DESC, last_seen DESC
+            LIMIT ?
+            """,
+            (limit,),
+        )
+
+        gaps = [
+            {
+                "word": row[0],
+                "context": row[1],
+                "missed_count": row[2],
+                "last_seen": row[3],
+            }
+            for row in cursor.fetchall()
+        ]
+        conn.close()
+        return gaps
@@ -0,0 +1,172 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT = struct.Struct("iIII")
+
+# A file is reported once it has had no new events for this long
+SETTLE_SECONDS = 0.5
+POLL_INTERVAL_SECONDS = 1.0
+
+
+def _files(root: Path) -> Iterator[Path]:
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            yield Path(dirpath) / filename
+
+
+class PollingWatcher:
+    """Detects changed files by comparing mtimes and sizes on each scan."""
+
+    name = "polling"
+
+    def __init__(self, root: Path, interval: float = POLL_INTERVAL_SECONDS):
+        self.root = root
+        self.interval = interval
+        self._seen = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        state = {}
+        for path in _files(self.root):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def poll(self, timeout: float) -> set[Path]:
+        """Wait up to `timeout` and return files created or changed since."""
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {
+            path for path, state in current.items() if self._seen.get(path) != state
+        }
+        self._seen = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify through ctypes: the kernel reports each saved file.
+
+    Watches every directory under root and adds new ones as they appear.
+    Editors that save by writing a temp file and renaming it are covered by
+    IN_MOVED_TO, direct writes by IN_CLOSE_WRITE.
+    """
+
+    name = "inotify"
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._libc = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+        )
+        self._fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        for dirpath, _, _ in os.walk(root):
+            self._add_watch(Path(dirpath))
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+        self._dirs[wd] = directory
+
+    def poll(self, timeout: float) -> set[Path]:
+        """Wait up to `timeout` and return files created or changed since."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        data = os.read(self._fd, 64 * 1024)
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: report everything, the caller is idempotent
+                changed.update(_files(self.root))
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may land in the new directory before the watch is
+                    # in place, so pick those up too
+                    for dirpath, _, _ in os.walk(path):
+                        self._add_watch(Path(dirpath))
+                    changed.update(_files(path))
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(root: Path, polling: bool = False):
+    """inotify on Linux, mtime polling elsewhere or when asked to."""
+    root.mkdir(parents=True, exist_ok=True)
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root)
+
+
+def watch(
+    watcher, stop: threading.Event, settle: float = SETTLE_SECONDS
+) -> Iterator[Path]:
+    """Yield files once they have settled, until `stop` is set.
+
+    A save often produces several events (truncate, write, rename); waiting
+    until a file has been quiet for `settle` seconds reports it once.
+    """
+    pending: dict[Path, float] = {}
+    try:
+        while not stop.is_set():
+            changed = watcher.poll(settle if pending else POLL_INTERVAL_SECONDS)
+            now = time.monotonic()
+            for path in changed:
+                pending[path] = now
+
+            for path, changed_at in sorted(pending.items()):
+                if now - changed_at >= settle:
+                    del pending[path]
+                    if path.exists():
+                        yield path
+    finally:
+        watcher.close()
@@ -0,0 +1,109 @@
+"""Offline word families for common professional vocabulary.
+
+Each entry is (verb, noun, adjective, adverb, opposite); "-" marks a form
+that doesn't exist or isn't used. Forms confirmed in reviews (forms_mastery)
+take precedence over these.
+"""
+
+FAMILIES = (
+    ("accept", "acceptance", "acceptable", "acceptably", "unacceptable"),
+    ("achieve", "achievement", "achievable", "-", "unachievable"),
+    ("adapt", "adaptation", "adaptable", "-", "unadaptable"),
+    ("adjust", "adjustment", "adjustable", "-", "fixed"),
+    ("align", "alignment", "aligned", "-", "misaligned"),
+    ("analyze", "analysis", "analytical", "analytically", "-"),
+    ("anticipate", "anticipation", "anticipated", "-", "unanticipated"),
+    ("apply", "application", "applicable", "-", "inapplicable"),
+    ("approve", "approval", "approved", "approvingly", "disapprove"),
+    ("assess", "assessment", "assessable", "-", "-"),
+    ("assume", "assumption", "assumed", "-", "-"),
+    ("attend", "attention", "attentive", "attentively", "inattentive"),
+    ("automate", "automation", "automatic", "automatically", "manual"),
+    ("-", "availability", "available", "-", "unavailable"),
+    ("benefit", "benefit", "beneficial", "beneficially", "harmful"),
+    ("clarify", "clarification", "clarified", "-", "-"),
+    ("clear", "clarity", "clear", "clearly", "unclear"),
+    ("collaborate", "collaboration", "collaborative", "collaboratively", "-"),
+    ("commit", "commitment", "committed", "-", "uncommitted"),
+    ("communicate", "communication", "communicative", "-", "uncommunicative"),
+    ("compare", "comparison", "comparable", "comparably", "incomparable"),
+    ("complete", "completion", "complete", "completely", "incomplete"),
+    ("comply", "compliance", "compliant", "-", "non-compliant"),
+    ("concentrate", "concentration", "concentrated", "-", "-"),
+    ("confirm", "confirmation", "confirmed", "-", "unconfirmed"),
+    ("consider", "consideration", "considerable", "considerably", "-"),
+    ("-", "consistency", "consistent", "consistently", "inconsistent"),
+    ("contribute", "contribution", "contributory", "-", "-"),
+    ("coordinate", "coordination", "coordinated", "-", "uncoordinated"),
+    ("create", "creation", "creative", "creatively", "destroy"),
+    ("decide", "decision", "decisive", "decisively", "indecisive"),
+    ("define", "definition", "defined", "-", "undefined"),
+    ("delegate", "delegation", "delegated", "-", "-"),
+    ("deliver", "delivery", "deliverable", "-", "-"),
+    ("depend", "dependency", "dependent", "dependently", "independent"),
+    ("deploy", "deployment", "deployable", "-", "-"),
+    ("describe", "description", "descriptive", "descriptively", "-"),
+    ("develop", "development", "developmental", "developmentally", "-"),
+    ("differ", "difference", "different", "differently", "similar"),
+    ("document", "documentation", "documented", "-", "undocumented"),
+    ("-", "effectiveness", "effective", "effectively", "ineffective"),
+    ("enable", "enablement", "enabled", "-", "disable"),
+    ("encourage", "encouragement", "encouraging", "encouragingly", "discourage"),
+    ("ensure", "-", "-", "-", "-"),
+    ("establish", "establishment", "established", "-", "-"),
+    ("estimate", "estimation", "estimated", "-", "-"),
+    ("evaluate", "evaluation", "evaluative", "-", "-"),
+    ("expect", "expectation", "expected", "expectedly", "unexpected"),
+    ("explain", "explanation", "explanatory", "-", "inexplicable"),
+    ("facilitate", "facilitation", "facilitative", "-", "hinder"),
+    ("fail", "failure", "failed", "-", "succeed"),
+    ("-", "flexibility", "flexible", "flexibly", "inflexible"),
+    ("improve", "improvement", "improved", "-", "worsen"),
+    ("implement", "implementation", "implemented", "-", "-"),
+    ("inform", "information", "informative", "informatively", "uninformative"),
+    ("initiate", "initiation", "-", "-", "-"),
+    ("-", "initiative", "-", "-", "-"),
+    ("integrate", "integration", "integrated", "-", "separate"),
+    ("investigate", "investigation", "investigative", "-", "-"),
+    ("maintain", "maintenance", "maintainable", "-", "unmaintainable"),
+    ("manage", "management", "manageable", "manageably", "unmanageable"),
+    ("measure", "measurement", "measurable", "measurably", "immeasurable"),
+    ("migrate", "migration", "migratory", "-", "-"),
+    ("mitigate", "mitigation", "mitigating", "-", "aggravate"),
+    ("monitor", "monitoring", "monitored", "-", "unmonitored"),
+    ("negotiate", "negotiation", "negotiable", "-", "non-negotiable"),
+    ("notify", "notification", "notifiable", "-", "-"),
+    ("optimize", "optimization", "optimal", "optimally", "suboptimal"),
+    ("organize", "organization", "organized", "-", "disorganized"),
+    ("perform", "performance", "performant", "-", "-"),
+    ("persist", "persistence", "persistent", "persistently", "-"),
+    ("plan", "planning", "planned", "-", "unplanned"),
+    ("predict", "prediction", "predictable", "predictably", "unpredictable"),
+    ("prepare", "preparation", "prepared", "-", "unprepared"),
+    ("prioritize", "priority", "prioritized", "-", "deprioritize"),
+    ("produce", "production", "productive", "productively", "unproductive"),
+    ("-", "prominence", "prominent", "prominently", "inconspicuous"),
+    ("propose", "proposal", "proposed", "-", "-"),
+    ("-", "proactivity", "proactive", "proactively", "reactive"),
+    ("recommend", "recommendation", "recommended", "-", "-"),
+    ("reduce", "reduction", "reduced", "-", "increase"),
+    ("refactor", "refactoring", "refactored", "-", "-"),
+    ("rely", "reliability", "reliable", "reliably", "unreliable"),
+    ("resolve", "resolution", "resolved", "-", "unresolved"),
+    ("respond", "response", "responsive", "responsively", "unresponsive"),
+    ("-", "responsibility", "responsible", "responsibly", "irresponsible"),
+    ("review", "review", "reviewed", "-", "unreviewed"),
+    ("scale", "scalability", "scalable", "-", "unscalable"),
+    ("secure", "security", "secure", "securely", "insecure"),
+    ("simplify", "simplification", "simplified", "-", "complicate"),
+    ("specify", "specification", "specific", "specifically", "general"),
+    ("stabilize", "stability", "stable", "stably", "unstable"),
+    ("streamline", "streamlining", "streamlined", "-", "-"),
+    ("succeed", "success", "successful", "successfully", "unsuccessful"),
+    ("suggest", "suggestion", "suggestive", "-", "-"),
+    ("support", "support", "supportive", "supportively", "unsupportive"),
+    ("sustain", "sustainability", "sustainable", "sustainably", "unsustainable"),
+    ("transform", "transformation", "transformative", "-", "-"),
+    ("validate", "validation", "valid", "validly", "invalid"),
+    ("verify", "verification", "verifiable", "verifiably", "unverifiable"),
+)
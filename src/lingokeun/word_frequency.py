@@ -0,0 +1,63 @@
+"""Common professional words, most frequent first, with their word type.
+
+Used to fill the daily selection with new words once the learner's own
+vocabulary runs short. Most have a family in word_families.py, so Task 1
+can be checked locally.
+"""
+
+COMMON_WORDS = (
+    ("develop", "v"),
+    ("support", "v"),
+    ("information", "n"),
+    ("available", "adj"),
+    ("consider", "v"),
+    ("expect", "v"),
+    ("specific", "adj"),
+    ("decision", "n"),
+    ("responsible", "adj"),
+    ("improve", "v"),
+    ("effective", "adj"),
+    ("describe", "v"),
+    ("management", "n"),
+    ("communicate", "v"),
+    ("successful", "adj"),
+    ("maintain", "v"),
+    ("different", "adj"),
+    ("performance", "n"),
+    ("reduce", "v"),
+    ("clearly", "adv"),
+    ("deliver", "v"),
+    ("analysis", "n"),
+    ("measurable", "adj"),
+    ("prepare", "v"),
+    ("reliable", "adj"),
+    ("recommend", "v"),
+    ("commitment", "n"),
+    ("consistent", "adj"),
+    ("explain", "v"),
+    ("completely", "adv"),
+    ("resolve", "v"),
+    ("priority", "n"),
+    ("flexible", "adj"),
+    ("estimate", "v"),
+    ("productive", "adj"),
+    ("coordinate", "v"),
+    ("documentation", "n"),
+    ("predictable", "adj"),
+    ("collaborate", "v"),
+    ("automatically", "adv"),
+    ("verify", "v"),
+    ("compliance", "n"),
+    ("scalable", "adj"),
+    ("negotiate", "v"),
+    ("proactive", "adj"),
+    ("clarify", "v"),
+    ("sustainable", "adj"),
+    ("mitigate", "v"),
+    ("initiative", "n"),
+    ("facilitate", "v"),
+    ("prominent", "adj"),
+    ("streamline", "v"),
+    ("transformative", "adj"),
+    ("delegate", "v"),
+)
@@ -0,0 +1,211 @@
+import re
+from datetime import date, datetime
+from pathlib import Path
+
+from . import archive, metrics, paths
+from .task_queue import TaskQueue
+from .user_profile import UserProfileManager
+
+MATERIAL_DIR = Path("material")
+
+TASK_TITLES = {
+    1: "Word Transformation Challenge",
+    2: "Translation Challenge",
+    3: "Conversation Transliteration Challenge",
+    4: "Tense Construction Challenge",
+}
+
+
+def task_file_path(task_date: str) -> Path:
+    """Path of the task file for a YYYY-MM-DD date."""
+    return paths.tasks_dir() / f"task_{task_date}.md"
+
+
+def answer_file_path(task_date: str, task_number: int) -> Path:
+    """Conventional location of the answers to one task."""
+    return paths.answers_dir() / task_date / f"task_{task_number}.md"
+
+
+def parse_answer_path(path: Path) -> tuple[str, int] | None:
+    """(date, task number) of a file laid out like answer_file_path, else None."""
+    match = re.fullmatch(r"task_(\d)\.md", path.name)
+    if not match or int(match.group(1)) not in TASK_TITLES:
+        return None
+    try:
+        datetime.strptime(path.parent.name, "%Y-%m-%d")
+    except ValueError:
+        return None
+    return path.parent.name, int(match.group(1))
+
+
+def material_path(topic: str) -> Path:
+    """Path of the material file for a topic."""
+    filename = re.sub(r"[^\w\s-]", "", topic).strip().replace(" ", "_").lower()
+    return MATERIAL_DIR / f"{filename}.md"
+
+
+@metrics.timed("task.write")
+def save_task_file(task_date: str, markdown_content: str) -> Path:
+    """Write a daily task into tasks/task_YYYY-MM-DD.md."""
+    filename = task_file_path(task_date)
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(markdown_content)
+    return filename
+
+
+def generate_task(task_date: str | None = None, service=None) -> tuple[Path, bool]:
+    """Create the task file for a date, preferring the prefetch queue.
+
+    Returns the file and whether it came from the queue. The AI service is
+    only constructed when the queue can't serve the task.
+    """
+    task_date = task_date or date.today().strftime("%Y-%m-%d")
+
+    profile_manager = service.profile_manager if service else UserProfileManager()
+    weak_words = profile_manager.get_vocabulary_context_for_ai()["weak"]
+    markdown_content = TaskQueue().pop(task_date, weak_words)
+    if markdown_content:
+        return save_task_file(task_date, markdown_content), True
+
+    if service is None:
+        from .ai_service import AIService
+
+        service = AIService()
+
+    markdown_content = service.generate_daily_task()
+    if markdown_content.startswith("Error"):
+        raise RuntimeError(markdown_content)
+
+    return save_task_file(task_date, markdown_content), False
+
+
+def _check_review(task_date: str, task_number: int) -> Path:
+    """Validate review arguments and return the (unarchived) task file."""
+    datetime.strptime(task_date, "%Y-%m-%d")
+    if task_number not in TASK_TITLES:
+        raise ValueError("Invalid task number. Use 1, 2, 3, or 4")
+
+    task_file = task_file_path(task_date)
+    if not archive.ensure_loose(task_file):
+        raise FileNotFoundError(f"Task file not found: {task_file}")
+    return task_file
+
+
+def request_review(service, task_date: str, task_number: int, user_input: str) -> str:
+    """Ask the model to review one task without recording anything.
+
+    Returns the review Markdown, or the Task1Review JSON for task 1, so the
+    result can be stored and applied later.
+    """
+    task_file = _check_review(task_date, task_number)
+
+    if task_number == 1:
+        return service.review_task1(user_input).model_dump_json()
+
+    if task_number == 2:
+        task_content = task_file.read_text(encoding="utf-8")
+        review_result = service.review_task2(task_content, user_input)
+    elif task_number == 3:
+        task_content = task_file.read_text(encoding="utf-8")
+        review_result = service.review_task3(task_content, user_input)
+    else:
+        review_result = service.review_task4(user_input)
+
+    # Don't record provider errors as a review
+    if review_result.startswith("Error"):
+        raise RuntimeError(review_result)
+    return review_result
+
+
+def apply_review(
+    service,
+    task_date: str,
+    task_number: int,
+    result: str,
+    marker: str | None = None,
+    skip: frozenset = frozenset(),
+    on_step=None,
+) -> str:
+    """Record a review: task file, vocabulary mastery and weakness profile.
+
+    `marker` tags the appended section so a retried job doesn't append it
+    twice; steps listed in `skip` were already applied and `on_step(name)`
+    is called after each one. Returns the review Markdown.
+    """
+    task_file = _check_review(task_date, task_number)
+
+    if task_number == 1:
+        from .review_schema import Task1Review
+
+        task1_review = Task1Review.model_validate_json(result)
+
+        # Markdown for the task file is rendered locally from the JSON
+        review_result = task1_review.to_markdown()
+
+        # Update vocabulary mastery from the structured review
+        if "vocab" not in skip:
+            service.extract_vocabulary_mastery_from_review(task1_review, task_date)
+            if on_step:
+                on_step("vocab")
+    else:
+        review_result = result
+
+    if "append" not in skip and not (
+        marker and marker in task_file.read_text(encoding="utf-8")
+    ):
+        # Append review to task file
+        with (
+            metrics.timed("task.append", chars=len(review_result)),
+            open(task_file, "a", encoding="utf-8") as f,
+        ):
+            f.write(f"\n\n---\n\n# Review - Task {task_number}\n")
+            if marker:
+                f.write(f"{marker}\n")
+            f.write(
+                f"**Reviewed at:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            )
+            f.write(review_result)
+    if "append" not in skip and on_step:
+        on_step("append")
+
+    # Update user profile with weaknesses
+    if "profile" not in skip:
+        service.update_user_profile_after_review(
+            review_result, f"task_{task_number}", task_date
+        )
+        if on_step:
+            on_step("profile")
+
+    from .config import settings
+
+    if settings.BACKUP_AFTER_REVIEW:
+        from . import backup
+
+        backup.create(f"review {task_date} task {task_number}")
+
+    return review_result
+
+
+def review_task(service, task_date: str, task_number: int, user_input: str) -> str:
+    """Review answers for one task and record the results.
+
+    Appends the review to the task file and updates vocabulary mastery and
+    the weakness profile. Returns the review Markdown.
+    """
+    result = request_review(service, task_date, task_number, user_input)
+    return apply_review(service, task_date, task_number, result)
+
+
+def generate_material(service, topic: str) -> Path:
+    """Generate learning material for a topic into material/."""
+    filepath = material_path(topic)
+    filepath.parent.mkdir(exist_ok=True)
+
+    material_content = service.generate_learning_material(topic)
+    if material_content.startswith("Error"):
+        raise RuntimeError(material_content)
+
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(material_content)
+    return filepath
@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+# config.Settings requires a key; tests never reach the real API
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from lingokeun import paths
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Run each test in an empty directory as the default learner.
+
+    Stores live under cwd-relative profile/, tasks/ and answers/.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv(paths.USER_ENV, raising=False)
+    paths.set_user(None)
+    yield tmp_path
+    paths.set_user(None)
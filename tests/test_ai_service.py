@@ -0,0 +1,53 @@
+from lingokeun.ai_service import AIService
+from lingokeun.review_schema import FormReview, Task1Review, WordReview
+
+ANSWERS = """**facilitate**
+- Verb: facilitate
+- Noun: facilitation
+- Adjective: facilitative
+- Adverb: -
+- Opposite: hinder
+"""
+
+
+def _review(word: str) -> Task1Review:
+    forms = [
+        FormReview(
+            form=form, correct_answer="", student_answer="-", status="added", meaning=""
+        )
+        for form in ("verb", "noun", "adjective", "adverb", "opposite")
+    ]
+    return Task1Review(words=[WordReview(word=word, forms=forms)], summary="")
+
+
+def test_bundled_families_are_not_sent_as_answer_key():
+    service = AIService()
+
+    assert service._known_families(ANSWERS) == []
+    assert service._known_families(ANSWERS, confirmed=False) == ["facilitate"]
+
+
+def test_bundled_families_are_not_filled_in_as_answers():
+    service = AIService()
+    review = _review("facilitate")
+
+    service._fill_known_forms(review)
+
+    assert [f.correct_answer for f in review.words[0].forms] == [""] * 5
+
+
+def test_confirmed_families_fill_answers_and_base_forms():
+    service = AIService()
+    service.morphology.learn(
+        "facilitate",
+        {"verb": "facilitate", "noun": "facilitation", "adverb": "-"},
+        {"verb": "Memfasilitasi"},
+    )
+    review = _review("facilitate")
+
+    service._fill_known_forms(review)
+
+    forms = {f.form: f for f in review.words[0].forms}
+    assert forms["noun"].correct_answer == "facilitation"
+    assert forms["verb"].meaning == "Memfasilitasi"
+    assert service._known_families(ANSWERS) == ["facilitate"]
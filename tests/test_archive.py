@@ -0,0 +1,66 @@
+import os
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+from lingokeun import archive
+from lingokeun.archive import Archive
+
+
+def _old_file(directory: Path, name: str, year: int, text: str = "") -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text(text or f"# {name}\n", encoding="utf-8")
+    mtime = datetime(year, 6, 1).timestamp()
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_old_files_move_into_yearly_archives():
+    tasks = Path("tasks")
+    _old_file(tasks, "task_2024-06-01.md", 2024)
+    _old_file(tasks, "task_2025-06-01.md", 2025)
+    (tasks / "task_today.md").write_text("new", encoding="utf-8")
+    store = Archive(tasks)
+
+    candidates = store.candidates(days=90)
+    assert [p.name for p in candidates] == ["task_2024-06-01.md", "task_2025-06-01.md"]
+    assert store.add(candidates) == {"2024.zip": 1, "2025.zip": 1}
+
+    assert not (tasks / "task_2024-06-01.md").exists()
+    assert archive.exists(tasks / "task_2024-06-01.md")
+    assert archive.read_text(tasks / "task_2025-06-01.md") == "# task_2025-06-01.md\n"
+    assert archive.list_names(tasks) == [
+        "task_2024-06-01",
+        "task_2025-06-01",
+        "task_today",
+    ]
+    assert store.stats()["files"] == 2
+
+
+def test_restored_file_replaces_its_archived_copy():
+    tasks = Path("tasks")
+    path = _old_file(tasks, "task_2024-06-01.md", 2024)
+    store = Archive(tasks)
+    store.add([path])
+
+    assert archive.ensure_loose(path)
+    assert datetime.fromtimestamp(path.stat().st_mtime).year == 2024
+    assert not store.contains(path.name)
+
+    # Edited after restoring, then archived again in another year's zip
+    _old_file(tasks, path.name, 2025, text="# edited\n")
+    store.add([path])
+
+    assert archive.read_text(path) == "# edited\n"
+    with zipfile.ZipFile(store.archive_dir / "2024.zip") as zf:
+        assert zf.namelist() == []
+    assert store.members()[path.name]["archive"] == "2025.zip"
+
+
+def test_missing_files():
+    tasks = Path("tasks")
+
+    assert not archive.exists(tasks / "task_2024-06-01.md")
+    assert not archive.ensure_loose(tasks / "task_2024-06-01.md")
+    assert Archive(tasks).read_bytes("task_2024-06-01.md") is None
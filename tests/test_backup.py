@@ -0,0 +1,91 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+from lingokeun import backup, paths, storage
+
+
+def _write_stores(words: list[str]) -> None:
+    profile = paths.profile_dir()
+    profile.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(profile / "vocabulary_mastery.db")
+    with conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS vocab (word TEXT)")
+        conn.execute("DELETE FROM vocab")
+        conn.executemany("INSERT INTO vocab VALUES (?)", [(w,) for w in words])
+    conn.close()
+    storage.write_json(profile / "user_profile.json", {"words": words})
+
+
+def _words() -> list[str]:
+    conn = sqlite3.connect(paths.profile_dir() / "vocabulary_mastery.db")
+    try:
+        return [row[0] for row in conn.execute("SELECT word FROM vocab")]
+    finally:
+        conn.close()
+
+
+def test_create_verify_and_restore():
+    _write_stores(["facilitate"])
+    manifest = backup.create(label="before")
+
+    assert set(manifest["files"]) == {"vocabulary_mastery.db", "user_profile.json"}
+    assert backup.verify(manifest) == []
+    assert backup.find("latest")["label"] == "before"
+    assert backup.find(manifest["id"][:8])["id"] == manifest["id"]
+
+    _write_stores(["facilitate", "mitigate"])
+    assert backup.restore(manifest) == ["vocabulary_mastery.db", "user_profile.json"]
+    assert _words() == ["facilitate"]
+    profile = paths.profile_dir() / "user_profile.json"
+    assert storage.read_json(profile, dict) == {"words": ["facilitate"]}
+
+
+def test_unchanged_stores_are_hard_linked():
+    _write_stores(["facilitate"])
+    first = backup.create()
+    storage.write_json(paths.profile_dir() / "user_profile.json", {"words": []})
+    second = backup.create()
+
+    assert second["files"]["vocabulary_mastery.db"]["linked"]
+    assert not second["files"]["user_profile.json"]["linked"]
+    first_db = backup.backups_dir() / first["id"] / "vocabulary_mastery.db"
+    assert os.stat(first_db).st_nlink == 2
+
+
+def test_touched_but_unchanged_store_is_linked():
+    _write_stores(["facilitate"])
+    backup.create()
+    profile = paths.profile_dir() / "user_profile.json"
+    os.utime(profile, ns=(0, 0))
+
+    second = backup.create()
+
+    assert second["files"]["user_profile.json"]["linked"]
+
+
+def test_verify_reports_damaged_copies():
+    _write_stores(["facilitate"])
+    manifest = backup.create()
+    (backup.backups_dir() / manifest["id"] / "user_profile.json").write_text("{}")
+
+    assert backup.verify(manifest) == ["user_profile.json"]
+
+
+def test_rotate_keeps_recent_and_one_per_day():
+    root = backup.backups_dir()
+    today = datetime.now()
+    ids = [
+        (today - timedelta(days=days)).strftime("%Y%m%d-%H%M%S-") + f"{n:06d}"
+        for days in (0, 1, 30)
+        for n in range(2)
+    ]
+    for backup_id in ids:
+        (root / backup_id).mkdir(parents=True)
+        storage.write_json(root / backup_id / backup.MANIFEST, {"id": backup_id})
+
+    removed = backup.rotate(keep_last=1, keep_daily=14)
+
+    # Newest kept, plus the last of yesterday; older copies and 30 days ago go
+    assert sorted(removed) == sorted([ids[0], ids[2], ids[4], ids[5]])
+    assert [b["id"] for b in backup.list_backups()] == [ids[1], ids[3]]
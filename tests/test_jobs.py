@@ -0,0 +1,96 @@
+import pytest
+
+from lingokeun import paths, workflow
+from lingokeun.jobs import JobQueue, LeaseLost, Worker
+
+
+class FakeService:
+    def __init__(self):
+        self.profile_updates = 0
+
+    def update_user_profile_after_review(self, review, task, task_date):
+        self.profile_updates += 1
+
+
+def _review_job(queue: JobQueue) -> dict:
+    queue.enqueue(
+        "review",
+        {"date": "2026-01-05", "task": 2, "answers": "My answer"},
+        "review:2026-01-05:2",
+    )
+    return queue.claim("worker-a")
+
+
+def _task_file():
+    paths.tasks_dir().mkdir(parents=True, exist_ok=True)
+    task_file = workflow.task_file_path("2026-01-05")
+    task_file.write_text("# Task 2026-01-05\n", encoding="utf-8")
+    return task_file
+
+
+def test_enqueue_is_idempotent_until_the_job_fails():
+    queue = JobQueue()
+    job_id, queued = queue.enqueue("generate", {}, "generate:2026-01-05")
+
+    assert queued
+    assert queue.enqueue("generate", {}, "generate:2026-01-05") == (job_id, False)
+
+    queue.claim("worker-a")
+    queue.fail(job_id, "worker-a", "boom")
+    assert queue.get(job_id)["status"] == "queued"
+
+    with pytest.raises(ValueError):
+        queue.enqueue("unknown", {}, "unknown:1")
+
+
+def test_claim_leases_one_job_at_a_time():
+    queue = JobQueue()
+    job = _review_job(queue)
+
+    assert job["attempts"] == 1
+    assert queue.claim("worker-b") is None
+
+    # An expired lease is taken over, and the old owner's updates fail
+    queue.extend_lease(job["id"], "worker-a", lease_seconds=-1)
+    assert queue.claim("worker-b")["id"] == job["id"]
+    assert not queue.mark_applied(job["id"], "worker-a", "vocab")
+
+
+def test_steps_are_recorded_once():
+    queue = JobQueue()
+    job = _review_job(queue)
+
+    for step in ("vocab", "append", "append", "profile", "vocab"):
+        assert queue.mark_applied(job["id"], "worker-a", step)
+
+    assert queue.get(job["id"])["applied_steps"] == "vocab,append,profile,"
+
+
+def test_retried_review_is_applied_once():
+    task_file = _task_file()
+    worker = Worker()
+    worker._service = FakeService()
+    job = _review_job(worker.queue)
+    assert worker.queue.save_result(job["id"], "worker-a", "Looks good")
+    job["result"] = "Looks good"
+
+    worker.process(job, "worker-a")
+    # A retry sees the steps recorded by the first run
+    job["applied_steps"] = worker.queue.get(job["id"])["applied_steps"]
+    worker.process(job, "worker-a")
+
+    assert task_file.read_text(encoding="utf-8").count("# Review - Task 2") == 1
+    assert worker._service.profile_updates == 1
+    assert worker.queue.get(job["id"])["applied_steps"] == "append,profile,"
+
+
+def test_lost_lease_stops_processing():
+    _task_file()
+    worker = Worker()
+    worker._service = FakeService()
+    job = _review_job(worker.queue)
+    job["result"] = "Looks good"
+
+    with pytest.raises(LeaseLost):
+        worker.process(job, "worker-b")
+    assert worker._service.profile_updates == 0
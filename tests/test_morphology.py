@@ -0,0 +1,57 @@
+from lingokeun.morphology import MorphologyIndex
+from lingokeun.word_families import FAMILIES
+from lingokeun.word_frequency import COMMON_WORDS
+
+
+def test_bundled_family_is_a_hint_not_an_answer_key():
+    index = MorphologyIndex()
+
+    assert index.lookup("facilitation")["forms"]["verb"] == "facilitate"
+    assert index.base_form("facilitation") == "facilitate"
+    assert index.is_complete("facilitate")
+    assert not index.is_confirmed("facilitate")
+    assert index.describe(["facilitate"]) == []
+    assert index.describe(["facilitate"], confirmed=False) == [
+        (
+            "- facilitate: verb=facilitate, noun=facilitation, "
+            "adjective=facilitative, adverb=-, opposite=hinder"
+        )
+    ]
+
+
+def test_learned_forms_confirm_the_family():
+    index = MorphologyIndex()
+    index.learn(
+        "facilitate",
+        {"verb": "facilitate", "noun": "facilitation", "adverb": ""},
+        {"verb": "Memfasilitasi"},
+    )
+
+    family = index.lookup("facilitative")
+    assert index.is_confirmed("facilitative")
+    assert family["meanings"] == {"verb": "Memfasilitasi"}
+    # A blank in the review doesn't erase the bundled form
+    assert family["forms"]["opposite"] == "hinder"
+    assert index.describe(["facilitate"], confirmed=False) == []
+
+
+def test_unrelated_words_are_not_one_family():
+    index = MorphologyIndex()
+
+    assert index.base_form("available") == "available"
+    assert index.base_form("clearly") == "clear"
+    assert index.lookup("clarify") is not index.lookup("clear")
+    assert index.lookup("consistent")["forms"]["verb"] == "-"
+
+
+def test_bundled_data_is_well_formed():
+    surfaces = {}
+    for entry in FAMILIES:
+        assert len(entry) == 5
+        for value in entry[:4]:
+            if value != "-":
+                # A surface form belongs to one family only
+                assert surfaces.setdefault(value, entry) is entry
+
+    index = MorphologyIndex()
+    assert all(index.lookup(word) for word, _ in COMMON_WORDS)
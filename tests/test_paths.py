@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from lingokeun import paths
+from lingokeun.main import app
+
+
+def test_named_learners_get_their_own_shard():
+    assert paths.profile_dir() == Path("profile")
+
+    paths.set_user("alice")
+
+    assert paths.current_user() == "alice"
+    assert paths.profile_dir() == Path("profile/users/alice")
+    assert paths.tasks_dir() == Path("tasks/alice")
+    assert paths.answers_dir("bob") == Path("answers/bob")
+
+
+@pytest.mark.parametrize("user_id", ["../alice", ".hidden", "a/b", ""])
+def test_unsafe_ids_are_rejected(user_id):
+    with pytest.raises(ValueError):
+        paths.validate_user(user_id)
+
+
+@pytest.mark.parametrize("user_id", ["default", "Default"])
+def test_default_learner_id_is_reserved(user_id):
+    with pytest.raises(ValueError, match="reserved"):
+        paths.set_user(user_id)
+
+    result = CliRunner().invoke(app, ["--user", user_id, "users"])
+    assert result.exit_code == 2
+    assert "reserved" in result.output
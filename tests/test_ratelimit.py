@@ -0,0 +1,72 @@
+import sqlite3
+import time
+
+from lingokeun import ratelimit
+from lingokeun.ratelimit import RateLimiter
+
+
+def _levels(limiter: RateLimiter) -> dict[str, float]:
+    conn = sqlite3.connect(limiter.db_path)
+    try:
+        return dict(conn.execute("SELECT name, level FROM buckets"))
+    finally:
+        conn.close()
+
+
+def test_disabled_limiter_never_waits():
+    limiter = RateLimiter(0, 0)
+
+    assert not limiter.enabled
+    assert limiter.acquire(10_000) == 0.0
+
+
+def test_acquire_takes_from_both_buckets():
+    limiter = RateLimiter(60, 1000)
+
+    limiter.acquire(300)
+
+    levels = _levels(limiter)
+    assert round(levels["requests"]) == 59
+    assert round(levels["tokens"]) == 700
+
+
+def test_empty_bucket_asks_to_wait():
+    limiter = RateLimiter(60, 1000)
+    limiter.acquire(1000)
+
+    ticket = limiter._take_ticket(600, time.time())
+    delay = limiter._try_serve(ticket, 600)
+
+    # 600 tokens at 1000 per minute take 36s; callers re-check every second
+    assert delay == ratelimit.MAX_SLEEP_SECONDS
+
+
+def test_tickets_are_served_in_order():
+    limiter = RateLimiter(60, 1000)
+    first = limiter._take_ticket(900, time.time())
+    second = limiter._take_ticket(10, time.time())
+
+    assert limiter._try_serve(second, 10) == ratelimit.POLL_SECONDS
+    assert limiter._try_serve(first, 900) is None
+    assert limiter._try_serve(second, 10) is None
+
+
+def test_stale_ticket_keeps_its_place():
+    limiter = RateLimiter(60, 1000)
+    first = limiter._take_ticket(10, time.time())
+    second = limiter._take_ticket(10, time.time())
+    # Another process dropped our ticket while we were suspended
+    limiter._drop_ticket(first)
+
+    assert limiter._try_serve(first, 10) is None
+    assert limiter._try_serve(second, 10) is None
+
+
+def test_settle_charges_usage_above_the_estimate():
+    limiter = RateLimiter(60, 1000)
+    limiter.acquire(100)
+
+    limiter.settle(100, 1500)
+
+    # A call is charged at most one full bucket
+    assert round(_levels(limiter)["tokens"]) == 0
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from google.genai import errors
+
+from lingokeun import routing
+from lingokeun.ai_service import AIService
+from lingokeun.config import settings
+from lingokeun.routing import ModelRouter, is_transient
+
+
+@pytest.fixture(autouse=True)
+def models(monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_DEFAULT", "primary")
+    monkeypatch.setattr(settings, "MODEL_FALLBACKS", ["backup", "primary"])
+    monkeypatch.setattr(settings, "MODEL_ROUTES", {"cheap": ["lite", "primary"]})
+    monkeypatch.setattr(settings, "MODEL_SLOW_MS", 1000)
+
+
+def _api_error(code: int) -> errors.APIError:
+    return errors.APIError(code, {"error": {"message": "boom"}})
+
+
+def test_route_uses_operation_routes_then_defaults():
+    router = ModelRouter()
+
+    assert router.route("cheap") == ["lite", "primary"]
+    assert router.route("review") == ["primary", "backup"]
+
+
+def test_only_unavailability_is_transient():
+    assert is_transient(_api_error(429))
+    assert is_transient(_api_error(503))
+    assert is_transient(httpx.ConnectTimeout("slow"))
+    assert is_transient(TimeoutError())
+    assert not is_transient(_api_error(400))
+    assert not is_transient(_api_error(403))
+    assert not is_transient(ValueError("bug"))
+
+
+def test_failing_model_is_demoted_then_retried(monkeypatch):
+    router = ModelRouter()
+    for _ in range(routing.MIN_CALLS):
+        router.record("review", "primary", 50, ok=False)
+
+    assert router.candidates("review") == ["backup", "primary"]
+    stats = router.health()["review|primary"]
+    assert stats["calls"] == routing.MIN_CALLS
+    # Other operations of the same model are unaffected
+    assert router.candidates("cheap") == ["lite", "primary"]
+
+    later = stats["demoted_until"] + 1
+    monkeypatch.setattr(routing.time, "time", lambda: later)
+    assert router.candidates("review") == ["primary", "backup"]
+
+
+def test_slow_calls_count_as_failures():
+    router = ModelRouter()
+    router.record("review", "primary", 5000, ok=True)
+
+    assert router.health()["review|primary"]["failures"] == routing.EWMA_ALPHA
+
+
+class FakeModels:
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.calls = []
+
+    def generate_content(self, model, contents, config=None):
+        self.calls.append(model)
+        outcome = self.outcomes[model]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(
+            text=outcome,
+            candidates=[],
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=10, candidates_token_count=5
+            ),
+        )
+
+
+def _service(outcomes) -> AIService:
+    service = AIService()
+    service.client = SimpleNamespace(models=FakeModels(outcomes))
+    return service
+
+
+def test_generate_fails_over_on_transient_errors():
+    service = _service({"primary": _api_error(503), "backup": "ok"})
+
+    assert service._generate("review", "prompt") == "ok"
+    assert service.client.models.calls == ["primary", "backup"]
+    history = service.token_monitor.get_stats()["recent"]
+    assert history[-1]["model"] == "backup"
+    assert history[-1]["metadata"] == {"fallback_from": ["primary"]}
+
+
+def test_generate_raises_request_errors_right_away():
+    service = _service({"primary": _api_error(400), "backup": "ok"})
+
+    with pytest.raises(errors.APIError):
+        service._generate("review", "prompt")
+    assert service.client.models.calls == ["primary"]
+    assert service.router.health() == {}
@@ -0,0 +1,71 @@
+import json
+import multiprocessing
+import threading
+from pathlib import Path
+
+from lingokeun import storage
+
+
+def _increment(path: Path, times: int) -> None:
+    for _ in range(times):
+        with storage.file_lock(path):
+            data = storage.read_json(path, lambda: {"count": 0})
+            data["count"] += 1
+            storage.write_json(path, data)
+
+
+def test_write_keeps_the_previous_version(tmp_path):
+    path = tmp_path / "store.json"
+
+    storage.write_json(path, {"v": 1})
+    storage.write_json(path, {"v": 2})
+
+    assert storage.read_json(path, dict) == {"v": 2}
+    assert json.loads(storage.backup_path(path).read_text()) == {"v": 1}
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+
+
+def test_corrupt_store_is_restored_from_backup(tmp_path, capsys):
+    path = tmp_path / "store.json"
+    storage.write_json(path, {"v": 1})
+    storage.write_json(path, {"v": 2})
+    path.write_text('{"v": 2', encoding="utf-8")
+
+    assert storage.read_json(path, dict) == {"v": 1}
+    assert storage.read_json(path, dict) == {"v": 1}
+    assert len(list(tmp_path.glob("store.json.corrupt-*"))) == 1
+    assert "corrupted" in capsys.readouterr().err
+
+
+def test_corrupt_store_without_backup_uses_default(tmp_path):
+    path = tmp_path / "store.json"
+    path.write_bytes(b"\xff\xfe")
+
+    assert storage.read_json(path, lambda: {"empty": True}) == {"empty": True}
+    assert storage.read_json(tmp_path / "missing.json", list) == []
+
+
+def test_lock_is_reentrant(tmp_path):
+    path = tmp_path / "store.json"
+
+    with storage.file_lock(path), storage.file_lock(path):
+        storage.write_json(path, {"nested": True})
+
+    assert storage.read_json(path, dict) == {"nested": True}
+
+
+def test_locked_updates_are_not_lost(tmp_path):
+    path = tmp_path / "store.json"
+    threads = [threading.Thread(target=_increment, args=(path, 20)) for _ in range(4)]
+    # Spawned, as a forked child may inherit a lock some thread holds
+    processes = [
+        multiprocessing.get_context("spawn").Process(target=_increment, args=(path, 20))
+        for _ in range(2)
+    ]
+
+    for worker in (*threads, *processes):
+        worker.start()
+    for worker in (*threads, *processes):
+        worker.join()
+
+    assert storage.read_json(path, dict) == {"count": 120}
@@ -0,0 +1,113 @@
+from lingokeun.morphology import MorphologyIndex
+from lingokeun.task1_grader import (
+    edit_distance,
+    grade_form,
+    grade_word,
+    local_summary,
+    normalize,
+    parse_answers,
+)
+
+ANSWERS = """## Task 1
+
+**1. Facilitate** (v)
+- **Verb:** facilitate
+- **Noun:** facilitaton
+- **Adjective:** facilitative
+- **Adverb:** -
+- **Opposite:**
+
+### Word 2: Support
+Verb: support
+"""
+
+MEANINGS = {
+    "verb": "Memfasilitasi",
+    "noun": "Fasilitasi",
+    "adjective": "Bersifat memudahkan",
+    "opposite": "Menghambat",
+}
+
+
+def _confirmed_index() -> MorphologyIndex:
+    index = MorphologyIndex()
+    index.learn(
+        "facilitate",
+        {
+            "verb": "facilitate",
+            "noun": "facilitation",
+            "adjective": "facilitative",
+            "adverb": "-",
+            "opposite": "hinder",
+        },
+        MEANINGS,
+    )
+    return index
+
+
+def test_parse_answers_reads_headers_and_form_lines():
+    parsed = parse_answers(ANSWERS)
+
+    assert [p["word"] for p in parsed] == ["facilitate", "support"]
+    assert parsed[0]["answers"] == {
+        "verb": "facilitate",
+        "noun": "facilitaton",
+        "adjective": "facilitative",
+        "adverb": "-",
+        "opposite": "",
+    }
+    assert parse_answers("no answers here") == []
+
+
+def test_normalize_and_edit_distance():
+    assert normalize("  Facilitate. ") == "facilitate"
+    assert normalize("n/a") == ""
+    assert edit_distance("facilitaton", "facilitation", 2) == 1
+    assert edit_distance("abc", "abcdef", 2) == 3
+
+
+def test_grade_form_statuses():
+    index = _confirmed_index()
+    family = index.lookup("facilitate")
+
+    assert grade_form("verb", "Facilitate", family, index) == "correct"
+    assert grade_form("noun", "facilitaton", family, index) == "wrong"
+    assert grade_form("noun", "facilitative", family, index) == "wrong"
+    assert grade_form("opposite", "", family, index) == "added"
+    assert grade_form("adverb", "-", family, index) == "correct"
+    # Unknown answers might be valid, so they are left to the model
+    assert grade_form("opposite", "impede", family, index) is None
+    assert grade_form("adverb", "facilitatively", family, index) is None
+
+
+def test_grade_word_only_trusts_confirmed_families():
+    parsed = parse_answers(ANSWERS)[0]
+
+    assert grade_word(parsed, MorphologyIndex()) is None
+
+    review = grade_word(parsed, _confirmed_index(), word_type="Verb")
+    assert review is not None
+    assert review.word_type == "v"
+    assert {f.form: f.status for f in review.forms} == {
+        "verb": "correct",
+        "noun": "wrong",
+        "adjective": "correct",
+        "adverb": "correct",
+        "opposite": "added",
+    }
+    assert review.forms[4].student_answer == "-"
+    assert review.forms[1].meaning == "Fasilitasi"
+
+
+def test_grade_word_defers_unknown_answers():
+    parsed = {"word": "facilitate", "answers": {"opposite": "impede"}}
+
+    assert grade_word(parsed, _confirmed_index()) is None
+
+
+def test_local_summary():
+    review = grade_word(parse_answers(ANSWERS)[0], _confirmed_index())
+
+    assert local_summary([review]) == (
+        "Skor 3/5 bentuk benar (60%). Perlu latihan lagi: noun, opposite."
+    )
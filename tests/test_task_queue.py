@@ -0,0 +1,60 @@
+from typer.testing import CliRunner
+
+from lingokeun.main import app
+from lingokeun.task_queue import TaskQueue
+
+TASK = "## Task 1\n**Selected Vocabulary:** facilitate, mitigate\n"
+
+
+def _put(queue: TaskQueue, task_date: str, weak_words: list[str]) -> None:
+    queue.put(task_date, TASK, queue.snapshot(weak_words, "context"))
+
+
+def test_fresh_task_is_popped_once():
+    queue = TaskQueue()
+    _put(queue, "2026-01-05", ["a", "b", "c", "d"])
+
+    assert queue.get("2026-01-05", ["a", "b", "c", "d"]) == TASK
+    assert queue.pop("2026-01-05", ["a", "b", "c", "e"]) is None
+    assert queue.pop("2026-01-05", ["a", "b", "c", "d"]) is None
+
+
+def test_small_weak_word_changes_keep_the_task():
+    queue = TaskQueue()
+    weak = [str(n) for n in range(10)]
+    _put(queue, "2026-01-05", weak)
+
+    # One word of ten swapped: Jaccard distance 2/11
+    assert queue.get("2026-01-05", weak[:9] + ["new"]) == TASK
+    assert queue.get("2026-01-05", ["x", "y"]) is None
+    # Only the first ten weak words count
+    assert queue.get("2026-01-05", weak + ["extra"]) == TASK
+
+
+def test_pop_drops_older_dates():
+    queue = TaskQueue()
+    for task_date in ("2026-01-04", "2026-01-05", "2026-01-06"):
+        _put(queue, task_date, [])
+
+    assert queue.pop("2026-01-05", []) == TASK
+    assert list(queue.status()) == ["2026-01-06"]
+
+
+def test_queued_words_skip_the_requested_date():
+    queue = TaskQueue()
+    _put(queue, "2026-01-05", [])
+
+    assert queue.queued_words() == ["facilitate", "mitigate"]
+    assert queue.queued_words(exclude_date="2026-01-05") == []
+
+
+def test_generate_status_lists_the_queue():
+    runner = CliRunner()
+
+    assert "kosong" in runner.invoke(app, ["generate", "--status"]).output
+
+    _put(TaskQueue(), "2026-01-05", [])
+    result = runner.invoke(app, ["generate", "--status"])
+
+    assert result.exit_code == 0
+    assert "2026-01-05 | dibuat" in result.output
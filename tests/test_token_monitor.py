@@ -0,0 +1,64 @@
+from datetime import date
+
+from lingokeun import storage
+from lingokeun.token_monitor import TokenMonitor
+
+
+def test_log_usage_counts_call_once():
+    monitor = TokenMonitor()
+    monitor.log_usage("review_task2", 100, 10, prompt_chars=400)
+
+    today = monitor.day_usage()
+    assert (today["input"], today["output"], today["calls"]) == (100, 10, 1)
+    assert today["operations"]["review_task2"]["calls"] == 1
+
+
+def test_log_usage_without_counters_file_does_not_double_count():
+    monitor = TokenMonitor()
+    monitor.log_usage("review_task2", 50, 5)
+    monitor.counters_file.unlink()
+
+    # First call after an upgrade: counters are rebuilt from the history
+    monitor.log_usage("review_task2", 100, 10)
+
+    today = monitor.day_usage()
+    assert (today["input"], today["output"], today["calls"]) == (150, 15, 2)
+    assert monitor.get_counters()["operations"]["review_task2"]["outputs"] == [5, 10]
+
+
+def test_counters_rebuilt_from_history():
+    monitor = TokenMonitor()
+    storage.write_json(
+        monitor.log_file,
+        {
+            "total": {"input": 30, "output": 3},
+            "history": [
+                {
+                    "timestamp": f"{date.today().isoformat()}T10:00:00",
+                    "operation": "generate_daily_task",
+                    "model": "m",
+                    "input_tokens": 30,
+                    "output_tokens": 3,
+                    "total_tokens": 33,
+                }
+            ],
+        },
+    )
+
+    assert monitor.day_usage()["operations"]["generate_daily_task"] == {
+        "input": 30,
+        "output": 3,
+        "calls": 1,
+    }
+    assert monitor.counters_file.exists()
+
+
+def test_stats_today():
+    monitor = TokenMonitor()
+    monitor.log_usage("review_task1", 20, 2)
+    monitor.log_usage("review_task3", 40, 4)
+
+    stats = monitor.get_stats()
+    assert stats["total"] == 66
+    assert stats["total_calls"] == 2
+    assert stats["today"]["calls"] == 2
@@ -0,0 +1,79 @@
+from datetime import date
+
+from lingokeun.ai_service import AIService
+from lingokeun.morphology import MorphologyIndex
+from lingokeun.vocabulary_db import VocabularyDatabase, review_interval
+
+TODAY = date(2026, 1, 5)
+
+
+def test_fresh_learner_first_picks():
+    db = VocabularyDatabase()
+    morphology = MorphologyIndex(db)
+
+    picks = db.select_daily_words(today=TODAY, family=morphology.base_form)
+
+    assert [w["word"] for w in picks] == [
+        "develop",
+        "information",
+        "available",
+        "support",
+        "clearly",
+    ]
+    assert {w["kind"] for w in picks} == {"new"}
+
+
+def test_fresh_learner_prompt_has_no_unconfirmed_base_forms():
+    service = AIService()
+    picks = [
+        w["word"]
+        for w in service.profile_manager.vocab_db.select_daily_words(
+            today=TODAY, family=service.morphology.base_form
+        )
+    ]
+
+    assert "(base:" not in service._with_base_forms(picks)
+
+
+def test_selection_is_deterministic_and_respects_avoid():
+    db = VocabularyDatabase()
+    first = db.select_daily_words(today=TODAY)
+
+    assert db.select_daily_words(today=TODAY) == first
+    avoided = db.select_daily_words(today=TODAY, avoid=["develop"])
+    assert "develop" not in [w["word"] for w in avoided]
+
+
+def test_weak_words_come_before_new_ones():
+    db = VocabularyDatabase()
+    db.add_vocabulary("leverage", "v")
+    db.update_vocabulary_mastery(
+        "leverage",
+        20,
+        ["verb"],
+        ["noun", "adjective", "adverb", "opposite"],
+        "2026-01-01",
+    )
+
+    picks = db.select_daily_words(today=TODAY)
+
+    assert picks[0]["word"] == "leverage"
+    assert picks[0]["kind"] == "weak"
+
+
+def test_one_word_per_family():
+    db = VocabularyDatabase()
+    db.add_vocabulary("facilitation", "n")
+    db.add_vocabulary("facilitate", "v")
+
+    picks = db.select_daily_words(
+        count=10, today=TODAY, family=MorphologyIndex(db).base_form
+    )
+
+    words = [w["word"] for w in picks]
+    assert not {"facilitation", "facilitate"} <= set(words)
+
+
+def test_review_interval_grows_and_caps():
+    assert [review_interval(n) for n in range(4)] == [1, 2, 4, 8]
+    assert review_interval(20) == 60
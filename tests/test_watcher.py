@@ -0,0 +1,82 @@
+import threading
+import time
+
+from lingokeun import paths, watcher, workflow
+from lingokeun.jobs import JobQueue
+from lingokeun.main import _ingest_answer_file
+
+
+def _answer(task_date: str = "2026-01-05"):
+    path = paths.answers_dir() / task_date / "task_2.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _task_file(task_date: str = "2026-01-05") -> None:
+    paths.tasks_dir().mkdir(parents=True, exist_ok=True)
+    workflow.task_file_path(task_date).write_text("# Task\n", encoding="utf-8")
+
+
+def test_polling_watcher_reports_new_and_changed_files():
+    root = paths.answers_dir()
+    root.mkdir()
+    poller = watcher.PollingWatcher(root, interval=0)
+    path = _answer()
+
+    path.write_text("first", encoding="utf-8")
+    assert poller.poll(0) == {path}
+    assert poller.poll(0) == set()
+
+    path.write_text("second answer", encoding="utf-8")
+    assert poller.poll(0) == {path}
+
+
+def test_watch_reports_a_settled_file_once():
+    root = paths.answers_dir()
+    root.mkdir()
+    path = _answer()
+    # A save seen as two events, then quiet until the file settles
+    events = [{path}, {path}, set()]
+    stop = threading.Event()
+
+    class Scripted:
+        def poll(self, timeout):
+            if not events:
+                stop.set()
+                return set()
+            changed = events.pop(0)
+            if not changed:
+                time.sleep(timeout)
+            return changed
+
+        def close(self):
+            pass
+
+    path.write_text("answer", encoding="utf-8")
+    assert list(watcher.watch(Scripted(), stop, settle=0.05)) == [path]
+
+
+def test_ingest_queues_answers_once():
+    _task_file()
+    path = _answer()
+    path.write_text("My answer", encoding="utf-8")
+    queue = JobQueue()
+
+    _ingest_answer_file(queue, paths.answers_dir(), path)
+    _ingest_answer_file(queue, paths.answers_dir(), path)
+
+    assert [job["kind"] for job in queue.list_jobs()] == ["review"]
+
+
+def test_ingest_skips_unreadable_files(capsys):
+    _task_file()
+    queue = JobQueue()
+    missing = _answer()
+    binary = _answer("2026-01-06")
+    binary.write_bytes(b"\xff\xfe\xfa")
+
+    _ingest_answer_file(queue, paths.answers_dir(), missing)
+    _ingest_answer_file(queue, paths.answers_dir(), binary)
+
+    assert queue.list_jobs() == []
+    assert capsys.readouterr().out.count("cannot read") == 2